@@ -1,8 +1,27 @@
-from dj_toml_settings.config import configure_toml_settings, get_toml_settings
+from dj_toml_settings.config import (
+    aget_toml_settings,
+    configure_toml_settings,
+    get_toml_settings,
+    get_toml_settings_for_environments,
+)
 from dj_toml_settings.toml_parser import Parser
 
 __all__ = [
     "Parser",
+    "aget_toml_settings",
     "configure_toml_settings",
     "get_toml_settings",
+    "get_toml_settings_for_environments",
+    "register_operator",
+    "unregister_operator",
 ]
+
+
+def __getattr__(name: str):
+    # Only import the operators when they are needed to reduce import time
+    if name in ("register_operator", "unregister_operator"):
+        from dj_toml_settings import operators  # noqa: PLC0415
+
+        return getattr(operators, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,372 @@
+import hashlib
+import io
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from copy import deepcopy
+from pathlib import Path
+from typing import Any
+
+from dj_toml_settings.environment import Environment, get_signature
+from dj_toml_settings.operators import registry
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 2
+
+# Classes that are allowed to be loaded from the cache; everything else is treated as a cache miss
+SAFE_GLOBALS = {
+    ("builtins", "set"),
+    ("builtins", "frozenset"),
+    ("datetime", "date"),
+    ("datetime", "datetime"),
+    ("datetime", "time"),
+    ("datetime", "timedelta"),
+    ("datetime", "timezone"),
+    ("dateutil.tz.tz", "tzlocal"),
+    ("dateutil.tz.tz", "tzoffset"),
+    ("dateutil.tz.tz", "tzutc"),
+    ("decimal", "Decimal"),
+    ("pathlib", "Path"),
+    ("pathlib", "PosixPath"),
+    ("pathlib", "PurePosixPath"),
+    ("pathlib", "PureWindowsPath"),
+    ("pathlib", "WindowsPath"),
+    ("pathlib._local", "Path"),
+    ("pathlib._local", "PosixPath"),
+    ("pathlib._local", "PurePosixPath"),
+    ("pathlib._local", "PureWindowsPath"),
+    ("pathlib._local", "WindowsPath"),
+    ("urllib.parse", "ParseResult"),
+}
+
+MISSING_FINGERPRINT = "missing"
+
+
+class SafeUnpickler(pickle.Unpickler):
+    """Only loads the classes that can be the result of parsing a TOML file."""
+
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) in SAFE_GLOBALS:
+            return super().find_class(module, name)
+
+        raise pickle.UnpicklingError(f"Cannot load {module}.{name} from the cache")
+
+
+def dumps(value: Any) -> bytes:
+    """Serializes `value` to bytes; raises `ValueError` if the value cannot be loaded from the cache."""
+
+    try:
+        content = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        SafeUnpickler(io.BytesIO(content)).load()
+    except (pickle.PickleError, AttributeError, TypeError) as e:
+        raise ValueError(f"Cannot cache value: {e}") from e
+
+    return content
+
+
+def loads(content: bytes) -> Any:
+    return SafeUnpickler(io.BytesIO(content)).load()
+
+
+def get_fingerprint(value: Any) -> str:
+    """Gets a digest of `value`; raises `ValueError` if the value cannot be serialized."""
+
+    try:
+        content = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PickleError, AttributeError, TypeError) as e:
+        raise ValueError(f"Cannot fingerprint value: {e}") from e
+
+    return hashlib.sha256(content).hexdigest()
+
+
+def get_fingerprints(data: dict, names: Iterable[str]) -> dict[str, str]:
+    """Gets a digest for each variable in `data` that is in `names`."""
+
+    return {name: get_fingerprint(data[name]) if name in data else MISSING_FINGERPRINT for name in sorted(names)}
+
+
+def is_fresh(entry: dict, data: dict, environment: Environment) -> bool:
+    """Whether the environment variables, files and variables that were read to create `entry` still have the same
+    values.
+    """
+
+    if not environment.matches(entry["environ"]) or not environment.matches_files(entry["files"]):
+        return False
+
+    try:
+        references: dict[str, str] = entry["references"]
+
+        return get_fingerprints(data, references) == references
+    except ValueError:
+        return False
+
+
+def create_entry(data: dict, environment: Environment, references: set[str], settings: dict) -> dict:
+    """Creates a cache entry; raises `ValueError` if the variables in `references` cannot be fingerprinted."""
+
+    return {
+        "environ": dict(environment.consulted),
+        "files": dict(environment.files),
+        "references": get_fingerprints(data, references),
+        "settings": settings,
+    }
+
+
+class SettingsCache:
+    """Persistent on-disk cache of resolved settings and decoded TOML files.
+
+    Resolved settings are keyed by the content of the TOML files and the `ENVIRONMENT` environment variable. Each
+    entry also stores the environment variables and the variables from `data` that were read while resolving the
+    settings, so it only gets used when all of them still have the same values.
+
+    The decoded `[tool.django]` data of each TOML file is cached separately (keyed by the file path, modified time,
+    size and content), so that TOML files do not need to be decoded again when only the environment changes.
+    """
+
+    directory: Path
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def get_key(self, paths: list[Path], environment: Environment, lexical_paths: bool = False) -> str:  # noqa: FBT001, FBT002
+        """Gets the key for the settings resolved from `paths`."""
+
+        hasher = hashlib.sha256()
+        hasher.update(f"{CACHE_VERSION}:{sys.version_info[:2]}:{Path.cwd()}\0".encode())
+        hasher.update(f"ENVIRONMENT={environment.get('ENVIRONMENT')}\0".encode())
+        hasher.update(f"lexical_paths={lexical_paths}\0".encode())
+        hasher.update(f"operators={','.join(sorted(registry.keys))}\0".encode())
+
+        for path in paths:
+            hasher.update(f"{path.absolute()}\0".encode())
+
+            try:
+                hasher.update(hashlib.sha256(path.read_bytes()).digest())
+            except FileNotFoundError:
+                hasher.update(MISSING_FINGERPRINT.encode())
+
+        return hasher.hexdigest()
+
+    def get(self, key: str, data: dict, environment: Environment) -> dict | None:
+        """Gets the cache entry for `key` if it is still valid for `data` and `environment`.
+
+        The entry has the resolved `settings`, and the `environ` and `references` that were read to resolve them.
+        """
+
+        entry: dict | None = self.load(self.directory / f"{key}.settings")
+
+        if entry is None:
+            return None
+
+        if not is_fresh(entry, data, environment):
+            logger.debug(f"Settings cache is stale: {key}")
+            return None
+
+        environment.consulted.update(entry["environ"])
+        environment.files.update(entry["files"])
+
+        return entry
+
+    def set(self, key: str, data: dict, environment: Environment, references: set[str], settings: dict) -> None:
+        """Caches the resolved `settings` for `key`.
+
+        Args:
+            key: The key from `get_key`.
+            data: The variables that were available before the settings were resolved.
+            environment: The environment that the settings were resolved with.
+            references: The variables that were read while resolving the settings.
+            settings: The resolved settings.
+        """
+
+        try:
+            entry = create_entry(data, environment, references, settings)
+
+            self.write(self.directory / f"{key}.settings", dumps(entry))
+        except ValueError as e:
+            logger.debug(f"Skip settings cache: {e}")
+
+    def get_toml(self, path: Path, content: bytes) -> dict | None:
+        """Gets the decoded `[tool.django]` data for the TOML file at `path` if it has not changed."""
+
+        entry: dict | None = self.load(self.get_toml_path(path))
+
+        if entry is None:
+            return None
+
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+
+        if (entry["mtime_ns"], entry["size"]) != (stat.st_mtime_ns, stat.st_size):
+            return None
+
+        if entry["sha256"] != hashlib.sha256(content).hexdigest():
+            return None
+
+        data: dict = entry["data"]
+
+        return data
+
+    def set_toml(self, path: Path, content: bytes, data: dict) -> None:
+        """Caches the decoded `[tool.django]` `data` for the TOML file at `path`.
+
+        Args:
+            path: The TOML file.
+            content: The content of the TOML file that `data` was decoded from.
+            data: The decoded data before any special operations get resolved.
+        """
+
+        try:
+            stat = path.stat()
+            entry = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": hashlib.sha256(content).hexdigest(),
+                "data": data,
+            }
+
+            self.write(self.get_toml_path(path), dumps(entry))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Skip TOML cache: {e}")
+
+    def get_toml_path(self, path: Path) -> Path:
+        key = hashlib.sha256(f"{CACHE_VERSION}:{sys.version_info[:2]}:{path.absolute()}".encode()).hexdigest()
+
+        return self.directory / f"{key}.decoded"
+
+    def load(self, path: Path) -> Any:
+        try:
+            return loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError) as e:
+            logger.warning(f"Cannot load cache at: {path}: {e}")
+
+        return None
+
+    def write(self, path: Path, content: bytes) -> None:
+        """Atomically writes `content` to `path`."""
+
+        temp_name = None
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+                temp_name = f.name
+                f.write(content)
+
+            os.replace(temp_name, path)
+        except OSError as e:
+            logger.warning(f"Cannot write cache at: {path}: {e}")
+
+            if temp_name:
+                Path(temp_name).unlink(missing_ok=True)
+
+
+class SettingsMemo:
+    """Bounded in-process LRU cache of resolved settings.
+
+    Entries are keyed by the TOML file paths, the `stat` signature of each TOML file and the `ENVIRONMENT`
+    environment variable. Like `SettingsCache`, entries are only used when the environment variables and variables
+    that were read while resolving the settings still have the same values.
+
+    The decoded `[tool.django]` data of each TOML file is also kept (keyed by the path and its `stat` signature), so
+    adding or changing one file of a directory of fragments does not decode the other files again.
+    """
+
+    maxsize: int
+    entries: OrderedDict
+    decoded: dict[Path, tuple[tuple, dict]]
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.decoded = {}
+        self.lock = threading.Lock()
+
+    def get_key(self, paths: list[Path], environment: Environment, lexical_paths: bool = False) -> tuple:  # noqa: FBT001, FBT002
+        """Gets the key for the settings resolved from `paths`."""
+
+        return (
+            tuple(str(path.absolute()) for path in paths),
+            tuple(get_signature(path) for path in paths),
+            str(Path.cwd()),
+            environment.get("ENVIRONMENT"),
+            lexical_paths,
+            registry.keys,
+        )
+
+    def get(self, key: tuple, data: dict, environment: Environment) -> dict | None:
+        """Gets a copy of the cached settings for `key` if they are still valid for `data` and `environment`."""
+
+        with self.lock:
+            entry: dict | None = self.entries.get(key)
+
+            if entry is None:
+                return None
+
+            if not is_fresh(entry, data, environment):
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+
+        environment.consulted.update(entry["environ"])
+        environment.files.update(entry["files"])
+
+        settings: dict = deepcopy(entry["settings"])
+
+        return settings
+
+    def set(self, key: tuple, data: dict, environment: Environment, references: set[str], settings: dict) -> None:
+        """Caches a copy of the resolved `settings` for `key`."""
+
+        try:
+            entry = create_entry(data, environment, references, deepcopy(settings))
+        except (ValueError, TypeError) as e:
+            logger.debug(f"Skip settings memo: {e}")
+            return
+
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def get_toml(self, path: Path, signature: tuple) -> dict | None:
+        """Gets a copy of the decoded `[tool.django]` data for the TOML file at `path` if it has not changed."""
+
+        with self.lock:
+            entry = self.decoded.get(path.absolute())
+
+        if entry is None or entry[0] != signature:
+            return None
+
+        data: dict = deepcopy(entry[1])
+
+        return data
+
+    def set_toml(self, path: Path, signature: tuple, data: dict) -> None:
+        """Keeps a copy of the decoded `[tool.django]` `data` for the TOML file at `path` with `signature`."""
+
+        data = deepcopy(data)
+
+        with self.lock:
+            self.decoded[path.absolute()] = (signature, data)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.decoded.clear()
+
+
+memo = SettingsMemo()
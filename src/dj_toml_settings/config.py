@@ -1,45 +1,376 @@
+import os
+from collections import ChainMap
+from collections.abc import Mapping, MutableMapping
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from typeguard import typechecked
-
+from dj_toml_settings.environment import Environment, RecordingEnvironment, get_snapshot
+from dj_toml_settings.freeze import freeze_settings
+from dj_toml_settings.hooks import EnvironmentIndex
+from dj_toml_settings.overlay import Layers
+from dj_toml_settings.resolver import Resolver
 from dj_toml_settings.toml_parser import Parser
+from dj_toml_settings.typechecking import typechecked
+
+if TYPE_CHECKING:
+    from dj_toml_settings.hooks import Hooks
+    from dj_toml_settings.plan import Plan
 
 TOML_SETTINGS_FILES = ["pyproject.toml", "django.toml"]
 
+# Characters that make a name in `toml_settings_files` a glob pattern
+GLOB_CHARACTERS = frozenset("*?[")
+
+
+def get_settings_paths(base_dir: Path, toml_settings_files: list[str]) -> list[Path]:
+    """Gets the paths of the TOML files in order of precedence.
+
+    A name in `toml_settings_files` can also be a directory (every `*.toml` file in it is a fragment) or a glob
+    pattern relative to `base_dir` (e.g. `"settings/*.toml"`). Fragments are sorted by name, so they are applied in
+    the same order everywhere.
+    """
+
+    settings_paths = []
+
+    for settings_file_name in toml_settings_files:
+        settings_path = base_dir / settings_file_name
+
+        if GLOB_CHARACTERS.intersection(settings_file_name):
+            settings_paths.extend(sorted(path for path in base_dir.glob(settings_file_name) if path.is_file()))
+        elif settings_path.is_dir():
+            # `scandir` gets the file types with the directory listing, so every fragment does not need a `stat`
+            with os.scandir(settings_path) as entries:
+                settings_paths.extend(
+                    sorted(
+                        settings_path / entry.name
+                        for entry in entries
+                        if entry.name.endswith(".toml") and entry.is_file()
+                    )
+                )
+        else:
+            settings_paths.append(settings_path)
+
+    return settings_paths
+
 
 @typechecked
-def get_toml_settings(base_dir: Path, data: dict | None = None, toml_settings_files: list[str] | None = None) -> dict:
+def get_toml_settings(
+    base_dir: Path,
+    data: dict | None = None,
+    toml_settings_files: list[str] | None = None,
+    *,
+    cache_dir: Path | None = None,
+    memoize: bool = False,
+    lazy: list[str] | None = None,
+    hooks: list["Hooks"] | None = None,
+    workers: int | None = None,
+    env_sources: list[Path | Mapping[str, str]] | None = None,
+    frozen: bool | list[str] = False,
+    lexical_paths: bool = False,
+) -> dict:
     """Gets the Django settings from the TOML files.
 
     TOML files to look in for settings:
     - pyproject.toml
     - django.toml
+
+    `toml_settings_files` can also have directories or glob patterns of TOML fragments (see `get_settings_paths`).
+
+    Args:
+        base_dir: Base directory to look for TOML files
+        data: Dictionary of existing settings
+        toml_settings_files: TOML file names to look for in `base_dir`
+        cache_dir: Directory to cache the resolved settings in; caching is disabled when not set
+        memoize: Whether to keep the resolved settings in memory for later calls; use
+            `get_toml_settings.cache_clear()` to clear them
+        lazy: Settings (e.g. `"STATIC_ROOT"`) or special operators (e.g. `"$type"`) that get resolved the first time
+            they are accessed; a new `LazySettings` gets returned when it is set, and `data` does not get updated.
+            Lazy values only get resolved when they are accessed with `LazySettings.__getitem__` or `get`.
+        hooks: `Hooks` that get called while the TOML files are parsed, e.g. a `StatsCollector`
+        workers: Number of threads to read and decode the TOML files with concurrently; they are read one after
+            another when it is not set. The settings are the same either way.
+        env_sources: Where environment variables are read from: mappings (e.g. `os.environ`) or `.env` files, with
+            the later sources overriding the earlier ones. They are merged once into an immutable snapshot; the
+            process environment is used when it is not set.
+        frozen: Whether to convert the values of the settings into immutable containers (see `freeze`), so they can
+            be shared with the workers of a preforking server without getting modified. `True` freezes every setting
+            except `MUTABLE_SETTINGS` (`DATABASES` and `LOGGING`, which Django modifies in place); a list freezes
+            only those settings.
+        lexical_paths: Whether to normalize `$path`, `$file` and `$type = "path"` paths without accessing the file
+            system, i.e. `..` is removed lexically and symbolic links are not followed
     """
 
     toml_settings_files = toml_settings_files or TOML_SETTINGS_FILES
     data = data or {}
+    environment = Environment(get_snapshot(env_sources) if env_sources is not None else None)
+    settings_paths = get_settings_paths(base_dir, toml_settings_files)
+    frozen_keys = frozen if isinstance(frozen, list) else None
 
-    for settings_file_name in toml_settings_files:
-        settings_path = base_dir / settings_file_name
+    cache = None
+    cache_key = None
+    memo_key = None
+    settings_memo = None
+
+    if cache_dir or memoize:
+        # Only import the caches when they are used to reduce import time
+        from dj_toml_settings.cache import SettingsCache, memo  # noqa: PLC0415
+
+        cache = SettingsCache(cache_dir) if cache_dir else None
+        settings_memo = memo if memoize else None
+        # Resolved settings are not looked up when some of them are lazy, so a `LazySettings` gets returned; the
+        # decoded TOML files are still cached
+        memo_key = memo.get_key(settings_paths, environment, lexical_paths) if memoize and not lazy else None
+
+    if memo_key and (memoized_settings := memo.get(memo_key, data, environment)) is not None:
+        data.update(freeze_settings(memoized_settings, frozen_keys) if frozen else memoized_settings)
 
-        if settings_path.exists():
-            file_data = Parser(settings_path, data=data.copy()).parse_file()
-            data.update(file_data)
+        return data
+
+    cache_key = cache.get_key(settings_paths, environment, lexical_paths) if cache and not lazy else None
+
+    if cache and cache_key and (cache_entry := cache.get(cache_key, data, environment)) is not None:
+        if memo_key:
+            memo.set(memo_key, data, environment, set(cache_entry["references"]), cache_entry["settings"])
+
+        data.update(freeze_settings(cache_entry["settings"], frozen_keys) if frozen else cache_entry["settings"])
+
+        return data
+
+    # Resolve the settings from all files together, so variables can refer to settings from any file. Every file
+    # writes to its own layer on top of `data`, so `data` does not get copied and only the changes get merged back.
+    layers = Layers(data)
+    resolver = Resolver(data)
+    parsers = [
+        Parser(
+            settings_path,
+            data=layers.add(),
+            environment=environment,
+            cache=cache,
+            hooks=hooks,
+            memo=settings_memo,
+            lexical_paths=lexical_paths,
+        )
+        for settings_path in settings_paths
+        if settings_path.exists()
+    ]
+
+    plans = compile_plans(parsers, workers)
+
+    for parser, plan in zip(parsers, plans, strict=True):
+        resolver.add(parser, parser.get_assignments(plan))
+
+    if not all(plan.cacheable for plan in plans):
+        # Custom operators could return a different value every time, e.g. from a secrets manager
+        cache_key = memo_key = None
+
+    resolver.resolve(lazy=frozenset(lazy or ()))
+    settings = layers.changes()
+
+    if lazy:
+        from dj_toml_settings.lazy import LazySettings  # noqa: PLC0415
+
+        # Lazy values cannot be cached because they are not resolved yet. `data` is not updated, because copying the
+        # settings (e.g. with `dict.update`) would copy the unresolved `LazyValue` objects.
+        return LazySettings({**data, **(freeze_settings(settings, frozen_keys) if frozen else settings)})
+
+    references = set()
+
+    for parser in parsers:
+        references.update(parser.references)
+
+    # `data` has not been updated yet, so it still has the values the settings were resolved with
+    if cache and cache_key:
+        cache.set(cache_key, data, environment, references, settings)
+
+    if memo_key:
+        memo.set(memo_key, data, environment, references, settings)
+
+    data.update(freeze_settings(settings, frozen_keys) if frozen else settings)
 
     return data
 
 
+async def aget_toml_settings(
+    base_dir: Path,
+    data: dict | None = None,
+    toml_settings_files: list[str] | None = None,
+    *,
+    cache_dir: Path | None = None,
+    memoize: bool = False,
+    lazy: list[str] | None = None,
+    hooks: list["Hooks"] | None = None,
+    workers: int | None = None,
+    env_sources: list[Path | Mapping[str, str]] | None = None,
+    frozen: bool | list[str] = False,
+    lexical_paths: bool = False,
+) -> dict:
+    """Gets the Django settings from the TOML files without blocking the event loop, e.g. in an ASGI lifespan hook.
+
+    The TOML files are read, decoded and resolved in a thread, and the files are decoded concurrently. The settings
+    are the same as from `get_toml_settings`; see it for the arguments. `workers` defaults to the number of CPUs.
+    """
+
+    # Only import `asyncio` when it is used to reduce import time
+    import asyncio  # noqa: PLC0415
+
+    return await asyncio.to_thread(
+        get_toml_settings,
+        base_dir,
+        data,
+        toml_settings_files,
+        cache_dir=cache_dir,
+        memoize=memoize,
+        lazy=lazy,
+        hooks=hooks,
+        workers=workers or os.cpu_count(),
+        env_sources=env_sources,
+        frozen=frozen,
+        lexical_paths=lexical_paths,
+    )
+
+
+@typechecked
+def get_toml_settings_for_environments(
+    base_dir: Path,
+    data: dict | None = None,
+    toml_settings_files: list[str] | None = None,
+    environments: list[str] | None = None,
+    *,
+    env_sources: list[Path | Mapping[str, str]] | None = None,
+) -> dict[str, dict]:
+    """Gets the Django settings for multiple `ENVIRONMENT` values from one decode of the TOML files.
+
+    The settings without an environment get resolved once. For each environment, only the settings from its
+    `[tool.django.envs.*]` sections (and the settings that refer to them, or that read `ENVIRONMENT`) get resolved
+    again; every other value is shared between the environments, so the values should not be modified in place.
+
+    Args:
+        base_dir: Base directory to look for TOML files
+        data: Dictionary of existing settings; it does not get updated
+        toml_settings_files: TOML file names to look for in `base_dir`
+        environments: `ENVIRONMENT` values to get the settings for; defaults to every `[tool.django.envs.*]` section
+            in the TOML files
+        env_sources: Where environment variables are read from (see `get_toml_settings`)
+
+    Returns:
+        The settings for each environment, like `get_toml_settings` would return them for that `ENVIRONMENT`
+    """
+
+    data = data or {}
+    environ = get_snapshot(env_sources) if env_sources is not None else os.environ
+    base_environ = {name: value for name, value in environ.items() if name != "ENVIRONMENT"}
+    settings_paths = get_settings_paths(base_dir, toml_settings_files or TOML_SETTINGS_FILES)
+    plans = {path: Parser(path).compile() for path in settings_paths if path.exists()}
+
+    if environments is None:
+        environments = list(dict.fromkeys(name for plan in plans.values() for name in plan.envs))
+
+    environment_keys = {
+        environment_name: {
+            assignment.key for plan in plans.values() for assignment in plan.envs.get(environment_name, ())
+        }
+        for environment_name in environments
+    }
+
+    # Resolve the settings without an environment once, and record which of them read `ENVIRONMENT`. Variables that
+    # every environment defines are not missing, so they are only logged when an environment does not define them.
+    base_overlay = Layers(data).add()
+    index = EnvironmentIndex(ignore=frozenset())
+    resolver = get_plans_resolver(plans, None, base_overlay, RecordingEnvironment(base_environ), [index])
+    resolver.resolve(warn_undefined=False)
+    warned = resolver.warn_undefined(ignore=set.intersection(*environment_keys.values()) if environments else ())
+    base_settings = base_overlay.layer
+
+    settings_for_environments = {}
+
+    for environment_name in environments:
+        changed_keys = set(environment_keys[environment_name])
+        changed_keys.update(index.keys.get("ENVIRONMENT", ()))
+
+        # The settings that are not affected by the environment are shared as-is
+        base: dict = {}
+        overlay = Layers(base).add()
+        environment = Environment(ChainMap({"ENVIRONMENT": environment_name}, base_environ))
+        resolver = get_plans_resolver(plans, environment_name, overlay, environment)
+        affected = resolver.get_dependents(changed_keys)
+
+        base.update(data)
+        base.update((key, value) for key, value in base_settings.items() if key not in affected)
+
+        resolver.resolve(keys=affected, warn_undefined=False)
+        warned |= resolver.warn_undefined(affected, ignore=warned)
+
+        settings_for_environments[environment_name] = {**base, **overlay.layer}
+
+    return settings_for_environments
+
+
+def get_plans_resolver(
+    plans: dict[Path, "Plan"],
+    environment_name: str | None,
+    data: MutableMapping,
+    environment: Environment,
+    hooks: list["Hooks"] | None = None,
+) -> Resolver:
+    """Gets a `Resolver` for the settings that `plans` assign for `environment_name`; `plans` are in order of
+    precedence.
+    """
+
+    resolver = Resolver(data)
+
+    for path, plan in plans.items():
+        parser = Parser(path, data=data, environment=environment, hooks=hooks)
+        resolver.add(parser, plan.get_assignments(environment_name))
+
+    return resolver
+
+
+def compile_plans(parsers: list[Parser], workers: int | None = None) -> list["Plan"]:
+    """Compile the TOML file of every parser, in a thread pool with `workers` threads when it is set.
+
+    The plans are returned in the same order as `parsers`, so the precedence of the files does not change.
+    """
+
+    if not workers or len(parsers) < 2:  # noqa: PLR2004
+        return [parser.compile() for parser in parsers]
+
+    # Only import the thread pool when it is used to reduce import time
+    from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(parsers)), thread_name_prefix="dj-toml-settings") as executor:
+        return list(executor.map(Parser.compile, parsers))
+
+
+def cache_clear() -> None:
+    """Clears the settings memoized by `get_toml_settings`."""
+
+    from dj_toml_settings.cache import memo  # noqa: PLC0415
+
+    memo.clear()
+
+
+get_toml_settings.cache_clear = cache_clear  # type: ignore[attr-defined]
+
+
 @typechecked
-def configure_toml_settings(base_dir: Path, data: dict) -> None:
+def configure_toml_settings(
+    base_dir: Path,
+    data: dict,
+    *,
+    cache_dir: Path | None = None,
+    memoize: bool = False,
+) -> None:
     """Configure Django settings from TOML files.
 
     Args:
         base_dir: Base directory to look for TOML files
         data: Dictionary to update with settings from TOML files
+        cache_dir: Directory to cache the resolved settings in; caching is disabled when not set
+        memoize: Whether to keep the resolved settings in memory for later calls
 
     Returns:
         The updated dictionary with settings from TOML files
     """
 
-    toml_settings = get_toml_settings(base_dir, data)
+    toml_settings = get_toml_settings(base_dir, data, cache_dir=cache_dir, memoize=memoize)
     data.update(toml_settings)
@@ -0,0 +1,132 @@
+import sys
+from datetime import timedelta
+from pathlib import PurePath
+from types import MappingProxyType
+from typing import Any
+
+# Strings up to this length are interned with `sys.intern`, so they are also shared with the rest of the process
+INTERN_MAX_LENGTH = 64
+
+# Immutable types where equal values can be replaced with one shared value. Floats, decimals and dates are not
+# included, because equal values can still be different (e.g. `0.0` and `-0.0`, or a different time zone).
+SHARED_TYPES = (str, bytes, int, timedelta)
+
+
+class Deduplicator:
+    """Replaces equal immutable values in settings with one shared value.
+
+    Dictionary keys and short strings get interned, and equal strings, bytes, integers, `Path` objects, tuples and
+    frozensets are shared. Use the same `Deduplicator` for multiple settings dictionaries (e.g. one for every tenant)
+    to share the values between them too. Dictionaries, lists and sets are updated in place.
+    """
+
+    shared: dict[tuple, Any]
+    bytes_saved: int
+
+    def __init__(self):
+        self.shared = {}
+        self.bytes_saved = 0
+
+    def dedupe(self, value: Any) -> Any:
+        """Deduplicate `value` and everything in it; returns the deduplicated value."""
+
+        return self.dedupe_value(value, set())
+
+    def dedupe_value(self, value: Any, seen: set[int]) -> Any:
+        value_type = type(value)
+
+        if value_type is dict:
+            if id(value) not in seen:
+                seen.add(id(value))
+                items = [(self.intern(key), self.dedupe_value(item, seen)) for key, item in value.items()]
+                value.clear()
+                value.update(items)
+
+            return value
+
+        if value_type is list:
+            if id(value) not in seen:
+                seen.add(id(value))
+                value[:] = [self.dedupe_value(item, seen) for item in value]
+
+            return value
+
+        if value_type is set:
+            if id(value) not in seen:
+                seen.add(id(value))
+                items = [self.dedupe_value(item, seen) for item in value]
+                value.clear()
+                value.update(items)
+
+            return value
+
+        if value_type is MappingProxyType:
+            return MappingProxyType({self.intern(key): self.dedupe_value(item, seen) for key, item in value.items()})
+
+        if value_type is tuple:
+            tuple_items = tuple(self.dedupe_value(item, seen) for item in value)
+
+            if all(item is original for item, original in zip(tuple_items, value, strict=True)):
+                tuple_items = value
+
+            # The items are already shared, so tuples are keyed by the identity of their items; otherwise equal
+            # tuples like `(1,)` and `(True,)` would be shared
+            return self.share((tuple, tuple(map(id, tuple_items))), tuple_items, value)
+
+        if value_type is frozenset:
+            frozen_items = frozenset(self.dedupe_value(item, seen) for item in value)
+
+            return self.share((frozenset, frozenset(map(id, frozen_items))), frozen_items, value)
+
+        if value_type is str:
+            if len(value) <= INTERN_MAX_LENGTH:
+                return self.intern(value)
+
+            return self.share((str, value), value)
+
+        if isinstance(value, PurePath):
+            return self.share((value_type, str(value)), value)
+
+        if value_type in SHARED_TYPES:
+            return self.share((value_type, value), value)
+
+        return value
+
+    def share(self, key: tuple, value: Any, original: Any = None) -> Any:
+        """Get the shared value for `key`, or share `value` if there is none yet.
+
+        `original` is the value that `value` was rebuilt from (with shared items), if any.
+        """
+
+        shared = self.shared.setdefault(key, value)
+
+        if shared is not value:
+            self.bytes_saved += sys.getsizeof(value if original is None else original)
+
+        return shared
+
+    def intern(self, value: Any) -> Any:
+        if type(value) is not str:
+            return value
+
+        interned = sys.intern(value)
+
+        if interned is not value:
+            self.bytes_saved += sys.getsizeof(value)
+
+        return interned
+
+
+def dedupe(settings: dict, deduplicator: Deduplicator | None = None) -> int:
+    """Deduplicate the values in `settings` in place; returns approximately how many bytes were saved.
+
+    The saved bytes are the sizes of the values that were replaced with a shared value, so they are only freed when
+    nothing else refers to them anymore.
+    """
+
+    deduplicator = deduplicator or Deduplicator()
+    bytes_saved = deduplicator.bytes_saved
+
+    deduplicator.dedupe(settings)
+
+    return deduplicator.bytes_saved - bytes_saved
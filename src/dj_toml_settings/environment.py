@@ -0,0 +1,194 @@
+import logging
+import os
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Escapes in double-quoted `.env` values
+ESCAPES = {"n": "\n", "r": "\r", "t": "\t", '"': '"', "\\": "\\"}
+ESCAPE_PATTERN = re.compile(r"\\(.)")
+
+# A single- or double-quoted `.env` value, optionally followed by a comment
+QUOTED_PATTERN = re.compile(r"""("(?:\\.|[^"\\])*"|'[^']*')\s*(?:#.*)?""")
+
+# Parsed `.env` files, keyed by path, with the `stat` signature they were parsed with
+env_files: dict[Path, tuple[tuple, dict[str, str]]] = {}
+
+
+def get_signature(path: Path) -> tuple | None:
+    """Gets the `stat` signature of `path` to know whether it changed, or `None` if it does not exist."""
+
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+
+
+class Snapshot(Mapping[str, str]):
+    """An immutable and hashable copy of environment variables."""
+
+    __slots__ = ("hash", "variables")
+
+    variables: dict[str, str]
+    hash: int | None
+
+    def __init__(self, environ: Mapping[str, str] | None = None):
+        self.variables = dict(environ or {})
+        self.hash = None
+
+    def __getitem__(self, name: str) -> str:
+        return self.variables[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.variables)
+
+    def __len__(self) -> int:
+        return len(self.variables)
+
+    def __hash__(self) -> int:
+        if self.hash is None:
+            self.hash = hash(frozenset(self.variables.items()))
+
+        return self.hash
+
+    def __repr__(self) -> str:
+        return f"Snapshot({len(self.variables)} variables)"
+
+
+def get_snapshot(sources: Iterable[Path | Mapping[str, str]]) -> Snapshot:
+    """Merge environment variable `sources` into one `Snapshot`; later sources override the earlier ones.
+
+    A source is a mapping (e.g. `os.environ`) or the path to a `.env` file.
+    """
+
+    environ: dict[str, str] = {}
+
+    for source in sources:
+        environ.update(source if isinstance(source, Mapping) else read_env_file(source))
+
+    return Snapshot(environ)
+
+
+def read_env_file(path: Path) -> dict[str, str]:
+    """Read the variables from the `.env` file at `path`; a missing file has no variables.
+
+    The parsed variables are cached by the `stat` signature of the file, so an unchanged file does not get parsed
+    again.
+    """
+
+    signature = get_signature(path)
+
+    if signature is None:
+        logger.debug(f"Cannot find .env file at: {path}")
+
+        return {}
+
+    if (cached := env_files.get(path)) and cached[0] == signature:
+        return cached[1]
+
+    environ = parse_env(path.read_text(encoding="utf-8"))
+    env_files[path] = (signature, environ)
+
+    return environ
+
+
+def parse_env(content: str) -> dict[str, str]:
+    """Parse `NAME=value` lines of a `.env` file.
+
+    Lines can start with `export`, and values can be in single or double quotes; only double-quoted values support
+    escapes like `\\n`. Comments start with `#` at the start of a line, after the closing quote of quoted values, or
+    after whitespace for unquoted values.
+    """
+
+    environ = {}
+
+    for line in content.splitlines():
+        line = line.strip()  # noqa: PLW2901
+
+        if line.startswith("export "):
+            line = line[len("export ") :].lstrip()  # noqa: PLW2901
+
+        name, separator, value = line.partition("=")
+        name = name.strip()
+
+        if not separator or not name or name.startswith("#"):
+            continue
+
+        value = value.strip()
+
+        if quoted := QUOTED_PATTERN.fullmatch(value):
+            value = quoted.group(1)[1:-1]
+
+            if quoted.group(1)[0] == '"':
+                value = ESCAPE_PATTERN.sub(lambda match: ESCAPES.get(match.group(1), match.group(0)), value)
+        else:
+            value = value.split(" #", 1)[0].split("\t#", 1)[0].rstrip()
+
+        environ[name] = value
+
+    return environ
+
+
+class Environment:
+    """Reads environment variables and records every variable that gets consulted.
+
+    The recorded variables (and the values they had) are used to know whether a cached result is still valid. Files
+    that are read with `$file` (e.g. mounted secrets) are recorded in `files` with their `stat` signature.
+    """
+
+    environ: Mapping[str, str]
+    consulted: dict[str, str | None]
+    files: dict[str, tuple | None]
+
+    def __init__(self, environ: Mapping[str, str] | None = None):
+        self.environ = os.environ if environ is None else environ
+        self.consulted = {}
+        self.files = {}
+
+    def get(self, name: str, default=None):
+        """Gets the value of an environment variable, or `default` if it is not set."""
+
+        value = self.environ.get(name)
+        self.consulted[name] = value
+
+        return default if value is None else value
+
+    def matches(self, consulted: Mapping[str, str | None]) -> bool:
+        """Whether the current environment has the same values for all of the `consulted` variables."""
+
+        return all(self.environ.get(name) == value for name, value in consulted.items())
+
+    def matches_files(self, files: Mapping[str, tuple | None]) -> bool:
+        """Whether all of the `files` still have the same `stat` signatures."""
+
+        return all(get_signature(Path(path)) == signature for path, signature in files.items())
+
+
+class RecordingEnvironment(Environment):
+    """An `Environment` that also records the variables that were read since the last `pop_recorded()`.
+
+    Used by `EnvironmentIndex` to know which variables every setting reads.
+    """
+
+    recorded: set[str]
+
+    def __init__(self, environ: Mapping[str, str] | None = None):
+        super().__init__(environ)
+        self.recorded = set()
+
+    def get(self, name: str, default=None):
+        self.recorded.add(name)
+
+        return super().get(name, default)
+
+    def pop_recorded(self) -> set[str]:
+        """Gets the variables that were read since the last call, and starts recording again."""
+
+        recorded = self.recorded
+        self.recorded = set()
+
+        return recorded
@@ -1,2 +1,6 @@
 class InvalidActionError(Exception):
     pass
+
+
+class VariableCycleError(Exception):
+    pass
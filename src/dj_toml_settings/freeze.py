@@ -0,0 +1,61 @@
+import gc
+from collections.abc import Collection, Mapping
+from types import MappingProxyType
+from typing import Any
+
+from dj_toml_settings.lazy import LazyValue
+
+# Settings that Django modifies in place, e.g. `ConnectionHandler` adds defaults to every database in `DATABASES`
+# and `dictConfig` pops keys from the handlers in `LOGGING`
+MUTABLE_SETTINGS = frozenset(("DATABASES", "LOGGING"))
+
+
+def freeze(value: Any) -> Any:
+    """Convert `value` into immutable containers, recursively.
+
+    Dictionaries become read-only `MappingProxyType` views, lists and tuples become tuples, and sets become
+    frozensets. A `LazyValue` gets frozen when it is resolved. Other values are returned as-is.
+    """
+
+    if isinstance(value, MappingProxyType):
+        return value
+
+    if isinstance(value, LazyValue):
+        return freeze(value.value) if value.resolved else LazyValue(lambda: freeze(value.resolve()))
+
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+
+    if isinstance(value, list | tuple):
+        return tuple(freeze(item) for item in value)
+
+    if isinstance(value, set | frozenset):
+        return frozenset(freeze(item) for item in value)
+
+    return value
+
+
+def freeze_settings(settings: Mapping, keys: Collection[str] | None = None) -> dict:
+    """Freeze the values of `settings`; the settings themselves stay a `dict` so they can update a settings module.
+
+    Args:
+        settings: Settings to freeze
+        keys: Settings to freeze; every setting except `MUTABLE_SETTINGS` gets frozen when it is not set
+    """
+
+    if keys is None:
+        keys = settings.keys() - MUTABLE_SETTINGS
+
+    return {key: freeze(value) if key in keys else value for key, value in settings.items()}
+
+
+def freeze_gc() -> None:
+    """Move every object that is currently tracked by the garbage collector to a permanent generation.
+
+    Call it after the settings are loaded in a preforking server (e.g. in gunicorn's `when_ready` hook with
+    `preload_app`), so the garbage collector in the workers does not touch (and copy) the memory pages of the
+    settings that are shared with the parent process.
+    """
+
+    gc.collect()
+    gc.freeze()
@@ -0,0 +1,142 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from dj_toml_settings.environment import RecordingEnvironment
+
+if TYPE_CHECKING:
+    from dj_toml_settings.toml_parser import Parser
+
+
+class Hooks:
+    """Gets called while TOML files get parsed; override the events that are needed.
+
+    All durations are in seconds. When a `Parser` does not have any hooks, the events are not timed at all.
+    """
+
+    def file_decoded(self, parser: "Parser", duration: float) -> None:
+        """The `[tool.django]` data of `parser.path` was read and decoded (or loaded from the cache)."""
+
+    def section_entered(self, parser: "Parser", section: str, duration: float) -> None:
+        """The settings in `section` (e.g. `tool.django.apps.blog`) were compiled."""
+
+    def key_resolved(self, parser: "Parser", section: str, key: str, duration: float) -> None:
+        """The setting `key` from `section` was resolved; includes the operators that were applied."""
+
+    def operator_applied(self, parser: "Parser", key: str, operator: str, duration: float) -> None:
+        """The special `operator` (e.g. `$path`) was applied for the setting `key`."""
+
+
+class Timing:
+    """How many times something happened and how long it took in total."""
+
+    __slots__ = ("count", "seconds")
+
+    count: int
+    seconds: float
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.seconds += duration
+
+    def __repr__(self) -> str:
+        return f"Timing(count={self.count}, seconds={self.seconds:.6f})"
+
+
+class Stats:
+    """Timings from parsing TOML files, collected by `StatsCollector`.
+
+    `sections` includes compiling the section and resolving its settings, and `keys` has the time to resolve every
+    setting as `(duration, section, key)`.
+    """
+
+    files: dict[Path, Timing]
+    sections: dict[str, Timing]
+    operators: dict[str, Timing]
+    keys: list[tuple[float, str, str]]
+
+    def __init__(self):
+        self.files = {}
+        self.sections = {}
+        self.operators = {}
+        self.keys = []
+
+    def get_slowest_keys(self, count: int = 10) -> list[tuple[float, str, str]]:
+        """Gets the `count` slowest settings to resolve as `(duration, section, key)`."""
+
+        return sorted(self.keys, reverse=True)[:count]
+
+    def report(self, count: int = 10) -> str:
+        """Format the stats as a human-readable report."""
+
+        lines = ["Files:"]
+        lines.extend(f"  {path}: {timing.seconds * 1e3:.2f}ms" for path, timing in self.files.items())
+
+        lines.append("Sections:")
+        lines.extend(
+            f"  {section}: {timing.seconds * 1e3:.2f}ms"
+            for section, timing in sorted(self.sections.items(), key=lambda item: -item[1].seconds)
+        )
+
+        lines.append("Operators:")
+        lines.extend(
+            f"  {operator}: {timing.count} in {timing.seconds * 1e3:.2f}ms"
+            for operator, timing in sorted(self.operators.items(), key=lambda item: -item[1].seconds)
+        )
+
+        lines.append("Slowest keys:")
+        lines.extend(
+            f"  {section}.{key}: {duration * 1e3:.2f}ms" for duration, section, key in self.get_slowest_keys(count)
+        )
+
+        return "\n".join(lines)
+
+
+class StatsCollector(Hooks):
+    """Collects the timings of every event into `stats`."""
+
+    stats: Stats
+
+    def __init__(self):
+        self.stats = Stats()
+
+    def file_decoded(self, parser: "Parser", duration: float) -> None:
+        self.stats.files.setdefault(parser.path, Timing()).add(duration)
+
+    def section_entered(self, parser: "Parser", section: str, duration: float) -> None:  # noqa: ARG002
+        self.stats.sections.setdefault(section, Timing()).add(duration)
+
+    def key_resolved(self, parser: "Parser", section: str, key: str, duration: float) -> None:  # noqa: ARG002
+        # Sections only count the time of compiling and resolving, not the number of times they were entered
+        self.stats.sections.setdefault(section, Timing()).seconds += duration
+        self.stats.keys.append((duration, section, key))
+
+    def operator_applied(self, parser: "Parser", key: str, operator: str, duration: float) -> None:  # noqa: ARG002
+        self.stats.operators.setdefault(operator, Timing()).add(duration)
+
+
+class EnvironmentIndex(Hooks):
+    """Indexes which settings read which environment variables, e.g. with `$env` or `${env:NAME}`.
+
+    Only settings that are resolved with a `RecordingEnvironment` get indexed. `keys` only has the settings that read
+    a variable directly; the settings that refer to them with `${VAR}` can be found with `Resolver.get_dependents`.
+
+    `ENVIRONMENT` is ignored by default, because it selects the `envs` sections and so affects which settings get
+    assigned instead; it is also read by `Parser.get_assignments` before any setting gets resolved.
+    """
+
+    keys: dict[str, set[str]]
+    ignore: frozenset[str]
+
+    def __init__(self, ignore: frozenset[str] = frozenset(["ENVIRONMENT"])):
+        self.keys = {}
+        self.ignore = ignore
+
+    def key_resolved(self, parser: "Parser", section: str, key: str, duration: float) -> None:  # noqa: ARG002
+        if isinstance(parser.environment, RecordingEnvironment):
+            for name in parser.environment.pop_recorded():
+                if name not in self.ignore:
+                    self.keys.setdefault(name, set()).add(key)
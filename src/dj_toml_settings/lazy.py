@@ -0,0 +1,91 @@
+import threading
+from collections.abc import Callable, Iterator
+from typing import Any
+
+UNRESOLVED = object()
+
+
+class LazyValue:
+    """A setting that gets resolved the first time it is accessed.
+
+    The value is only resolved once, even when it is accessed from multiple threads at the same time.
+    """
+
+    __slots__ = ("function", "lock", "value")
+
+    function: Callable[[], Any] | None
+    value: Any
+
+    def __init__(self, function: Callable[[], Any]):
+        self.function = function
+        self.lock = threading.Lock()
+        self.value = UNRESOLVED
+
+    @property
+    def resolved(self) -> bool:
+        return self.value is not UNRESOLVED
+
+    def resolve(self) -> Any:
+        if self.value is UNRESOLVED:
+            with self.lock:
+                if self.value is UNRESOLVED and self.function:
+                    self.value = self.function()
+
+                    # Release everything the function refers to
+                    self.function = None
+
+        return self.value
+
+    def __repr__(self) -> str:
+        if self.resolved:
+            return f"LazyValue({self.value!r})"
+
+        return "LazyValue(<unresolved>)"
+
+
+def resolve_value(value: Any) -> Any:
+    return value.resolve() if isinstance(value, LazyValue) else value
+
+
+class LazySettings(dict):
+    """Settings where some of the values are a `LazyValue` that gets resolved when it is accessed.
+
+    Values are resolved by `settings[key]`, `get`, `values`, `items` and `resolve`. `dict(settings)`, `{**settings}`
+    and `dict.update` (e.g. `globals().update(settings)`) copy the unresolved `LazyValue` objects instead.
+    """
+
+    def __getitem__(self, key: Any) -> Any:
+        return resolve_value(super().__getitem__(key))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return resolve_value(super().get(key, default))
+
+    def pop(self, key: Any, *args: Any) -> Any:
+        return resolve_value(super().pop(key, *args))
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        return resolve_value(super().setdefault(key, default))
+
+    def values(self) -> Iterator[Any]:  # type: ignore[override]
+        for value in super().values():
+            yield resolve_value(value)
+
+    def items(self) -> Iterator[tuple[Any, Any]]:  # type: ignore[override]
+        for key, value in super().items():
+            yield key, resolve_value(value)
+
+    def copy(self) -> "LazySettings":
+        return LazySettings(super().items())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, dict):
+            return NotImplemented
+
+        return self.keys() == other.keys() and all(value == other[key] for key, value in self.items())
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def resolve(self) -> dict:
+        """Resolve all lazy values and return them in a `dict`."""
+
+        return dict(self.items())
@@ -0,0 +1,222 @@
+import logging
+from collections.abc import Callable, Iterable
+from pathlib import PurePath
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from dj_toml_settings.value_parsers.dict_parsers import add_prefix_to_key, cast_value, insert_value, read_file
+
+if TYPE_CHECKING:
+    from dj_toml_settings.toml_parser import Parser
+
+logger = logging.getLogger(__name__)
+
+
+class Operator:
+    """A special operator for inline tables, e.g. `$env` in `{ "$env" = "SECRET_KEY" }`."""
+
+    __slots__ = ("cacheable", "cast", "handler", "key")
+
+    key: str
+    handler: Callable[..., Any]
+    cast: bool
+    cacheable: bool
+
+    def __init__(self, key: str, handler: Callable[..., Any], cast: bool = False, *, cacheable: bool = True):  # noqa: FBT001, FBT002
+        self.key = key
+        self.handler = handler
+        self.cast = cast
+        self.cacheable = cacheable
+
+    def __repr__(self) -> str:
+        return f"Operator({self.key!r}, {self.handler!r}, cast={self.cast!r}, cacheable={self.cacheable!r})"
+
+
+class OperatorRegistry:
+    """Maps special operator keys to their handlers.
+
+    Only one operator that resolves a value is applied per inline table (the first registered one wins). Afterwards,
+    all "cast" operators (e.g. `$type`) in the table are applied to the resolved value.
+    """
+
+    operators: dict[str, Operator]
+    keys: frozenset[str]
+    value_operators: tuple[Operator, ...]
+    cast_operators: tuple[Operator, ...]
+
+    def __init__(self):
+        self.operators = {}
+        self.update()
+
+    def register(
+        self,
+        key: str,
+        handler: Callable[..., Any],
+        cast: bool = False,  # noqa: FBT001, FBT002
+        *,
+        cacheable: bool = True,
+    ) -> None:
+        key = add_prefix_to_key(key)
+        self.operators[key] = Operator(key, handler, cast=cast, cacheable=cacheable)
+        self.update()
+
+    def unregister(self, key: str) -> None:
+        self.operators.pop(add_prefix_to_key(key), None)
+        self.update()
+
+    def update(self) -> None:
+        self.keys = frozenset(self.operators)
+        self.value_operators = tuple(operator for operator in self.operators.values() if not operator.cast)
+        self.cast_operators = tuple(operator for operator in self.operators.values() if operator.cast)
+
+    def get_operators(self, value: dict) -> list[Operator]:
+        """Gets the operators to apply to the inline table `value`, in the order they get applied."""
+
+        operator_keys = value.keys() & self.keys
+
+        if not operator_keys:
+            return []
+
+        operators = []
+
+        for operator in self.value_operators:
+            if operator.key in operator_keys:
+                operators.append(operator)
+                break
+
+        for operator in self.cast_operators:
+            if operator.key in operator_keys:
+                operators.append(operator)
+
+        return operators
+
+    def resolve(self, parser: "Parser", key: str, value: dict) -> Any:
+        """Resolves the special operators in the inline table `value` for the setting `key`."""
+
+        return self.apply(self.get_operators(value), parser, key, value)
+
+    def apply(
+        self,
+        operators: Iterable[Operator],
+        parser: "Parser",
+        key: str,
+        value: dict,
+        on_operator: Callable[[Operator, float], None] | None = None,
+    ) -> Any:
+        """Applies the `operators` from `get_operators` to the inline table `value` for the setting `key`.
+
+        `on_operator` gets called with each operator and how long it took to apply it.
+        """
+
+        resolved_value: Any = value
+
+        for operator in operators:
+            if on_operator:
+                start = perf_counter()
+                resolved_value = self.apply_operator(operator, parser, key, value, resolved_value)
+                on_operator(operator, perf_counter() - start)
+            else:
+                resolved_value = self.apply_operator(operator, parser, key, value, resolved_value)
+
+        return resolved_value
+
+    def apply_operator(self, operator: Operator, parser: "Parser", key: str, value: dict, resolved_value: Any) -> Any:
+        if operator.cast:
+            return operator.handler(parser, key, value, resolved_value)
+
+        return operator.handler(parser, key, value)
+
+
+def parse_env(parser: "Parser", key: str, value: dict) -> Any:  # noqa: ARG001
+    return parser.environment.get(value["$env"], value.get("$default"))
+
+
+def parse_path(parser: "Parser", key: str, value: dict) -> Any:  # noqa: ARG001
+    return parser.resolve_path(value["$path"])
+
+
+def parse_file(parser: "Parser", key: str, value: dict) -> Any:  # noqa: ARG001
+    file_path = parser.resolve_path(value["$file"])
+    content = read_file(file_path, environment=parser.environment)
+
+    if content is None:
+        if "$default" not in value:
+            logger.warning(f"Cannot find file at: {file_path}")
+
+        return value.get("$default")
+
+    return content
+
+
+def parse_value(parser: "Parser", key: str, value: dict) -> Any:  # noqa: ARG001
+    return value["$value"]
+
+
+def parse_insert(parser: "Parser", key: str, value: dict) -> Any:
+    # `$insert` reads the current value of the setting
+    parser.references.add(key)
+
+    return insert_value(parser.data, key, value["$insert"], value.get("$index"))
+
+
+def parse_none(parser: "Parser", key: str, value: dict) -> Any:  # noqa: ARG001
+    return None
+
+
+def parse_type(parser: "Parser", key: str, value: dict, resolved_value: Any) -> Any:  # noqa: ARG001
+    if value["$type"] == "path" and isinstance(resolved_value, str | PurePath):
+        return parser.cast_path(resolved_value)
+
+    return cast_value(value["$type"], resolved_value)
+
+
+registry = OperatorRegistry()
+registry.register("env", parse_env)
+registry.register("path", parse_path)
+registry.register("file", parse_file)
+registry.register("value", parse_value)
+registry.register("insert", parse_insert)
+registry.register("none", parse_none)
+registry.register("type", parse_type, cast=True)
+
+
+def register_operator(
+    key: str,
+    handler: Callable[..., Any] | None = None,
+    cast: bool = False,  # noqa: FBT001, FBT002
+    *,
+    cacheable: bool = False,
+):
+    """Registers a custom special operator. Can also be used as a decorator.
+
+    Handlers get called with the `Parser`, the setting key, and the inline table, e.g.
+    `handler(parser, key, value)`. Handlers for "cast" operators also get the value that was resolved by the other
+    operators in the inline table, e.g. `handler(parser, key, value, resolved_value)`.
+
+    Args:
+        key: The key for the operator, e.g. "secret" for `{ "$secret" = "name" }`.
+        handler: The function that returns the value for the inline table.
+        cast: Whether the operator modifies the value resolved by the other operators, like `$type`.
+        cacheable: Whether the value only depends on the inline table, so the resolved settings can be stored with
+            `cache_dir` or `memoize`. Settings are not cached when they use an operator that is not cacheable,
+            because its handler could return a different value every time (e.g. from a secrets manager).
+    """
+
+    if handler is None:
+
+        def decorator(handler: Callable[..., Any]) -> Callable[..., Any]:
+            registry.register(key, handler, cast=cast, cacheable=cacheable)
+
+            return handler
+
+        return decorator
+
+    registry.register(key, handler, cast=cast, cacheable=cacheable)
+
+    return handler
+
+
+def unregister_operator(key: str) -> None:
+    """Unregisters a special operator."""
+
+    registry.unregister(key)
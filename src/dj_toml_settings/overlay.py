@@ -0,0 +1,95 @@
+from collections.abc import Iterator, Mapping, MutableMapping
+from typing import Any
+
+MISSING = object()
+
+
+class Layers:
+    """Settings from a base mapping with a layer of changes on top for each source (e.g. a TOML file).
+
+    Later layers take precedence over earlier layers, and all layers take precedence over the base. The base never
+    gets modified, so it does not need to be copied, and only the changed settings get materialized with `changes`.
+    """
+
+    base: Mapping
+    layers: list[dict]
+
+    def __init__(self, base: Mapping):
+        self.base = base
+        self.layers = []
+
+    def add(self) -> "Overlay":
+        """Add a new layer on top and get a view of all the settings that writes to the new layer."""
+
+        layer: dict = {}
+        self.layers.append(layer)
+
+        return Overlay(self, layer)
+
+    def get(self, key: Any, default: Any = MISSING) -> Any:
+        for layer in reversed(self.layers):
+            value = layer.get(key, MISSING)
+
+            if value is not MISSING:
+                return value
+
+        return self.base.get(key, default)
+
+    def changes(self) -> dict:
+        """Get the settings from all layers, with later layers overriding earlier layers."""
+
+        changes: dict = {}
+
+        for layer in self.layers:
+            changes.update(layer)
+
+        return changes
+
+
+class Overlay(MutableMapping):
+    """A view of all the settings in `Layers` where changes get written to one layer."""
+
+    __slots__ = ("layer", "layers")
+
+    layers: Layers
+    layer: dict
+
+    def __init__(self, layers: Layers, layer: dict):
+        self.layers = layers
+        self.layer = layer
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self.layers.get(key)
+
+        if value is MISSING:
+            raise KeyError(key)
+
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self.layers.get(key)
+
+        return default if value is MISSING else value
+
+    def __contains__(self, key: object) -> bool:
+        return self.layers.get(key) is not MISSING
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.layer[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self.layer[key]
+
+    def __iter__(self) -> Iterator:
+        keys = dict.fromkeys(self.layers.base)
+
+        for layer in self.layers.layers:
+            keys.update(dict.fromkeys(layer))
+
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Overlay({dict(self)!r})"
@@ -0,0 +1,246 @@
+from collections.abc import Callable, Iterable
+from copy import deepcopy
+from datetime import datetime
+from itertools import chain
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from dj_toml_settings.operators import Operator, registry
+from dj_toml_settings.value_parsers.str_parsers import compile_template
+
+if TYPE_CHECKING:
+    from dj_toml_settings.toml_parser import Parser
+
+# Operators that read the current value of the setting they are assigned to
+SELF_REFERENCE_OPERATORS = frozenset(["$insert"])
+
+
+class Node:
+    """A compiled TOML value that can be evaluated many times."""
+
+    __slots__ = ()
+
+    def evaluate(self, parser: "Parser", key: str) -> Any:
+        raise NotImplementedError("evaluate() not implemented")
+
+    def get_variables(self, key: str) -> frozenset[str]:  # noqa: ARG002
+        """Gets the names of the variables that the node refers to when it gets assigned to the setting `key`."""
+
+        return frozenset()
+
+    def is_cacheable(self) -> bool:
+        """Whether every operator in the node is `cacheable`."""
+
+        return True
+
+
+class LiteralNode(Node):
+    """A value that does not need to be resolved."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def evaluate(self, parser: "Parser", key: str) -> Any:  # noqa: ARG002
+        return self.value
+
+
+class CopyNode(Node):
+    """A mutable value that does not need to be resolved, but gets copied so evaluations do not share it."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def evaluate(self, parser: "Parser", key: str) -> Any:  # noqa: ARG002
+        return deepcopy(self.value)
+
+
+class VariableNode(Node):
+    """A string with variables, e.g. `"${BASE_DIR}/static"` or `"${env:HOST:-localhost}"`."""
+
+    __slots__ = ("template", "value")
+
+    def __init__(self, value: str):
+        self.value = value
+        self.template = compile_template(value)
+
+    def get_variables(self, key: str) -> frozenset[str]:  # noqa: ARG002
+        return self.template.variables
+
+    def evaluate(self, parser: "Parser", key: str) -> Any:  # noqa: ARG002
+        return self.template.render(parser.data, parser.environment, parser.references)
+
+
+class ListNode(Node):
+    """An array where every item gets resolved."""
+
+    __slots__ = ("items",)
+
+    def __init__(self, items: tuple[Node, ...]):
+        self.items = items
+
+    def evaluate(self, parser: "Parser", key: str) -> Any:
+        return [item.evaluate(parser, key) for item in self.items]
+
+    def get_variables(self, key: str) -> frozenset[str]:
+        return frozenset().union(*(item.get_variables(key) for item in self.items))
+
+    def is_cacheable(self) -> bool:
+        return all(item.is_cacheable() for item in self.items)
+
+
+class TableNode(Node):
+    """A table where nested tables get resolved, and then the special operators are applied."""
+
+    __slots__ = ("items", "operators")
+
+    def __init__(self, items: tuple[tuple[str, Node], ...], operators: tuple[Operator, ...]):
+        self.items = items
+        self.operators = operators
+
+    def evaluate(self, parser: "Parser", key: str) -> Any:
+        value = {k: node.evaluate(parser, key) for k, node in self.items}
+
+        if self.operators:
+            if parser.hooks:
+                return registry.apply(
+                    self.operators,
+                    parser,
+                    key,
+                    value,
+                    on_operator=lambda operator, duration: parser.emit("operator_applied", key, operator.key, duration),
+                )
+
+            return registry.apply(self.operators, parser, key, value)
+
+        return value
+
+    def get_variables(self, key: str) -> frozenset[str]:
+        variables = frozenset().union(*(node.get_variables(key) for _, node in self.items))
+
+        if any(operator.key in SELF_REFERENCE_OPERATORS for operator in self.operators):
+            variables |= {key}
+
+        return variables
+
+    def is_cacheable(self) -> bool:
+        return all(operator.cacheable for operator in self.operators) and all(
+            node.is_cacheable() for _, node in self.items
+        )
+
+
+class Assignment:
+    """Sets the setting `key` to the evaluated `node`."""
+
+    __slots__ = ("cacheable", "key", "node", "section", "value", "variables")
+
+    def __init__(self, section: str, key: str, value: Any):
+        self.section = section
+        self.key = key
+        self.value = value
+        self.node = compile_value(value)
+        self.variables = self.node.get_variables(key)
+        self.cacheable = self.node.is_cacheable()
+
+
+class Plan:
+    """The compiled `[tool.django]`, `[tool.django.apps.*]` and `[tool.django.envs.*]` sections of a TOML file.
+
+    A plan gets compiled once and can be evaluated many times with `Parser.evaluate`, e.g. for different
+    environments.
+    """
+
+    __slots__ = ("apps", "django", "envs")
+
+    django: list[Assignment]
+    apps: list[Assignment]
+    envs: dict[str, list[Assignment]]
+
+    def __init__(self, django: list[Assignment], apps: list[Assignment], envs: dict[str, list[Assignment]]):
+        self.django = django
+        self.apps = apps
+        self.envs = envs
+
+    def get_assignments(self, environment_name: str | None) -> list[Assignment]:
+        """Gets the assignments in order of precedence for the environment named `environment_name`."""
+
+        assignments = [*self.django, *self.apps]
+
+        if environment_name:
+            assignments.extend(self.envs.get(environment_name, []))
+
+        return assignments
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether the settings can be cached, i.e. every operator in the plan is `cacheable`."""
+
+        return all(assignment.cacheable for assignment in chain(self.django, self.apps, *self.envs.values()))
+
+
+def compile_plan(toml_data: dict, on_section: Callable[[str, float], None] | None = None) -> Plan:
+    """Compile the decoded `[tool.django]` data of a TOML file.
+
+    Args:
+        toml_data: The decoded `[tool.django]` data.
+        on_section: Gets called with the name of each section and how long it took to compile it.
+    """
+
+    def compile_section(section: str, items: Iterable[tuple[str, Any]]) -> list[Assignment]:
+        if on_section is None:
+            return [Assignment(section, key, value) for key, value in items]
+
+        start = perf_counter()
+        assignments = [Assignment(section, key, value) for key, value in items]
+        on_section(section, perf_counter() - start)
+
+        return assignments
+
+    django = compile_section(
+        "tool.django", ((key, value) for key, value in toml_data.items() if key not in ("apps", "envs"))
+    )
+
+    apps = [
+        assignment
+        for apps_name, apps_value in toml_data.get("apps", {}).items()
+        for assignment in compile_section(f"tool.django.apps.{apps_name}", apps_value.items())
+    ]
+
+    envs = {
+        envs_name: compile_section(f"tool.django.envs.{envs_name}", envs_value.items())
+        for envs_name, envs_value in toml_data.get("envs", {}).items()
+    }
+
+    return Plan(django=django, apps=apps, envs=envs)
+
+
+def compile_value(value: Any) -> Node:
+    """Compile a decoded TOML value into a `Node`.
+
+    Special cases:
+    - `dict` keys: nested tables get compiled and the special operators are looked up once
+    - variables in `str`
+    - `datetime`
+    """
+
+    if isinstance(value, list):
+        return ListNode(tuple(compile_value(item) for item in value))
+    elif isinstance(value, dict):
+        items = tuple(
+            (k, compile_value(v) if isinstance(v, dict) else CopyNode(v) if isinstance(v, list) else LiteralNode(v))
+            for k, v in value.items()
+        )
+
+        return TableNode(items, tuple(registry.get_operators(value)))
+    elif isinstance(value, str):
+        if "${" in value:
+            return VariableNode(value)
+    elif isinstance(value, datetime):
+        from dateutil import parser as dateparser  # noqa: PLC0415
+
+        value = dateparser.isoparse(str(value))
+
+    return LiteralNode(value)
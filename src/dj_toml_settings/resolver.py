@@ -0,0 +1,267 @@
+import logging
+from collections.abc import Collection, Iterable, MutableMapping
+from copy import copy
+from functools import partial
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from dj_toml_settings.exceptions import VariableCycleError
+from dj_toml_settings.lazy import UNRESOLVED, LazyValue
+
+if TYPE_CHECKING:
+    from dj_toml_settings.plan import Assignment
+    from dj_toml_settings.toml_parser import Parser
+
+logger = logging.getLogger(__name__)
+
+
+class Definition:
+    """An assignment of a setting in a section of a TOML file."""
+
+    __slots__ = ("assignment", "dependencies", "parser", "previous")
+
+    def __init__(self, parser: "Parser", assignment: "Assignment", previous: "Definition | None"):
+        self.parser = parser
+        self.assignment = assignment
+        self.previous = previous
+        self.dependencies: list[Definition] = []
+
+    @property
+    def key(self) -> str:
+        return self.assignment.key
+
+    def __repr__(self) -> str:
+        return f"{self.assignment.section}.{self.key}"
+
+
+class Resolver:
+    """Resolves the settings from the sections of one or more TOML files in the order of their dependencies.
+
+    The definitions are added in order of precedence (later definitions override earlier ones). Variables refer to
+    the last definition of a setting, wherever it is defined, so forward references work. A definition that refers to
+    its own setting (e.g. with `$insert` or `"${PATH}/more"`) gets the previous definition of the setting instead.
+
+    Every setting is resolved exactly once; definitions that get overridden and are not needed by another definition
+    are not resolved at all.
+    """
+
+    data: MutableMapping
+    definitions: list[Definition]
+    last_definitions: dict[str, Definition]
+    undefined: dict[str, list[str]]
+
+    def __init__(self, data: MutableMapping):
+        self.data = data
+        self.definitions = []
+        self.last_definitions = {}
+        self.undefined = {}
+
+    def add(self, parser: "Parser", assignments: list["Assignment"]) -> None:
+        """Add the `assignments` of a TOML file; `parser.data` must be `data` or an `Overlay` on top of it."""
+
+        for assignment in assignments:
+            previous = self.last_definitions.get(assignment.key)
+            definition = Definition(parser, assignment, previous)
+
+            self.definitions.append(definition)
+            self.last_definitions[assignment.key] = definition
+
+    def link(self) -> None:
+        """Find the dependencies of every definition and the variables that are not defined anywhere."""
+
+        self.undefined = {}
+
+        for definition in self.definitions:
+            definition.dependencies = []
+
+            for variable in sorted(definition.assignment.variables):
+                if variable == definition.key:
+                    dependency = definition.previous
+                else:
+                    dependency = self.last_definitions.get(variable)
+
+                if dependency:
+                    definition.dependencies.append(dependency)
+                elif variable not in self.data:
+                    self.undefined.setdefault(variable, []).append(definition.key)
+
+    def sort(self) -> list[Definition]:
+        """Sort the definitions that need to be resolved so that dependencies come first.
+
+        Raises:
+            VariableCycleError: If variables refer to each other.
+        """
+
+        order: list[Definition] = []
+        done: set[Definition] = set()
+
+        for root in self.last_definitions.values():
+            if root in done:
+                continue
+
+            path = [root]
+            visiting = {root}
+            stack = [iter(root.dependencies)]
+
+            while stack:
+                for dependency in stack[-1]:
+                    if dependency in done:
+                        continue
+
+                    if dependency in visiting:
+                        cycle = [*path[path.index(dependency) :], dependency]
+
+                        raise VariableCycleError(f"Variable cycle: {' -> '.join(repr(d) for d in cycle)}")
+
+                    path.append(dependency)
+                    visiting.add(dependency)
+                    stack.append(iter(dependency.dependencies))
+
+                    break
+                else:
+                    stack.pop()
+                    definition = path.pop()
+                    visiting.discard(definition)
+
+                    done.add(definition)
+                    order.append(definition)
+
+        return order
+
+    def get_dependents(self, keys: Iterable[str]) -> set[str]:
+        """Get `keys` and all the settings that refer to them, directly or through other settings."""
+
+        self.link()
+
+        dependents: dict[str, set[str]] = {}
+
+        for definition in self.definitions:
+            for dependency in definition.dependencies:
+                if dependency.key != definition.key:
+                    dependents.setdefault(dependency.key, set()).add(definition.key)
+
+        affected = set(keys)
+        stack = list(affected)
+
+        while stack:
+            for dependent in dependents.get(stack.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    stack.append(dependent)
+
+        return affected
+
+    def resolve(
+        self,
+        lazy: Collection[str] = (),
+        keys: Collection[str] | None = None,
+        *,
+        warn_undefined: bool = True,
+    ) -> MutableMapping:
+        """Resolve all settings and return the updated `data`.
+
+        Args:
+            lazy: Settings (e.g. `"STATIC_ROOT"`) or special operators (e.g. `"$type"`) to resolve the first time
+                they get accessed instead; they are set to a `LazyValue` in `data`
+            keys: Only resolve these settings; the other settings that they refer to must already be in `data`
+            warn_undefined: Whether to log a warning for every variable that is not defined (see `warn_undefined`)
+        """
+
+        self.link()
+
+        if warn_undefined:
+            self.warn_undefined(keys)
+
+        order = self.sort()
+
+        if keys is not None:
+            order = [definition for definition in order if definition.key in keys]
+
+        deferred = self.get_deferred(order, lazy) if lazy else set()
+
+        for definition in order:
+            if definition in deferred:
+                # Keep the current value for settings that refer to themselves, e.g. with `$insert`
+                data = definition.parser.data
+                previous_value = data.get(definition.key, UNRESOLVED)
+                data[definition.key] = LazyValue(partial(self.evaluate_lazy, definition, previous_value))
+            else:
+                self.evaluate(definition)
+
+        return self.data
+
+    def warn_undefined(self, keys: Collection[str] | None = None, ignore: Collection[str] = ()) -> set[str]:
+        """Log a warning for every variable that is not defined and that one of `keys` (or any setting) refers to,
+        except the variables in `ignore`. Returns the variables that were logged; `link` must be called first.
+        """
+
+        variables = set()
+
+        for variable, used_by in self.undefined.items():
+            if variable not in ignore and (keys is None or any(key in keys for key in used_by)):
+                logger.warning(f"Missing variable substitution ${{{variable}}}")
+                logger.debug(f"Variable '{variable}' is used by: {', '.join(used_by)}")
+                variables.add(variable)
+
+        return variables
+
+    def evaluate(self, definition: Definition) -> None:
+        assignment = definition.assignment
+        logger.debug(f"{assignment.section}: Update '{assignment.key}' with '{assignment.value}'")
+
+        definition.parser.data[assignment.key] = self.evaluate_node(definition, definition.parser)
+
+    def evaluate_node(self, definition: Definition, parser: "Parser") -> Any:
+        assignment = definition.assignment
+
+        if not parser.hooks:
+            return assignment.node.evaluate(parser, assignment.key)
+
+        start = perf_counter()
+        value = assignment.node.evaluate(parser, assignment.key)
+        parser.emit("key_resolved", assignment.section, assignment.key, perf_counter() - start)
+
+        return value
+
+    def get_deferred(self, order: list[Definition], lazy: Collection[str]) -> set[Definition]:
+        """Get the definitions in `order` that match `lazy` and that no eagerly resolved definition depends on."""
+
+        deferred = {
+            definition
+            for definition in self.last_definitions.values()
+            if definition.key in lazy
+            or any(operator.key in lazy for operator in getattr(definition.assignment.node, "operators", ()))
+        }
+
+        changed = True
+
+        while changed:
+            changed = False
+
+            for definition in order:
+                if definition not in deferred and any(dependency in deferred for dependency in definition.dependencies):
+                    deferred -= set(definition.dependencies)
+                    changed = True
+
+        return deferred
+
+    def evaluate_lazy(self, definition: Definition, previous_value: Any) -> Any:
+        assignment = definition.assignment
+        logger.debug(f"{assignment.section}: Lazily update '{assignment.key}' with '{assignment.value}'")
+
+        data = dict(definition.parser.data)
+
+        for dependency in definition.dependencies:
+            if dependency.key != definition.key and isinstance(data.get(dependency.key), LazyValue):
+                data[dependency.key] = data[dependency.key].resolve()
+
+        if previous_value is UNRESOLVED:
+            data.pop(definition.key, None)
+        else:
+            data[definition.key] = previous_value
+
+        parser = copy(definition.parser)
+        parser.data = data
+        parser.references = set()
+
+        return self.evaluate_node(definition, parser)
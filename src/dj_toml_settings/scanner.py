@@ -0,0 +1,146 @@
+import re
+
+DJANGO_KEY = ("tool", "django")
+
+# Strings and comments get skipped so that brackets in them are ignored; brackets are tracked to find table headers
+TOKEN_PATTERN = re.compile(
+    rb"""
+    (?P<multiline>\"\"\"|''')
+    | \"(?:[^\"\\\n]|\\.)*\"
+    | '[^'\n]*'
+    | \#[^\n]*
+    | (?P<open>[\[{])
+    | (?P<close>[\]}])
+    | (?P<newline>\n)
+    """,
+    re.VERBOSE,
+)
+
+BARE_KEY_PATTERN = re.compile(rb"[A-Za-z0-9_-]+")
+
+
+class AmbiguousLayoutError(Exception):
+    """The `[tool.django]` section cannot be found without decoding the whole TOML file."""
+
+
+def find_django_ranges(content: bytes) -> list[tuple[int, int]] | None:
+    """Find the byte ranges of the `[tool.django]` table and its sub-tables in the TOML `content`.
+
+    Each range starts with the table header, so the ranges can be joined together and decoded on their own. Returns
+    `None` when the layout of the file is ambiguous (e.g. `tool.django` is defined with dotted keys or an inline
+    table), so the whole file needs to be decoded.
+    """
+
+    if b"django" not in content:
+        return []
+
+    try:
+        headers = find_headers(content)
+    except AmbiguousLayoutError:
+        return None
+
+    ranges = []
+    sections = [(0, (), False), *headers]
+
+    for index, (start, key, is_array) in enumerate(sections):
+        end = sections[index + 1][0] if index + 1 < len(sections) else len(content)
+
+        if key[:2] == DJANGO_KEY:
+            if is_array:
+                return None
+
+            ranges.append((start, end))
+        elif DJANGO_KEY[: len(key)] == key and b"django" in content[start:end]:
+            # `tool.django` could be defined with dotted keys, e.g. `django.DEBUG = true` in `[tool]`
+            return None
+
+    return ranges
+
+
+def find_headers(content: bytes) -> list[tuple[int, tuple[str, ...], bool]]:
+    """Find the start, key and whether it is an array of tables for every table header in `content`."""
+
+    headers = []
+    depth = 0
+    line_start = 0
+    header_start: int | None = None
+    position = 0
+
+    while match := TOKEN_PATTERN.search(content, position):
+        position = match.end()
+
+        if match.group("newline"):
+            if header_start is not None:
+                raise AmbiguousLayoutError("Unterminated table header")
+
+            line_start = position
+        elif delimiter := match.group("multiline"):
+            position = find_multiline_end(content, position, delimiter)
+        elif match.group("open"):
+            if depth == 0 and not content[line_start : match.start()].strip():
+                header_start = match.start()
+
+            depth += 1
+        elif match.group("close"):
+            depth -= 1
+
+            if depth < 0:
+                raise AmbiguousLayoutError("Unbalanced brackets")
+
+            if depth == 0 and header_start is not None:
+                headers.append((header_start, *parse_header(content[header_start:position])))
+                header_start = None
+
+    if depth or header_start is not None:
+        raise AmbiguousLayoutError("Unbalanced brackets")
+
+    return headers
+
+
+def find_multiline_end(content: bytes, position: int, delimiter: bytes) -> int:
+    """Find the end of the multi-line string that starts before `position`."""
+
+    while True:
+        end = content.find(delimiter, position)
+
+        if end == -1:
+            raise AmbiguousLayoutError("Unterminated multi-line string")
+
+        # Only basic strings have escapes; an odd number of backslashes escapes the first quote
+        backslashes = len(content[position:end]) - len(content[position:end].rstrip(b"\\"))
+
+        if delimiter == b'"""' and backslashes % 2:
+            position = end + 1
+            continue
+
+        end += len(delimiter)
+
+        # Up to two quotes are allowed right before the closing delimiter, e.g. `""""quoted""""`
+        for _ in range(2):
+            if content[end : end + 1] != delimiter[:1]:
+                break
+
+            end += 1
+
+        return end
+
+
+def parse_header(header: bytes) -> tuple[tuple[str, ...], bool]:
+    """Get the key of a table header like `[tool.django.apps.blog]` and whether it is an array of tables."""
+
+    is_array = header.startswith(b"[[")
+    inner = header[2:-2] if is_array else header[1:-1]
+
+    if is_array and not header.endswith(b"]]"):
+        raise AmbiguousLayoutError(f"Invalid table header: {header!r}")
+
+    parts = [part.strip() for part in inner.split(b".")]
+
+    if not all(BARE_KEY_PATTERN.fullmatch(part) for part in parts):
+        if b"django" in inner:
+            raise AmbiguousLayoutError(f"Cannot parse table header: {header!r}")
+
+        # Quoted keys are fine as long as the table cannot be `tool.django`
+        return (("",), is_array)
+
+    return (tuple(part.decode() for part in parts), is_array)
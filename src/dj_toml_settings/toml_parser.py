@@ -1,38 +1,70 @@
 import logging
 import os
 import sys
-from datetime import datetime
-from pathlib import Path
-from typing import Any
-
-from dateutil import parser as dateparser
-from typeguard import typechecked
+from collections.abc import MutableMapping
+from pathlib import Path, PurePath
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
 
 if sys.version_info >= (3, 11):
     import tomllib
 else:
     import tomli as tomllib
 
-from dj_toml_settings.value_parsers.dict_parsers import (
-    EnvParser,
-    InsertParser,
-    NoneParser,
-    PathParser,
-    TypeParser,
-    ValueParser,
-)
-from dj_toml_settings.value_parsers.str_parsers import VariableParser
+from dj_toml_settings.environment import Environment, get_signature
+from dj_toml_settings.resolver import Resolver
+from dj_toml_settings.scanner import find_django_ranges
+from dj_toml_settings.typechecking import typechecked
+
+if TYPE_CHECKING:
+    from dj_toml_settings.cache import SettingsCache, SettingsMemo
+    from dj_toml_settings.hooks import Hooks
+    from dj_toml_settings.plan import Assignment, Plan
 
 logger = logging.getLogger(__name__)
 
 
 class Parser:
     path: Path
-    data: dict
-
-    def __init__(self, path: Path, data: dict | None = None):
+    data: MutableMapping
+    environment: Environment
+    references: set[str]
+    settings_keys: set[str]
+    cache: "SettingsCache | None"
+    memo: "SettingsMemo | None"
+    hooks: list["Hooks"]
+    lexical_paths: bool
+    directory: Path | None
+    resolved_paths: dict[tuple[str, str], Path]
+
+    def __init__(
+        self,
+        path: Path,
+        data: MutableMapping | None = None,
+        environment: Environment | None = None,
+        cache: "SettingsCache | None" = None,
+        hooks: list["Hooks"] | None = None,
+        *,
+        memo: "SettingsMemo | None" = None,
+        lexical_paths: bool = False,
+    ):
         self.path = path
-        self.data = data or {}
+        self.data = data if data is not None else {}
+        self.environment = environment or Environment()
+        self.cache = cache
+        self.memo = memo
+        self.hooks = list(hooks or [])
+        self.lexical_paths = lexical_paths
+
+        # Paths resolved by `resolve_path` and `cast_path`, so each one only hits the file system once per parser
+        self.resolved_paths = {}
+        self.directory = None
+
+        # Variables (and `$insert` targets) read from `data` while parsing
+        self.references = set()
+
+        # Settings that were set by the TOML file
+        self.settings_keys = set()
 
     @typechecked
     def parse_file(self):
@@ -44,49 +76,171 @@ class Parser:
         3. `[tool.django.envs.{ENVIRONMENT}]` where {ENVIRONMENT} is defined in the `ENVIRONMENT` env variable
         """
 
-        toml_data = self.get_data()
+        return self.evaluate(self.compile())
+
+    async def aparse_file(self):
+        """Parse the TOML file like `parse_file`, but read, decode and resolve it in a thread so the event loop does
+        not get blocked.
+        """
+
+        # Only import `asyncio` when it is used to reduce import time
+        import asyncio  # noqa: PLC0415
+
+        return await asyncio.to_thread(self.parse_file)
+
+    def compile(self, *, strict: bool = False) -> "Plan":
+        """Compile the data from the specified TOML file into a `Plan` that can be evaluated many times.
+
+        Args:
+            strict: Whether to raise when the TOML file cannot be found or decoded (see `get_data`)
+        """
+
+        from dj_toml_settings.plan import compile_plan  # noqa: PLC0415
+
+        if not self.hooks:
+            return compile_plan(self.get_data(strict=strict))
+
+        start = perf_counter()
+        data = self.get_data(strict=strict)
+        self.emit("file_decoded", perf_counter() - start)
+
+        return compile_plan(data, on_section=lambda section, duration: self.emit("section_entered", section, duration))
+
+    def resolve_path(self, file_name: str) -> Path:
+        """Resolve `file_name` relative to the directory of the TOML file (or relative to `path` when it is a
+        directory).
+
+        With `lexical_paths`, `..` and `.` are normalized without following symbolic links, so the file system does
+        not get accessed at all.
+        """
+
+        key = ("file", file_name)
+
+        if (path := self.resolved_paths.get(key)) is None:
+            if self.directory is None:
+                if self.lexical_paths:
+                    self.directory = self.path.absolute().parent
+                else:
+                    self.directory = self.path.parent if self.path.is_file() else self.path
+
+            path = self.resolve(self.directory / file_name)
+            self.resolved_paths[key] = path
+
+        return path
+
+    def cast_path(self, value: str | PurePath) -> Path:
+        """Cast `value` to an absolute `Path` relative to the current directory, like `$type = "path"`."""
+
+        key = ("cast", str(value))
 
-        # Get potential settings from `tool.django.apps` and `tool.django.envs`
-        apps_data = toml_data.pop("apps", {})
-        envs_data = toml_data.pop("envs", {})
+        if (path := self.resolved_paths.get(key)) is None:
+            path = self.resolve(Path(value))
+            self.resolved_paths[key] = path
 
-        # Add default settings from `tool.django`
-        for key, value in toml_data.items():
-            logger.debug(f"tool.django: Update '{key}' with '{value}'")
+        return path
 
-            self.data.update({key: self.parse_value(key, value)})
+    def resolve(self, path: Path) -> Path:
+        if self.lexical_paths:
+            return Path(os.path.normpath(path.absolute()))
 
-        # Add settings from `tool.django.apps.*`
-        for apps_name, apps_value in apps_data.items():
-            for app_key, app_value in apps_value.items():
-                logger.debug(f"tool.django.apps.{apps_name}: Update '{app_key}' with '{app_value}'")
+        return path.resolve()
 
-                self.data.update({app_key: self.parse_value(app_key, app_value)})
+    def emit(self, event: str, *args: Any) -> None:
+        """Call `event` (e.g. `key_resolved`) on every hook with the parser and `args`."""
 
-        # Add settings from `tool.django.envs.*` if it matches the `ENVIRONMENT` env variable
-        if environment_env_variable := os.getenv("ENVIRONMENT"):
-            for envs_name, envs_value in envs_data.items():
-                if environment_env_variable == envs_name:
-                    for env_key, env_value in envs_value.items():
-                        logger.debug(f"tool.django.envs.{envs_name}: Update '{env_key}' with '{env_value}'")
+        for hook in self.hooks:
+            getattr(hook, event)(self, *args)
 
-                        self.data.update({env_key: self.parse_value(env_key, env_value)})
+    def evaluate(self, plan: "Plan") -> MutableMapping:
+        """Evaluate a compiled `Plan` with the data and environment of the parser.
 
-        return self.data
+        The sections have the same precedence as `parse_file`, but settings get resolved in the order of their
+        dependencies (see `Resolver`).
+        """
+
+        resolver = Resolver(self.data)
+        resolver.add(self, self.get_assignments(plan))
+
+        return resolver.resolve()
+
+    def get_assignments(self, plan: "Plan") -> list["Assignment"]:
+        """Gets the assignments of a compiled `Plan` in order of precedence.
+
+        Settings from `tool.django.envs.*` are only included if it matches the `ENVIRONMENT` env variable.
+        """
+
+        assignments = plan.get_assignments(self.environment.get("ENVIRONMENT"))
+        self.settings_keys.update(assignment.key for assignment in assignments)
+
+        return assignments
 
     @typechecked
-    def get_data(self) -> dict:
-        """Gets the data from the passed-in TOML file."""
+    def get_data(self, *, strict: bool = False) -> dict:
+        """Gets the data from the passed-in TOML file.
+
+        A file that cannot be found or decoded has no data, unless `strict` is set: then the `FileNotFoundError` or
+        `TOMLDecodeError` is raised, so it can be told apart from a file without settings.
+        """
+
+        signature = None
 
-        data = {}
+        if self.memo:
+            signature = get_signature(self.path)
+
+            if signature and (memoized_data := self.memo.get_toml(self.path, signature)) is not None:
+                return memoized_data
 
         try:
             with open(self.path, "rb") as f:
-                data = tomllib.load(f)
+                content = f.read()
         except FileNotFoundError:
+            if strict:
+                raise
+
             logger.warning(f"Cannot find file at: {self.path}")
-        except tomllib.TOMLDecodeError:
-            logger.error(f"Cannot parse TOML at: {self.path}")
+
+            return {}
+
+        if self.cache and (cached_data := self.cache.get_toml(self.path, content)) is not None:
+            django_data = cached_data
+        else:
+            try:
+                django_data = self.decode(content)
+            except tomllib.TOMLDecodeError:
+                if strict:
+                    raise
+
+                logger.error(f"Cannot parse TOML at: {self.path}")
+
+                return {}
+
+            if self.cache:
+                self.cache.set_toml(self.path, content, django_data)
+
+        if self.memo and signature:
+            self.memo.set_toml(self.path, signature, django_data)
+
+        return django_data
+
+    def decode(self, content: bytes) -> dict:
+        """Decode the `[tool.django]` data from the TOML `content`.
+
+        Only the byte ranges of `[tool.django]` and its sub-tables get decoded, so invalid TOML in other sections is
+        not detected. The whole file gets decoded when the layout of the file is ambiguous (see `find_django_ranges`)
+        or when it does not have a `[tool.django]` section.
+        """
+
+        ranges = find_django_ranges(content)
+
+        if ranges:
+            try:
+                data = tomllib.loads(b"".join(content[start:end] for start, end in ranges).decode())
+            except (tomllib.TOMLDecodeError, UnicodeDecodeError):
+                logger.debug(f"Decode the whole TOML file at: {self.path}")
+            else:
+                return data.get("tool", {}).get("django", {}) or {}
+
+        data = tomllib.loads(content.decode())
 
         return data.get("tool", {}).get("django", {}) or {}
 
@@ -106,46 +260,11 @@ class Parser:
         - `datetime`
         """
 
-        if isinstance(value, list):
-            # Process each item in the list
-            processed_list = []
+        from dj_toml_settings.plan import compile_value  # noqa: PLC0415
 
-            for item in value:
-                processed_item = self.parse_value(key, item)
-                processed_list.append(processed_item)
+        node = compile_value(value)
 
-            value = processed_list
-        elif isinstance(value, dict):
-            # Process nested dictionaries
-            processed_dict = {}
+        for variable in sorted(variable for variable in node.get_variables(key) if variable not in self.data):
+            logger.warning(f"Missing variable substitution ${{{variable}}}")
 
-            for k, v in value.items():
-                if isinstance(v, dict):
-                    processed_dict.update({k: self.parse_value(key, v)})
-                else:
-                    processed_dict[k] = v
-
-            value = processed_dict
-
-            type_parser = TypeParser(data=self.data, value=value)
-            env_parser = EnvParser(data=self.data, value=value)
-            path_parser = PathParser(data=self.data, value=value, path=self.path)
-            value_parser = ValueParser(data=self.data, value=value)
-            none_parser = NoneParser(data=self.data, value=value)
-            insert_parser = InsertParser(data=self.data, value=value, data_key=key)
-
-            # Check for a match for all operators (except $type)
-            for parser in [env_parser, path_parser, value_parser, insert_parser, none_parser]:
-                if parser.match():
-                    value = parser.parse()
-                    break
-
-            # Parse $type last because it can operate on the resolved value from the other parsers
-            if type_parser.match():
-                value = type_parser.parse(value)
-        elif isinstance(value, str):
-            value = VariableParser(data=self.data, value=value).parse()
-        elif isinstance(value, datetime):
-            value = dateparser.isoparse(str(value))
-
-        return value
+        return node.evaluate(self, key)
@@ -0,0 +1,45 @@
+import os
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Whether to check argument and return types at runtime; needs to be set before `dj_toml_settings` is imported
+TYPECHECK = os.getenv("DJ_TOML_SETTINGS_TYPECHECK", "").lower() in ("1", "true", "yes", "on")
+
+
+def typechecked(func: F) -> F:
+    """Checks the argument and return types of `func` with `typeguard` when the `DJ_TOML_SETTINGS_TYPECHECK`
+    environment variable is set.
+
+    Otherwise, `func` is returned as-is so there is no overhead.
+    """
+
+    if not TYPECHECK:
+        return func
+
+    return check_types(func)
+
+
+def check_types(func: F) -> F:
+    """Checks the argument and return types of `func` with `typeguard`.
+
+    `typeguard` is only imported (and `func` instrumented) the first time that `func` is called to reduce the time
+    it takes to import `dj_toml_settings`.
+    """
+
+    checked_func = None
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal checked_func
+
+        if checked_func is None:
+            from typeguard import typechecked as typeguard_typechecked  # noqa: PLC0415
+
+            checked_func = typeguard_typechecked(func)
+
+        return checked_func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
@@ -1,26 +1,41 @@
 import logging
-import os
 import re
+import warnings
+from collections.abc import Mapping
 from datetime import timedelta
-from decimal import Decimal
 from pathlib import Path
 from typing import Any
-from urllib.parse import urlparse
-
-from dateutil import parser as dateparser
-from typeguard import typechecked
 
+from dj_toml_settings.environment import Environment, get_signature
 from dj_toml_settings.exceptions import InvalidActionError
 
 logger = logging.getLogger(__name__)
 
+# The largest file (in bytes) that `$file` reads, so a wrong path cannot load a huge file into the settings
+MAX_FILE_SIZE = 1024 * 1024
+
+# Contents of the files read with `$file`, keyed by path, with the `stat` signature they were read with
+file_contents: dict[Path, tuple[tuple, str]] = {}
+
 
 class DictParser:
+    """Deprecated: special operators are handled by the registry in `dj_toml_settings.operators`.
+
+    `DictParser` and `TypeParser` are only kept for backwards compatibility and will be removed in a future version;
+    use `register_operator` and `cast_value` instead.
+    """
+
     data: dict
     value: dict
     key: str
 
     def __init__(self, data: dict, value: dict):
+        warnings.warn(
+            "DictParser is deprecated; use register_operator and cast_value instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
         self.data = data
         self.value = value
 
@@ -32,145 +47,146 @@ class DictParser:
     def match(self) -> bool:
         return self.key in self.value
 
-    @typechecked
     def add_prefix_to_key(self, key: str) -> str:
-        """Gets the key for the special operator."""
-
-        return f"${key}"
+        return add_prefix_to_key(key)
 
     def parse(self, *args, **kwargs):
         raise NotImplementedError("parse() not implemented")
 
 
-class EnvParser(DictParser):
-    key: str = "env"
+class TypeParser(DictParser):
+    """Deprecated: use `cast_value` instead."""
+
+    key = "type"
+
+    def parse(self, resolved_value: Any) -> Any:
+        return cast_value(self.value[self.key], resolved_value)
 
-    def parse(self) -> Any:
-        default_special_key = self.add_prefix_to_key("default")
-        default_value = self.value.get(default_special_key)
 
-        env_value = self.value[self.key]
-        value = os.getenv(env_value, default_value)
+def add_prefix_to_key(key: str) -> str:
+    """Gets the key for the special operator, e.g. `$env` for `env` or `$env`."""
 
-        return value
+    return key if key.startswith("$") else f"${key}"
 
 
-class PathParser(DictParser):
-    key: str = "path"
+def read_file(path: Path, max_size: int = MAX_FILE_SIZE, environment: Environment | None = None) -> str | None:
+    """Read the text in the file at `path` without trailing newlines, or `None` if the file does not exist.
 
-    def __init__(self, data: dict, value: dict, path: Path):
-        super().__init__(data, value)
-        self.path = path
+    The contents are cached by the `stat` signature of the file (inode, size and modified time), so an unchanged file
+    does not get read again.
 
-    def parse(self) -> Any:
-        self.file_name = self.value[self.key]
-        value = self.resolve_file_name()
+    Args:
+        path: The file to read.
+        max_size: The largest file (in bytes) that can be read; a larger file raises a `ValueError`.
+        environment: Records the file and its signature, so cached settings know when the file changes.
+    """
 
-        return value
+    signature = get_signature(path)
 
-    @typechecked
-    def resolve_file_name(self) -> Path:
-        """Parse a path string relative to a base path.
+    if environment is not None:
+        environment.files[str(path)] = signature
 
-        Args:
-            file_name: Relative or absolute file name.
-            path: Base path to resolve file_name against.
-        """
+    if signature is None:
+        return None
 
-        current_path = Path(self.path).parent if self.path.is_file() else self.path
+    if (cached := file_contents.get(path)) and cached[0] == signature:
+        return cached[1]
 
-        return Path((current_path / self.file_name).resolve())
+    if signature[1] > max_size:
+        raise ValueError(f"File is larger than {max_size} bytes: {path}")
 
+    with open(path, encoding="utf-8") as f:
+        content = f.read(max_size + 1)
 
-class ValueParser(DictParser):
-    key = "value"
+    # The file can grow after the signature was read
+    if len(content) > max_size:
+        raise ValueError(f"File is larger than {max_size} bytes: {path}")
 
-    def parse(self) -> Any:
-        return self.value[self.key]
+    content = content.rstrip("\r\n")
+    file_contents[path] = (signature, content)
 
+    return content
 
-class InsertParser(DictParser):
-    key = "insert"
 
-    def __init__(self, data: dict, value: dict, data_key: str):
-        super().__init__(data, value)
-        self.data_key = data_key
+def insert_value(data: Mapping, data_key: str, value: Any, index: int | None = None) -> list:
+    """Insert `value` into a copy of the array in `data` for `data_key`.
 
-    def parse(self) -> Any:
-        insert_data = self.data.get(self.data_key, [])
+    Args:
+        data: The existing settings.
+        data_key: The setting with the array to insert into.
+        value: The value to insert.
+        index: Where to insert the value; defaults to the end of the array.
+    """
 
-        # Check the existing value is an array
-        if not isinstance(insert_data, list):
-            raise InvalidActionError(f"`insert` cannot be used for value of type: {type(self.data[self.data_key])}")
+    insert_data = data.get(data_key, [])
 
-        # Insert the data
-        index_key = self.add_prefix_to_key("index")
-        index = self.value.get(index_key, len(insert_data))
+    # Check the existing value is an array
+    if not isinstance(insert_data, list):
+        raise InvalidActionError(f"`insert` cannot be used for value of type: {type(data[data_key])}")
 
-        insert_data.insert(index, self.value[self.key])
+    # Copy the existing array so that the passed-in data is not modified
+    insert_data = list(insert_data)
 
-        return insert_data
+    # Insert the data
+    if index is None:
+        index = len(insert_data)
 
+    insert_data.insert(index, value)
 
-class NoneParser(DictParser):
-    key = "none"
+    return insert_data
 
-    def match(self) -> bool:
-        return super().match() and self.value.get(self.key) is not None
 
-    def parse(self) -> Any:
-        return None
+def cast_value(value_type: Any, resolved_value: Any) -> Any:
+    """Cast `resolved_value` to `value_type`."""
 
+    if not isinstance(value_type, str):
+        raise ValueError(f"Type must be a string, got {type(value_type).__name__}")
 
-class TypeParser(DictParser):
-    key = "type"
+    try:
+        if value_type == "bool":
+            if isinstance(resolved_value, str):
+                resolved_value = resolved_value.lower() == "true"
+            elif isinstance(resolved_value, int):
+                resolved_value = bool(resolved_value)
+            else:
+                raise ValueError(f"Type must be a string or int, got {type(resolved_value).__name__}")
 
-    def parse(self, resolved_value: Any) -> Any:
-        value_type = self.value[self.key]
+            return bool(resolved_value)
+        elif value_type == "int":
+            return int(resolved_value)
+        elif value_type == "str":
+            return str(resolved_value)
+        elif value_type == "float":
+            return float(resolved_value)
+        elif value_type == "decimal":
+            from decimal import Decimal  # noqa: PLC0415
 
-        if not isinstance(value_type, str):
-            raise ValueError(f"Type must be a string, got {type(value_type).__name__}")
+            return Decimal(str(resolved_value))
+        elif value_type in ("datetime", "date", "time"):
+            from dateutil import parser as dateparser  # noqa: PLC0415
 
-        try:
-            if value_type == "bool":
-                if isinstance(resolved_value, str):
-                    resolved_value = resolved_value.lower() == "true"
-                elif isinstance(resolved_value, int):
-                    resolved_value = bool(resolved_value)
-                else:
-                    raise ValueError(f"Type must be a string or int, got {type(resolved_value).__name__}")
-
-                return bool(resolved_value)
-            elif value_type == "int":
-                return int(resolved_value)
-            elif value_type == "str":
-                return str(resolved_value)
-            elif value_type == "float":
-                return float(resolved_value)
-            elif value_type == "decimal":
-                return Decimal(str(resolved_value))
-            elif value_type == "datetime":
-                return dateparser.parse(resolved_value)
-            elif value_type == "date":
-                result = dateparser.parse(resolved_value)
+            result = dateparser.parse(resolved_value)
 
+            if value_type == "date":
                 return result.date()
             elif value_type == "time":
-                result = dateparser.parse(resolved_value)
-
                 return result.time()
-            elif value_type == "timedelta":
-                return parse_timedelta(resolved_value)
-            elif value_type == "url":
-                return urlparse(str(resolved_value))
-            elif value_type == "path":
-                return Path(resolved_value).resolve()
-            else:
-                raise ValueError(f"Unsupported type: {value_type}")
-        except (ValueError, TypeError, AttributeError) as e:
-            logger.debug(f"Failed to convert {resolved_value!r} to {value_type}: {e}")
 
-            raise ValueError(f"Failed to convert {resolved_value!r} to {value_type}: {e}") from e
+            return result
+        elif value_type == "timedelta":
+            return parse_timedelta(resolved_value)
+        elif value_type == "url":
+            from urllib.parse import urlparse  # noqa: PLC0415
+
+            return urlparse(str(resolved_value))
+        elif value_type == "path":
+            return Path(resolved_value).resolve()
+        else:
+            raise ValueError(f"Unsupported type: {value_type}")
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.debug(f"Failed to convert {resolved_value!r} to {value_type}: {e}")
+
+        raise ValueError(f"Failed to convert {resolved_value!r} to {value_type}: {e}") from e
 
 
 def parse_timedelta(value):
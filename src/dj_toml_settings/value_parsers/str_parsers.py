@@ -1,75 +1,137 @@
 import logging
 import re
-from datetime import datetime
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-from dateutil import parser as dateparser
-from typeguard import typechecked
+from dj_toml_settings.environment import Environment
 
 logger = logging.getLogger(__name__)
 
+# `${NAME}`, `${env:NAME}` or `${env:NAME:-default}`
+PLACEHOLDER_PATTERN = re.compile(r"\$\{(?:env:(?P<env>\w+)(?::-(?P<default>[^}]*))?|(?P<name>\w+))\}")
 
-class VariableParser:
-    data: dict
-    value: str
-
-    def __init__(self, data: dict, value: str):
-        self.data = data
-        self.value = value
-
-    def parse(self) -> Any:
-        value: Any = self.value
-
-        for match in re.finditer(r"\$\{\w+\}", value):
-            data_key = value[match.start() : match.end()][2:-1]
-
-            if variable := self.data.get(data_key):
-                if isinstance(variable, Path):
-                    path_str = combine_bookends(value, match, variable)
-
-                    value = Path(path_str)
-                elif callable(variable):
-                    value = variable
-                elif isinstance(variable, int):
-                    value = combine_bookends(value, match, variable)
-
-                    try:
-                        value = int(value)
-                    except Exception:  # noqa: S110
-                        pass
-                elif isinstance(variable, float):
-                    value = combine_bookends(value, match, variable)
-
-                    try:
-                        value = float(value)
-                    except Exception:  # noqa: S110
-                        pass
-                elif isinstance(variable, list):
-                    value = variable
-                elif isinstance(variable, dict):
-                    value = variable
-                elif isinstance(variable, datetime):
-                    value = dateparser.isoparse(str(variable))
-                else:
-                    value = value.replace(match.string, str(variable))
+
+class Placeholder:
+    """A `${NAME}` variable or a `${env:NAME}` environment variable in a `Template`."""
+
+    __slots__ = ("default", "env", "name", "text")
+
+    name: str
+    env: bool
+    default: str | None
+    text: str
+
+    def __init__(self, name: str, text: str, env: bool = False, default: str | None = None):  # noqa: FBT001, FBT002
+        self.name = name
+        self.text = text
+        self.env = env
+        self.default = default
+
+    def __repr__(self) -> str:
+        return f"Placeholder({self.text!r})"
+
+
+class Template:
+    """A string split into literal text and placeholders, so it can be rendered in one pass."""
+
+    __slots__ = ("environment_variables", "parts", "variables")
+
+    parts: tuple[str | Placeholder, ...]
+    variables: frozenset[str]
+    environment_variables: frozenset[str]
+
+    def __init__(self, parts: tuple[str | Placeholder, ...]):
+        self.parts = parts
+
+        placeholders = [part for part in parts if isinstance(part, Placeholder)]
+        self.variables = frozenset(p.name for p in placeholders if not p.env)
+        self.environment_variables = frozenset(p.name for p in placeholders if p.env)
+
+    def render(self, data: Mapping, environment: Environment | None = None, references: set[str] | None = None) -> Any:
+        """Substitute the placeholders with the variables in `data` and the environment variables.
+
+        A template that is only one variable gets the value of the variable as-is (e.g. a `list` or a callable).
+        Otherwise, the values get converted to a `str`, and the result is converted back to a `Path` if one of
+        the variables is a `Path`, or to an `int` or `float` if it only has one variable which is a number.
+
+        Missing variables and environment variables without a default are left as-is.
+        """
+
+        if len(self.parts) == 1:
+            placeholder = self.parts[0]
+
+            if isinstance(placeholder, Placeholder) and not placeholder.env:
+                if references is not None:
+                    references.add(placeholder.name)
+
+                return data.get(placeholder.name, placeholder.text)
+
+        pieces: list[str] = []
+        values: list[Any] = []
+
+        for part in self.parts:
+            if isinstance(part, str):
+                pieces.append(part)
+            elif part.env:
+                value = (environment or Environment()).get(part.name, part.default)
+
+                if value is None:
+                    logger.warning(f"Missing environment variable {part.text}")
+                    value = part.text
+
+                pieces.append(value)
             else:
-                logger.warning(f"Missing variable substitution {value}")
+                if references is not None:
+                    references.add(part.name)
+
+                if part.name in data:
+                    value = data[part.name]
+                    values.append(value)
+                    pieces.append(str(value))
+                else:
+                    pieces.append(part.text)
+
+        return convert(values, "".join(pieces))
+
+
+def convert(values: list[Any], rendered: str) -> Any:
+    """Convert the `rendered` template based on the types of the substituted `values`."""
+
+    if any(isinstance(value, Path) for value in values):
+        return Path(rendered)
+
+    if len(values) == 1 and not isinstance(values[0], bool):
+        for number_type in (int, float):
+            if isinstance(values[0], number_type):
+                try:
+                    return number_type(rendered)
+                except ValueError:
+                    break
+
+    return rendered
+
+
+@lru_cache(maxsize=4096)
+def compile_template(value: str) -> Template:
+    """Split `value` into literal text and placeholders; cached per unique string."""
 
-        return value
+    parts: list[str | Placeholder] = []
+    position = 0
 
+    for match in PLACEHOLDER_PATTERN.finditer(value):
+        if match.start() > position:
+            parts.append(value[position : match.start()])
 
-@typechecked
-def combine_bookends(original: str, match: re.Match, middle: Any) -> str:
-    """Get the beginning of the original string before the match, and the
-    end of the string after the match and smush the replaced value in between
-    them to generate a new string.
-    """
+        if env := match.group("env"):
+            parts.append(Placeholder(env, match.group(), env=True, default=match.group("default")))
+        else:
+            parts.append(Placeholder(match.group("name"), match.group()))
 
-    start_idx = match.start()
-    start = original[:start_idx]
+        position = match.end()
 
-    end_idx = match.end()
-    ending = original[end_idx:]
+    if position < len(value):
+        parts.append(value[position:])
 
-    return start + str(middle) + ending
+    return Template(tuple(parts))
@@ -0,0 +1,336 @@
+import logging
+import os
+import threading
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from dj_toml_settings.config import TOML_SETTINGS_FILES, get_plans_resolver, get_settings_paths
+from dj_toml_settings.environment import RecordingEnvironment, get_signature
+from dj_toml_settings.hooks import EnvironmentIndex
+from dj_toml_settings.overlay import Layers
+from dj_toml_settings.toml_parser import Parser
+
+if TYPE_CHECKING:
+    from dj_toml_settings.plan import Plan
+
+logger = logging.getLogger(__name__)
+
+
+class SettingsDiff:
+    """The settings that changed after a TOML file or an environment variable changed.
+
+    `changed` has the new values of the settings that were added or changed, `removed` has the settings that are not
+    set anymore, and `previous` has the old values of both.
+    """
+
+    changed: dict[str, Any]
+    removed: set[str]
+    previous: dict[str, Any]
+
+    def __init__(self):
+        self.changed = {}
+        self.removed = set()
+        self.previous = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.removed)
+
+    def __repr__(self) -> str:
+        return f"SettingsDiff(changed={self.changed!r}, removed={self.removed!r})"
+
+
+class SettingsWatcher:
+    """Polls the TOML files and environment variables for changes and re-resolves the settings that are affected.
+
+    Only the TOML files that changed get decoded again, and only the settings that changed (and the settings that
+    refer to them) get resolved again. Every setting that reads an environment variable (with `$env` or
+    `${env:NAME}`) is indexed, so a changed variable only re-resolves the settings that depend on it. Subscribers get
+    called with a `SettingsDiff` of the changed settings.
+    """
+
+    base_dir: Path
+    toml_settings_files: list[str]
+    paths: list[Path]
+    data: dict
+    interval: float
+    settings: dict
+    signatures: dict[Path, tuple | None]
+    plans: dict[Path, "Plan"]
+    missing: set[Path]
+    environ: dict[str, str | None]
+    environment_name: str | None
+    environment_keys: dict[str, set[str]]
+    subscribers: list[Callable[[SettingsDiff], Any]]
+
+    def __init__(
+        self,
+        base_dir: Path,
+        data: Mapping | None = None,
+        toml_settings_files: list[str] | None = None,
+        interval: float = 1.0,
+    ):
+        """Resolve the settings from the TOML files for the first time.
+
+        Args:
+            base_dir: Base directory to look for TOML files
+            data: Existing settings that the TOML files can refer to; they are copied
+            toml_settings_files: TOML file names to look for in `base_dir`; directories and glob patterns of
+                fragments are checked for added and removed fragments too
+            interval: How many seconds to wait between checking the TOML files when the watcher is started
+        """
+
+        self.base_dir = base_dir
+        self.toml_settings_files = toml_settings_files or TOML_SETTINGS_FILES
+        self.paths = get_settings_paths(base_dir, self.toml_settings_files)
+        self.data = dict(data or {})
+        self.interval = interval
+        self.settings = {}
+        self.signatures = {}
+        self.plans = {}
+        self.missing = set()
+        self.environ = {}
+        self.environment_name = None
+        self.environment_keys = {}
+        self.subscribers = []
+
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread: threading.Thread | None = None
+
+        self.reload(self.paths)
+
+    def subscribe(self, subscriber: Callable[[SettingsDiff], Any]) -> Callable[[SettingsDiff], Any]:
+        """Call `subscriber` with the `SettingsDiff` every time settings change; can be used as a decorator."""
+
+        self.subscribers.append(subscriber)
+
+        return subscriber
+
+    def unsubscribe(self, subscriber: Callable[[SettingsDiff], Any]) -> None:
+        self.subscribers.remove(subscriber)
+
+    def check(self) -> SettingsDiff | None:
+        """Re-resolve the settings if a TOML file or an environment variable changed, and notify the subscribers
+        when settings changed.
+        """
+
+        with self.lock:
+            paths = get_settings_paths(self.base_dir, self.toml_settings_files)
+            changed_paths = [
+                path
+                for path in dict.fromkeys([*self.paths, *paths])
+                if get_signature(path) != self.signatures.get(path)
+            ]
+            changed_names = [name for name, value in self.environ.items() if os.environ.get(name) != value]
+
+            if not changed_paths and not changed_names:
+                return None
+
+            diff = self.reload(changed_paths, changed_names, paths)
+
+        if diff:
+            for subscriber in self.subscribers:
+                subscriber(diff)
+
+        return diff
+
+    def reload(
+        self, changed_paths: list[Path], changed_names: list[str] | None = None, paths: list[Path] | None = None
+    ) -> SettingsDiff:
+        """Decode the `changed_paths` again and re-resolve the settings that changed, including the settings that
+        read one of the `changed_names` environment variables. `paths` are the TOML files in order of precedence
+        when fragments were added or removed.
+
+        Nothing changes when the settings cannot be resolved, e.g. because of a `VariableCycleError`. A TOML file that
+        cannot be decoded keeps its previous settings until it can be decoded again, and a deleted TOML file keeps
+        them until it is still missing the next time it is checked.
+        """
+
+        environment = RecordingEnvironment()
+        environment_name = environment.get("ENVIRONMENT")
+        paths = self.paths if paths is None else paths
+        signatures = dict(self.signatures)
+
+        for path in changed_paths:
+            logger.debug(f"Reload TOML file at: {path}")
+            signatures[path] = get_signature(path)
+
+        # The plans are kept in order of precedence
+        plans = {}
+        changed = set(changed_paths)
+        missing = set(self.missing)
+
+        for path in paths:
+            if path not in changed:
+                if path in self.plans:
+                    plans[path] = self.plans[path]
+                continue
+
+            try:
+                plans[path] = Parser(path).compile(strict=True)
+            except FileNotFoundError:
+                # An editor can briefly remove the file while it saves it, so a file is only deleted when it is still
+                # missing the next time it is checked
+                if path in self.plans and path not in missing:
+                    logger.debug(f"Cannot find TOML file at: {path}; keep its previous settings")
+                    plans[path] = self.plans[path]
+                    signatures[path] = self.signatures[path]
+                    missing.add(path)
+                else:
+                    missing.discard(path)
+            except ValueError:
+                # Keep the previous settings while an editor saves the file, so it can be half-written
+                logger.error(f"Cannot parse TOML at: {path}; keep its previous settings")
+                missing.discard(path)
+
+                if path in self.plans:
+                    plans[path] = self.plans[path]
+                    signatures[path] = self.signatures[path]
+            else:
+                missing.discard(path)
+
+        previous_assignments = self.get_assignments(self.plans, self.environment_name)
+        assignments = self.get_assignments(plans, environment_name)
+        changed_keys = {
+            key
+            for key in previous_assignments.keys() | assignments.keys()
+            if previous_assignments.get(key) != assignments.get(key)
+        }
+        changed_keys.update(key for name in changed_names or () for key in self.environment_keys.get(name, ()))
+
+        # The settings that did not change are used as-is, so they do not need to be resolved again
+        base: dict = {}
+        overlay = Layers(base).add()
+        index = EnvironmentIndex()
+        resolver = get_plans_resolver(plans, environment_name, overlay, environment, [index])
+        affected = resolver.get_dependents(changed_keys)
+
+        base.update(self.data)
+        base.update((key, value) for key, value in self.settings.items() if key not in affected)
+
+        resolver.resolve(keys=affected)
+
+        self.paths = paths
+        self.signatures = signatures
+        self.plans = plans
+        self.missing = missing
+        self.environment_name = environment_name
+        self.update_environment_index(affected, index, environment)
+
+        return self.update(affected, overlay.layer)
+
+    def update_environment_index(
+        self, affected: set[str], index: EnvironmentIndex, environment: RecordingEnvironment
+    ) -> None:
+        """Replace the environment variables of the `affected` settings with the ones they read now."""
+
+        environment_keys = {name: keys - affected for name, keys in self.environment_keys.items()}
+
+        for name, keys in index.keys.items():
+            environment_keys.setdefault(name, set()).update(keys)
+
+        self.environment_keys = {name: keys for name, keys in environment_keys.items() if keys}
+
+        # The values the settings were resolved with, so a change can be detected even if it happens while resolving
+        consulted = {**self.environ, **environment.consulted}
+        self.environ = {name: consulted.get(name) for name in self.environment_keys}
+        self.environ["ENVIRONMENT"] = self.environment_name
+
+    def get_environment_keys(self, name: str) -> set[str]:
+        """Gets the settings that depend on the environment variable `name`, directly or through `${VAR}`."""
+
+        with self.lock:
+            keys = self.environment_keys.get(name, set())
+            resolver = get_plans_resolver(self.plans, self.environment_name, {}, RecordingEnvironment())
+
+            return resolver.get_dependents(keys)
+
+    def get_assignments(self, plans: dict[Path, "Plan"], environment_name: str | None) -> dict[str, list]:
+        """Get the sections and values that every setting gets assigned in `plans`, in order of precedence.
+
+        `plans` must be in order of precedence too.
+        """
+
+        assignments: dict[str, list] = {}
+
+        for path, plan in plans.items():
+            for assignment in plan.get_assignments(environment_name):
+                assignments.setdefault(assignment.key, []).append((path, assignment.section, assignment.value))
+
+        return assignments
+
+    def update(self, affected: set[str], resolved: dict) -> SettingsDiff:
+        diff = SettingsDiff()
+
+        for key in affected:
+            if key in resolved:
+                value = resolved[key]
+            elif key in self.data:
+                # The setting is not in the TOML files anymore, so it goes back to the existing value
+                value = self.data[key]
+            else:
+                if key in self.settings:
+                    diff.previous[key] = self.settings.pop(key)
+                    diff.removed.add(key)
+
+                continue
+
+            if key not in self.settings or self.settings[key] != value:
+                if key in self.settings:
+                    diff.previous[key] = self.settings[key]
+
+                diff.changed[key] = value
+
+            if key in resolved:
+                self.settings[key] = value
+            else:
+                self.settings.pop(key, None)
+
+        return diff
+
+    def start(self) -> None:
+        """Check the TOML files for changes every `interval` seconds in a background thread."""
+
+        if self.thread and self.thread.is_alive():
+            return
+
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name="dj-toml-settings-watcher", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def run(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Cannot reload TOML settings")
+
+
+def send_setting_changed(diff: SettingsDiff) -> None:
+    """Update the Django settings with `diff`, and send Django's `setting_changed` signal for every setting.
+
+    Subscribe it to a `SettingsWatcher` with `watcher.subscribe(send_setting_changed)`.
+    """
+
+    from django.conf import settings  # noqa: PLC0415
+    from django.core.signals import setting_changed  # noqa: PLC0415
+
+    for key, value in diff.changed.items():
+        setattr(settings, key, value)
+        setting_changed.send(sender=SettingsWatcher, setting=key, value=value, enter=True)
+
+    for key in diff.removed:
+        try:
+            delattr(settings, key)
+        except AttributeError:
+            pass
+
+        setting_changed.send(sender=SettingsWatcher, setting=key, value=None, enter=False)
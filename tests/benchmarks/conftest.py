@@ -0,0 +1,100 @@
+"""Measure the time and peak memory of the benchmarks, and compare them to a stored baseline.
+
+Set `DJ_TOML_SETTINGS_BENCHMARK=save` to store the results as the new baseline, or `DJ_TOML_SETTINGS_BENCHMARK=compare`
+to fail the benchmarks that are slower or use more memory than the baseline. By default, the comparison only gets
+printed.
+"""
+
+import json
+import os
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import pytest
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# How much slower, or how much more memory, than the baseline counts as a regression
+TIME_THRESHOLD = float(os.environ.get("DJ_TOML_SETTINGS_BENCHMARK_TIME_THRESHOLD", "1.5"))
+MEMORY_THRESHOLD = float(os.environ.get("DJ_TOML_SETTINGS_BENCHMARK_MEMORY_THRESHOLD", "1.2"))
+
+results: dict[str, dict[str, float]] = {}
+
+
+def load_baseline() -> dict[str, dict[str, float]]:
+    try:
+        return json.loads(BASELINE_PATH.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def get_regressions(name: str, result: dict[str, float], baseline: dict[str, dict[str, float]]) -> list[str]:
+    expected = baseline.get(name)
+
+    if not expected:
+        return []
+
+    regressions = []
+
+    if result["seconds"] > expected["seconds"] * TIME_THRESHOLD:
+        regressions.append(f"time {expected['seconds'] * 1e3:.1f}ms -> {result['seconds'] * 1e3:.1f}ms")
+
+    if result["peak_bytes"] > expected["peak_bytes"] * MEMORY_THRESHOLD:
+        regressions.append(
+            f"peak memory {expected['peak_bytes'] / 1024:.0f}KiB -> {result['peak_bytes'] / 1024:.0f}KiB"
+        )
+
+    return regressions
+
+
+@pytest.fixture
+def measure() -> Callable[..., Any]:
+    """Measure `function` and compare it to the baseline for `name`; returns the result of `function`."""
+
+    baseline = load_baseline()
+    mode = os.environ.get("DJ_TOML_SETTINGS_BENCHMARK", "")
+
+    def _measure(name: str, function: Callable[[], Any], repeat: int = 3) -> Any:
+        timings = []
+
+        for _ in range(repeat):
+            start = perf_counter()
+            value = function()
+            timings.append(perf_counter() - start)
+
+        # Measure memory separately, because tracing slows down the code
+        tracemalloc.start()
+
+        try:
+            function()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        result = {"seconds": min(timings), "peak_bytes": peak_bytes}
+        results[name] = result
+
+        regressions = get_regressions(name, result, baseline)
+        status = f"REGRESSION ({', '.join(regressions)})" if regressions else "ok"
+
+        print(  # noqa: T201
+            f"\n{name}: {result['seconds'] * 1e3:.1f}ms, peak {result['peak_bytes'] / 1024:.0f}KiB, {status}"
+        )
+
+        if regressions and mode == "compare":
+            pytest.fail(f"{name} regressed: {', '.join(regressions)}")
+
+        return value
+
+    return _measure
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if os.environ.get("DJ_TOML_SETTINGS_BENCHMARK") == "save" and results:
+        baseline = load_baseline()
+        baseline.update(results)
+
+        BASELINE_PATH.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + "\n")
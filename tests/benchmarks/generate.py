@@ -0,0 +1,76 @@
+"""Generate synthetic TOML settings files for the benchmarks."""
+
+import random
+
+# Inline tables for each special operator; `{i}` is replaced with the index of the setting
+OPERATORS = {
+    "env": '{{ "$env" = "BENCHMARK_{i}", "$default" = "default-{i}" }}',
+    "path": '{{ "$path" = "directory-{i}" }}',
+    "value": '{{ "$value" = "value-{i}" }}',
+    "insert": '{{ "$insert" = "host-{i}" }}',
+    "none": '{{ "$none" = 1 }}',
+    "type": '{{ "$value" = "{i}", "$type" = "int" }}',
+    "datetime": '{{ "$value" = "2025-08-30T07:32:00Z", "$type" = "datetime" }}',
+}
+
+ALL_OPERATORS = tuple(OPERATORS)
+
+
+def generate_value(i: int, rng: random.Random, depth: int, variable_density: float, operators: tuple[str, ...]) -> str:
+    kinds = ("literal", *operators)
+    kind = kinds[i % len(kinds)]
+
+    if i and rng.random() < variable_density:
+        value = f'"${{SETTING_{rng.randrange(i)}}}/setting-{i}"'
+    elif kind == "literal":
+        value = f'"setting-{i}"' if i % 2 else str(i)
+    else:
+        value = OPERATORS[kind].format(i=i)
+
+    for level in range(depth - 1):
+        value = f"{{ level_{level} = {value} }}"
+
+    return value
+
+
+def generate_toml(
+    *,
+    keys: int = 1_000,
+    depth: int = 1,
+    apps: int = 0,
+    envs: int = 0,
+    variable_density: float = 0.0,
+    operators: tuple[str, ...] = (),
+    seed: int = 0,
+) -> str:
+    """Generate a TOML file with `[tool.django]` settings.
+
+    Args:
+        keys: The number of settings; they get split evenly between `[tool.django]` and the `apps` sections.
+        depth: How deeply the value of each setting is nested in inline tables.
+        apps: The number of `[tool.django.apps.*]` sections.
+        envs: The number of `[tool.django.envs.*]` sections; each one overrides 10% of the settings.
+        variable_density: The fraction of settings that refer to another setting with `${SETTING_*}`.
+        operators: The special operators (see `OPERATORS`) to mix in with literal values.
+        seed: Seed for the random choices, so the same arguments always generate the same file.
+    """
+
+    rng = random.Random(seed)  # noqa: S311
+    sections = ["[tool.django]"] + [f"[tool.django.apps.app_{a}]" for a in range(apps)]
+    per_section = -(-keys // len(sections))
+
+    lines = []
+
+    for s, header in enumerate(sections):
+        lines.extend(["", header])
+
+        for i in range(s * per_section, min(keys, (s + 1) * per_section)):
+            lines.append(f"SETTING_{i} = {generate_value(i, rng, depth, variable_density, operators)}")
+
+    for e in range(envs):
+        lines.extend(["", f"[tool.django.envs.env_{e}]"])
+
+        for i in range(e, keys, 10):
+            lines.append(f'SETTING_{i} = "env-{e}-{i}"')
+
+    return "\n".join(lines) + "\n"
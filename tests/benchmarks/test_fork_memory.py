@@ -0,0 +1,100 @@
+"""Compare the memory that every worker of a preforking server copies from the parent, with and without frozen
+settings and `gc.freeze()`.
+"""
+
+import gc
+import os
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+
+import pytest
+from generate import ALL_OPERATORS, generate_toml
+
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.freeze import freeze_gc
+
+pytestmark = [
+    pytest.mark.slow,
+    pytest.mark.skipif(
+        not hasattr(os, "fork") or not Path("/proc/self/smaps_rollup").exists(), reason="Needs fork and Linux"
+    ),
+]
+
+WORKERS = 4
+
+
+def get_private_bytes() -> int:
+    """Gets the memory that only the current process uses, i.e. the pages it copied from its parent."""
+
+    private_kib = 0
+
+    for line in Path("/proc/self/smaps_rollup").read_text().splitlines():
+        if line.startswith(("Private_Clean:", "Private_Dirty:")):
+            private_kib += int(line.split()[1])
+
+    return private_kib * 1024
+
+
+def touch(value) -> None:
+    """Read every value, like a worker that uses the settings, which updates their reference counts."""
+
+    if isinstance(value, Mapping):
+        for item in value.values():
+            touch(item)
+    elif isinstance(value, list | tuple | set | frozenset):
+        for item in value:
+            touch(item)
+
+
+def fork_workers(settings: dict) -> list[int]:
+    """Fork `WORKERS` processes that use the settings and run a garbage collection, and get their private memory."""
+
+    results = []
+
+    for _ in range(WORKERS):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:  # pragma: no cover
+            os.close(read_fd)
+
+            before = get_private_bytes()
+            touch(settings)
+            gc.collect()
+
+            os.write(write_fd, str(get_private_bytes() - before).encode())
+            os._exit(0)
+
+        os.close(write_fd)
+
+        with os.fdopen(read_fd) as f:
+            results.append(int(f.read()))
+
+        os.waitpid(pid, 0)
+
+    return results
+
+
+@pytest.mark.parametrize("frozen", [False, True], ids=["mutable", "frozen"])
+def test_fork_memory(tmp_path, frozen):
+    (tmp_path / "pyproject.toml").write_text(generate_toml(keys=20_000, depth=3, apps=20, operators=ALL_OPERATORS))
+
+    settings = get_toml_settings(base_dir=tmp_path, frozen=frozen)
+
+    if frozen:
+        freeze_gc()
+
+    try:
+        copied = fork_workers(settings)
+    finally:
+        gc.unfreeze()
+
+    average = sum(copied) / len(copied)
+
+    print(  # noqa: T201
+        f"\nfork_memory[{'frozen' if frozen else 'mutable'}]: {average / 1024:.0f}KiB copied per worker "
+        f"({len(settings)} settings, {sys.getsizeof(settings) / 1024:.0f}KiB top-level dict)"
+    )
+
+    assert all(value >= 0 for value in copied)
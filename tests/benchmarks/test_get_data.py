@@ -0,0 +1,80 @@
+import sys
+from time import perf_counter
+
+import pytest
+
+from dj_toml_settings.toml_parser import Parser
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+pytestmark = pytest.mark.slow
+
+
+def _get_pyproject(tools: int) -> str:
+    """Generate a `pyproject.toml` with a lot of configuration for other tools, like in a monorepo."""
+
+    lines = [
+        "[project]",
+        'name = "example"',
+        'description = """',
+        "A long description.",
+        '"""',
+        "dependencies = [",
+        *(f'    "package-{i}>=1.{i}",' for i in range(200)),
+        "]",
+        "",
+        "[tool.django]",
+        "DEBUG = true",
+        'SECRET_KEY = { "$env" = "SECRET_KEY", "$default" = "secret" }',
+        "",
+    ]
+
+    for i in range(tools):
+        lines.extend(
+            [
+                f"[tool.tool-{i}]",
+                "line-length = 120",
+                f'exclude = ["build-{i}", "dist-{i}"]',
+                f"matrix = [[{i}, 1], [{i}, 2]]",
+                f'options = {{ name = "tool-{i}", enabled = true, paths = ["src", "tests"] }}',
+                "",
+                f"[tool.tool-{i}.per-file-ignores]",
+                f'"tests/test_{i}.py" = ["S101", "PLR2004"]',
+                "",
+            ]
+        )
+
+    lines.extend(["[tool.django.apps.blog]", 'BLOG_TITLE = "Example"', ""])
+
+    return "\n".join(lines)
+
+
+def _time(function, repeat: int = 5) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        timings.append(perf_counter() - start)
+
+    return min(timings)
+
+
+@pytest.mark.parametrize("tools", [100, 1_000])
+def test_get_data(tmp_path, tools):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(_get_pyproject(tools))
+
+    expected = tomllib.loads(path.read_text())["tool"]["django"]
+    assert expected == Parser(path).get_data()
+
+    full = _time(lambda: tomllib.loads(path.read_bytes().decode()))
+    scanned = _time(lambda: Parser(path).get_data())
+
+    print(  # noqa: T201
+        f"\nget_data for {path.stat().st_size / 1024:.0f}KiB: "
+        f"full decode {full * 1e3:.1f}ms, [tool.django] only {scanned * 1e3:.1f}ms ({full / scanned:.1f}x)"
+    )
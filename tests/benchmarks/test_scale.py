@@ -0,0 +1,115 @@
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from generate import ALL_OPERATORS, generate_toml
+
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.toml_parser import Parser
+
+pytestmark = pytest.mark.slow
+
+SCENARIOS = {
+    "keys_100": {"keys": 100},
+    "keys_1000": {"keys": 1_000},
+    "keys_10000": {"keys": 10_000},
+    "keys_100000": {"keys": 100_000},
+    "depth_5": {"keys": 1_000, "depth": 5},
+    "apps_50_envs_10": {"keys": 1_000, "apps": 50, "envs": 10},
+    "variables_50": {"keys": 1_000, "variable_density": 0.5},
+    "operators_all": {"keys": 1_000, "operators": ALL_OPERATORS},
+    "mixed": {"keys": 10_000, "depth": 3, "apps": 20, "envs": 5, "variable_density": 0.2, "operators": ALL_OPERATORS},
+}
+
+
+@pytest.fixture(params=list(SCENARIOS))
+def scenario(request, tmp_path, monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "env_0")
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text(generate_toml(**SCENARIOS[request.param]))
+
+    return request.param, path
+
+
+def test_get_data(scenario, measure):
+    name, path = scenario
+
+    data = measure(f"get_data[{name}]", lambda: Parser(path).get_data())
+
+    assert data
+
+
+def test_parse_value(scenario, measure):
+    name, path = scenario
+    data = Parser(path).get_data()
+
+    # Settings in the same order of precedence as `parse_file`, without decoding or dependency resolution
+    settings = [
+        *((key, value) for key, value in data.items() if key not in ("apps", "envs")),
+        *((key, value) for app in data.get("apps", {}).values() for key, value in app.items()),
+        *data.get("envs", {}).get("env_0", {}).items(),
+    ]
+
+    def parse_values():
+        parser = Parser(path)
+
+        for key, value in settings:
+            parser.data[key] = parser.parse_value(key, value)
+
+        return parser.data
+
+    measure(f"parse_value[{name}]", parse_values)
+
+
+def test_get_toml_settings(scenario, measure):
+    name, path = scenario
+
+    settings = measure(f"get_toml_settings[{name}]", lambda: get_toml_settings(base_dir=path.parent))
+
+    assert settings
+
+
+def test_django_setup(tmp_path, measure):
+    pytest.importorskip("django")
+
+    (tmp_path / "pyproject.toml").write_text(generate_toml(keys=1_000, apps=10, operators=ALL_OPERATORS))
+    (tmp_path / "benchmark_settings.py").write_text(
+        textwrap.dedent("""
+        from pathlib import Path
+
+        from dj_toml_settings import configure_toml_settings
+
+        BASE_DIR = Path(__file__).resolve().parent
+        SECRET_KEY = "benchmark"
+        INSTALLED_APPS = ["django.contrib.contenttypes", "django.contrib.auth"]
+
+        configure_toml_settings(BASE_DIR, globals())
+        """)
+    )
+
+    # `django.setup()` can only run once per process
+    script = textwrap.dedent("""
+        import os
+        from time import perf_counter
+
+        os.environ["DJANGO_SETTINGS_MODULE"] = "benchmark_settings"
+        start = perf_counter()
+
+        import django
+        django.setup()
+
+        print(perf_counter() - start)
+    """)
+
+    def setup():
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", script], cwd=tmp_path, capture_output=True, text=True, check=True
+        )
+
+        return float(result.stdout)
+
+    seconds = measure("django_setup[keys_1000]", setup, repeat=1)
+
+    print(f"django.setup(): {seconds * 1e3:.1f}ms")  # noqa: T201
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from generate import ALL_OPERATORS, generate_toml
+
+from dj_toml_settings.toml_parser import Parser
+
+pytestmark = pytest.mark.slow
+
+# `DJ_TOML_SETTINGS_TYPECHECK` is read when `dj_toml_settings` is imported, so every run needs its own process
+SCRIPT = textwrap.dedent("""
+    import sys
+    from pathlib import Path
+    from time import perf_counter
+
+    from dj_toml_settings.config import get_toml_settings
+
+    timings = []
+
+    for _ in range(5):
+        start = perf_counter()
+        get_toml_settings(base_dir=Path(sys.argv[1]))
+        timings.append(perf_counter() - start)
+
+    print(min(timings))
+""")
+
+
+def _count_nodes(value) -> int:
+    if isinstance(value, dict):
+        return 1 + sum(_count_nodes(v) for v in value.values())
+    elif isinstance(value, list):
+        return 1 + sum(_count_nodes(v) for v in value)
+
+    return 1
+
+
+def _time_get_toml_settings(base_dir, typecheck: bool) -> float:  # noqa: FBT001
+    env = {key: value for key, value in os.environ.items() if key != "DJ_TOML_SETTINGS_TYPECHECK"}
+
+    if typecheck:
+        env["DJ_TOML_SETTINGS_TYPECHECK"] = "1"
+
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", SCRIPT, str(base_dir)], env=env, capture_output=True, text=True, check=True
+    )
+
+    return float(result.stdout)
+
+
+def test_get_toml_settings(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(generate_toml(keys=2_000, depth=2, variable_density=0.2, operators=ALL_OPERATORS))
+    nodes = _count_nodes(Parser(path).get_data())
+
+    unchecked = _time_get_toml_settings(tmp_path, typecheck=False)
+    checked = _time_get_toml_settings(tmp_path, typecheck=True)
+
+    print(  # noqa: T201
+        f"\nget_toml_settings for {nodes} nodes: "
+        f"unchecked {unchecked / nodes * 1e9:.0f}ns/node, "
+        f"checked {checked / nodes * 1e9:.0f}ns/node ({checked / unchecked:.1f}x)"
+    )
@@ -0,0 +1,187 @@
+import pickle
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+from urllib.parse import ParseResult, urlparse
+
+import pytest
+
+from dj_toml_settings.cache import SettingsCache, dumps, loads
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.toml_parser import Parser
+
+
+def _fail_compile(*args, **kwargs):
+    raise AssertionError("compile should not be called")
+
+
+def test_warm_start(tmp_path, monkeypatch):
+    expected = {"DEBUG": True, "SECRET_KEY": "test-secret"}
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+SECRET_KEY = "test-secret"
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+    assert expected == actual
+
+    monkeypatch.setattr(Parser, "compile", _fail_compile)
+
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+    assert expected == actual
+
+
+def test_types(tmp_path, monkeypatch):
+    expected = {
+        "BASE_DIR": tmp_path,
+        "PRICE": Decimal("1.50"),
+        "TIMEOUT": timedelta(minutes=5),
+        "URL": urlparse("https://example.com/path"),
+    }
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+BASE_DIR = { "$path" = "." }
+PRICE = { "$value" = "1.50", "$type" = "decimal" }
+TIMEOUT = { "$value" = "5m", "$type" = "timedelta" }
+URL = { "$value" = "https://example.com/path", "$type" = "url" }
+""")
+
+    get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+
+    monkeypatch.setattr(Parser, "compile", _fail_compile)
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+
+    assert expected == actual
+    assert isinstance(actual["BASE_DIR"], Path)
+    assert isinstance(actual["URL"], ParseResult)
+
+
+def test_file_changed(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+    assert {"DEBUG": True} == actual
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = false
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+    assert {"DEBUG": False} == actual
+
+
+def test_env_changed(tmp_path, monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "one")
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+SECRET_KEY = { "$env" = "SECRET_KEY" }
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+    assert {"SECRET_KEY": "one"} == actual
+
+    monkeypatch.setenv("SECRET_KEY", "two")
+
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+    assert {"SECRET_KEY": "two"} == actual
+
+
+def test_environment_changed(tmp_path, monkeypatch):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+
+[tool.django.envs.production]
+DEBUG = false
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+    assert {"DEBUG": True} == actual
+
+    monkeypatch.setenv("ENVIRONMENT", "production")
+
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+    assert {"DEBUG": False} == actual
+
+
+def test_data_changed(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+STATIC_ROOT = "${BASE_DIR}/static"
+ALLOWED_HOSTS = { "$insert" = "example.com" }
+""")
+
+    actual = get_toml_settings(
+        base_dir=tmp_path, data={"BASE_DIR": Path("/one"), "ALLOWED_HOSTS": []}, cache_dir=tmp_path / "cache"
+    )
+    assert {"BASE_DIR": Path("/one"), "STATIC_ROOT": Path("/one/static"), "ALLOWED_HOSTS": ["example.com"]} == actual
+
+    actual = get_toml_settings(
+        base_dir=tmp_path, data={"BASE_DIR": Path("/two"), "ALLOWED_HOSTS": []}, cache_dir=tmp_path / "cache"
+    )
+    assert {"BASE_DIR": Path("/two"), "STATIC_ROOT": Path("/two/static"), "ALLOWED_HOSTS": ["example.com"]} == actual
+
+    actual = get_toml_settings(
+        base_dir=tmp_path, data={"BASE_DIR": Path("/two"), "ALLOWED_HOSTS": ["a"]}, cache_dir=tmp_path / "cache"
+    )
+    assert {
+        "BASE_DIR": Path("/two"),
+        "STATIC_ROOT": Path("/two/static"),
+        "ALLOWED_HOSTS": ["a", "example.com"],
+    } == actual
+
+
+def test_uncacheable_value(tmp_path):
+    def some_function():
+        pass
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+SOMETHING = "${some_function}"
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, data={"some_function": some_function}, cache_dir=tmp_path / "cache")
+
+    assert actual["SOMETHING"] is some_function
+    assert not list((tmp_path / "cache").glob("*.settings"))
+
+
+def test_corrupt_cache(tmp_path, caplog):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+""")
+
+    get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+
+    for path in (tmp_path / "cache").glob("*.settings"):
+        path.write_bytes(b"not a pickle")
+
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+
+    assert {"DEBUG": True} == actual
+    assert "Cannot load cache at: " in caplog.text
+
+
+def test_unsafe_class():
+    content = pickle.dumps(SettingsCache(Path(".")))
+
+    with pytest.raises(pickle.UnpicklingError) as e:
+        loads(content)
+
+    assert "Cannot load dj_toml_settings.cache.SettingsCache from the cache" in e.exconly()
+
+
+def test_dumps_unsafe_class():
+    with pytest.raises(ValueError) as e:
+        dumps({"CACHE": SettingsCache(Path("."))})
+
+    assert "Cannot cache value" in e.exconly()
@@ -0,0 +1,176 @@
+import pytest
+
+from dj_toml_settings.cache import SettingsMemo
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.environment import Environment
+from dj_toml_settings.toml_parser import Parser
+
+
+@pytest.fixture(autouse=True)
+def cache_clear():
+    get_toml_settings.cache_clear()
+    yield
+    get_toml_settings.cache_clear()
+
+
+def _fail_compile(*args, **kwargs):
+    raise AssertionError("compile should not be called")
+
+
+def test(tmp_path, monkeypatch):
+    expected = {"DEBUG": True}
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+""")
+
+    assert expected == get_toml_settings(base_dir=tmp_path, memoize=True)
+
+    monkeypatch.setattr(Parser, "compile", _fail_compile)
+
+    assert expected == get_toml_settings(base_dir=tmp_path, memoize=True)
+
+
+def test_not_memoized(tmp_path, monkeypatch):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+""")
+
+    get_toml_settings(base_dir=tmp_path)
+
+    monkeypatch.setattr(Parser, "compile", _fail_compile)
+
+    with pytest.raises(AssertionError):
+        get_toml_settings(base_dir=tmp_path, memoize=True)
+
+
+def test_copy(tmp_path):
+    expected = {"ALLOWED_HOSTS": ["127.0.0.1"], "DATABASES": {"default": {"NAME": "db"}}}
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+ALLOWED_HOSTS = ["127.0.0.1"]
+DATABASES = { default = { NAME = "db" } }
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, memoize=True)
+    actual["ALLOWED_HOSTS"].append("example.com")
+    actual["DATABASES"]["default"]["NAME"] = "other"
+
+    actual = get_toml_settings(base_dir=tmp_path, memoize=True)
+    assert expected == actual
+
+    actual["ALLOWED_HOSTS"].append("example.com")
+
+    actual = get_toml_settings(base_dir=tmp_path, memoize=True)
+    assert expected == actual
+
+
+def test_file_changed(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+""")
+
+    assert {"DEBUG": True} == get_toml_settings(base_dir=tmp_path, memoize=True)
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = false
+""")
+
+    assert {"DEBUG": False} == get_toml_settings(base_dir=tmp_path, memoize=True)
+
+
+def test_file_added(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+""")
+
+    assert {"DEBUG": True} == get_toml_settings(base_dir=tmp_path, memoize=True)
+
+    (tmp_path / "django.toml").write_text("""
+[tool.django]
+DEBUG = false
+""")
+
+    assert {"DEBUG": False} == get_toml_settings(base_dir=tmp_path, memoize=True)
+
+
+def test_env_changed(tmp_path, monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "one")
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+SECRET_KEY = { "$env" = "SECRET_KEY" }
+""")
+
+    assert {"SECRET_KEY": "one"} == get_toml_settings(base_dir=tmp_path, memoize=True)
+
+    monkeypatch.setenv("SECRET_KEY", "two")
+
+    assert {"SECRET_KEY": "two"} == get_toml_settings(base_dir=tmp_path, memoize=True)
+
+
+def test_data_changed(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+TITLE = "${NAME}"
+""")
+
+    assert {"NAME": "a", "TITLE": "a"} == get_toml_settings(base_dir=tmp_path, data={"NAME": "a"}, memoize=True)
+    assert {"NAME": "b", "TITLE": "b"} == get_toml_settings(base_dir=tmp_path, data={"NAME": "b"}, memoize=True)
+
+
+def test_cache_clear(tmp_path, monkeypatch):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+""")
+
+    get_toml_settings(base_dir=tmp_path, memoize=True)
+    get_toml_settings.cache_clear()
+
+    monkeypatch.setattr(Parser, "compile", _fail_compile)
+
+    with pytest.raises(AssertionError):
+        get_toml_settings(base_dir=tmp_path, memoize=True)
+
+
+def test_disk_cache(tmp_path, monkeypatch):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+TITLE = "${NAME}"
+""")
+
+    get_toml_settings(base_dir=tmp_path, data={"NAME": "a"}, cache_dir=tmp_path / "cache")
+
+    monkeypatch.setattr(Parser, "compile", _fail_compile)
+
+    # Loaded from the disk cache and then memoized
+    actual = get_toml_settings(base_dir=tmp_path, data={"NAME": "a"}, cache_dir=tmp_path / "cache", memoize=True)
+    assert {"NAME": "a", "TITLE": "a"} == actual
+
+    # The memoized settings still check the variables that were read
+    with pytest.raises(AssertionError):
+        get_toml_settings(base_dir=tmp_path, data={"NAME": "b"}, cache_dir=tmp_path / "cache", memoize=True)
+
+
+def test_maxsize():
+    memo = SettingsMemo(maxsize=2)
+    environment = Environment(environ={})
+
+    memo.set(("a",), {}, environment, set(), {"A": 1})
+    memo.set(("b",), {}, environment, set(), {"B": 1})
+
+    # Accessing "a" makes "b" the least recently used
+    assert {"A": 1} == memo.get(("a",), {}, environment)
+
+    memo.set(("c",), {}, environment, set(), {"C": 1})
+
+    assert memo.get(("b",), {}, environment) is None
+    assert {"A": 1} == memo.get(("a",), {}, environment)
+    assert {"C": 1} == memo.get(("c",), {}, environment)
@@ -0,0 +1,98 @@
+import os
+import sys
+
+from dj_toml_settings.cache import SettingsCache
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.toml_parser import Parser
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+
+def _fail_loads(*args, **kwargs):
+    raise AssertionError("TOML should not be decoded")
+
+
+def test_env_changed(tmp_path, monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "one")
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.ruff]
+line-length = 120
+
+[tool.django]
+SECRET_KEY = { "$env" = "SECRET_KEY" }
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+    assert {"SECRET_KEY": "one"} == actual
+
+    monkeypatch.setenv("SECRET_KEY", "two")
+    monkeypatch.setattr(tomllib, "loads", _fail_loads)
+
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+    assert {"SECRET_KEY": "two"} == actual
+
+
+def test_only_django_data(tmp_path):
+    expected = {"DEBUG": True, "apps": {"blob": {"DEBUG": False}}}
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.ruff]
+line-length = 120
+
+[tool.django]
+DEBUG = true
+
+[tool.django.apps.blob]
+DEBUG = false
+""")
+
+    cache = SettingsCache(tmp_path / "cache")
+    Parser(path, cache=cache).get_data()
+
+    actual = cache.get_toml(path, path.read_bytes())
+
+    assert expected == actual
+
+
+def test_file_changed(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+DEBUG = true
+""")
+
+    cache = SettingsCache(tmp_path / "cache")
+    assert {"DEBUG": True} == Parser(path, cache=cache).parse_file()
+
+    # Same size and modified time, but different content
+    stat = path.stat()
+    path.write_text("""
+[tool.django]
+DEBUG = 1234
+""")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert {"DEBUG": 1234} == Parser(path, cache=cache).parse_file()
+
+
+def test_parse_file_does_not_modify_cache(tmp_path):
+    expected = {"DEBUG": False}
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+DEBUG = true
+
+[tool.django.apps.blob]
+DEBUG = false
+""")
+
+    cache = SettingsCache(tmp_path / "cache")
+
+    assert expected == Parser(path, cache=cache).parse_file()
+    assert expected == Parser(path, cache=cache).parse_file()
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+from dj_toml_settings import aget_toml_settings
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.toml_parser import Parser
+
+
+def test(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+HOST = "localhost"
+STATIC_ROOT = { "$path" = "static" }
+
+[tool.django.apps.blog]
+URL = "https://${HOST}/blog"
+""")
+    (tmp_path / "django.toml").write_text("""
+[tool.django]
+HOST = "example.com"
+ALLOWED_HOSTS = ["${HOST}"]
+""")
+
+    expected = get_toml_settings(base_dir=tmp_path, data={"NAME": "blog"})
+
+    actual = asyncio.run(aget_toml_settings(base_dir=tmp_path, data={"NAME": "blog"}))
+
+    assert expected == actual
+    assert list(expected) == list(actual)
+
+
+def test_does_not_block_event_loop(tmp_path, monkeypatch):
+    (tmp_path / "pyproject.toml").write_text("[tool.django]\nDEBUG = true\n")
+
+    threads = []
+    original_get_data = Parser.get_data
+
+    def get_data(self, **kwargs):
+        threads.append(threading.current_thread())
+
+        return original_get_data(self, **kwargs)
+
+    monkeypatch.setattr(Parser, "get_data", get_data)
+
+    actual = asyncio.run(aget_toml_settings(base_dir=tmp_path))
+
+    assert {"DEBUG": True} == actual
+    assert threading.main_thread() not in threads
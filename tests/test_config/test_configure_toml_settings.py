@@ -4,7 +4,7 @@ from dj_toml_settings.config import configure_toml_settings
 def test(tmp_path, monkeypatch):
     monkeypatch.setattr(
         "dj_toml_settings.config.get_toml_settings",
-        lambda *_: {},
+        lambda *_, **__: {},
     )
 
     expected = {}
@@ -18,7 +18,7 @@ def test(tmp_path, monkeypatch):
 def test_toml_settings(tmp_path, monkeypatch):
     monkeypatch.setattr(
         "dj_toml_settings.config.get_toml_settings",
-        lambda *_: {"ALLOWED_HOSTS": ["127.0.0.1"]},
+        lambda *_, **__: {"ALLOWED_HOSTS": ["127.0.0.1"]},
     )
 
     expected = {"ALLOWED_HOSTS": ["127.0.0.1"]}
@@ -125,3 +125,31 @@ DEBUG = true
     actual = get_toml_settings(base_dir=tmp_path, toml_settings_files=["blob.toml"])
 
     assert expected == actual
+
+
+def test_data_not_copied(tmp_path):
+    class Settings(dict):
+        def copy(self):
+            raise AssertionError("`data` should not be copied")
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+STATIC_ROOT = "${BASE_DIR}/static"
+""")
+
+    (tmp_path / "django.toml").write_text("""
+[tool.django]
+ALLOWED_HOSTS = ["${HOST}"]
+""")
+
+    data = Settings(BASE_DIR="/app", HOST="example.com")
+
+    actual = get_toml_settings(base_dir=tmp_path, data=data)
+
+    assert actual is data
+    assert {
+        "BASE_DIR": "/app",
+        "HOST": "example.com",
+        "STATIC_ROOT": "/app/static",
+        "ALLOWED_HOSTS": ["example.com"],
+    } == actual
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from dj_toml_settings.config import get_toml_settings
+
+
+@pytest.fixture(autouse=True)
+def cache_clear():
+    get_toml_settings.cache_clear()
+    yield
+    get_toml_settings.cache_clear()
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = { "$env" = "DEBUG", "$default" = "false", "$type" = "bool" }
+SECRET_KEY = { "$env" = "SECRET_KEY" }
+DATABASE_URL = "postgres://${env:DB_HOST:-localhost}/app"
+
+[tool.django.envs.production]
+ALLOWED_HOSTS = ["example.com"]
+""")
+    (tmp_path / ".env").write_text('DEBUG=true\nSECRET_KEY="from-env-file"\nENVIRONMENT=production\n')
+
+    return tmp_path
+
+
+def test_env_file(base_dir, monkeypatch):
+    monkeypatch.delenv("ENVIRONMENT", raising=False)
+    monkeypatch.setenv("SECRET_KEY", "from-process")
+
+    actual = get_toml_settings(base_dir=base_dir, env_sources=[base_dir / ".env"])
+
+    assert {
+        "DEBUG": True,
+        "SECRET_KEY": "from-env-file",
+        "DATABASE_URL": "postgres://localhost/app",
+        "ALLOWED_HOSTS": ["example.com"],
+    } == actual
+
+
+def test_process_environment_overrides_env_file(base_dir, monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "from-process")
+
+    actual = get_toml_settings(base_dir=base_dir, env_sources=[base_dir / ".env", os.environ, {"DB_HOST": "db"}])
+
+    assert "from-process" == actual["SECRET_KEY"]
+    assert "postgres://db/app" == actual["DATABASE_URL"]
+
+
+def test_mapping_only(base_dir, monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "from-process")
+
+    actual = get_toml_settings(base_dir=base_dir, env_sources=[{"SECRET_KEY": "explicit"}])
+
+    assert {"DEBUG": False, "SECRET_KEY": "explicit", "DATABASE_URL": "postgres://localhost/app"} == actual
+
+
+def test_memoize(base_dir):
+    env_file = base_dir / ".env"
+
+    assert "from-env-file" == get_toml_settings(base_dir=base_dir, env_sources=[env_file], memoize=True)["SECRET_KEY"]
+
+    mtime = env_file.stat().st_mtime_ns + 1_000_000_000
+    env_file.write_text("SECRET_KEY=rotated\n")
+    os.utime(env_file, ns=(mtime, mtime))
+
+    assert "rotated" == get_toml_settings(base_dir=base_dir, env_sources=[env_file], memoize=True)["SECRET_KEY"]
@@ -0,0 +1,132 @@
+import pytest
+
+from dj_toml_settings import get_toml_settings_for_environments
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.toml_parser import Parser
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+HOST = "localhost"
+ALLOWED_HOSTS = ["${HOST}"]
+URL = "https://${HOST}"
+DATABASES = { default = { ENGINE = "django.db.backends.sqlite3" } }
+SENTRY_ENVIRONMENT = { "$env" = "ENVIRONMENT", "$default" = "local" }
+STATIC_ROOT = { "$path" = "static" }
+
+[tool.django.apps.blog]
+BLOG_TITLE = "Blog"
+
+[tool.django.envs.staging]
+HOST = "staging.example.com"
+
+[tool.django.envs.production]
+DEBUG = false
+HOST = "example.com"
+ALLOWED_HOSTS = { "$insert" = "www.example.com" }
+""")
+    (tmp_path / "django.toml").write_text("""
+[tool.django.envs.eu]
+HOST = "eu.example.com"
+""")
+
+    return tmp_path
+
+
+def test(base_dir, monkeypatch):
+    actual = get_toml_settings_for_environments(base_dir=base_dir, data={"NAME": "blog"})
+
+    assert ["staging", "production", "eu"] == list(actual)
+
+    for environment_name, settings in actual.items():
+        monkeypatch.setenv("ENVIRONMENT", environment_name)
+
+        assert get_toml_settings(base_dir=base_dir, data={"NAME": "blog"}) == settings
+
+    assert {
+        "NAME": "blog",
+        "DEBUG": False,
+        "HOST": "example.com",
+        "ALLOWED_HOSTS": ["example.com", "www.example.com"],
+        "URL": "https://example.com",
+        "DATABASES": {"default": {"ENGINE": "django.db.backends.sqlite3"}},
+        "SENTRY_ENVIRONMENT": "production",
+        "STATIC_ROOT": base_dir / "static",
+        "BLOG_TITLE": "Blog",
+    } == actual["production"]
+
+
+def test_environments(base_dir):
+    actual = get_toml_settings_for_environments(base_dir=base_dir, environments=["eu", "development"])
+
+    assert ["eu", "development"] == list(actual)
+    assert "eu.example.com" == actual["eu"]["HOST"]
+    assert "localhost" == actual["development"]["HOST"]
+    assert "development" == actual["development"]["SENTRY_ENVIRONMENT"]
+
+
+def test_structural_sharing(base_dir):
+    actual = get_toml_settings_for_environments(base_dir=base_dir)
+
+    assert actual["staging"]["DATABASES"] is actual["production"]["DATABASES"]
+    assert actual["staging"]["DATABASES"] is actual["eu"]["DATABASES"]
+    assert actual["staging"]["ALLOWED_HOSTS"] is not actual["production"]["ALLOWED_HOSTS"]
+
+
+def test_decoded_once(base_dir, monkeypatch):
+    decoded = []
+    original_get_data = Parser.get_data
+
+    def get_data(self, **kwargs):
+        decoded.append(self.path.name)
+
+        return original_get_data(self, **kwargs)
+
+    monkeypatch.setattr(Parser, "get_data", get_data)
+
+    get_toml_settings_for_environments(base_dir=base_dir)
+
+    assert ["pyproject.toml", "django.toml"] == decoded
+
+
+def test_env_sources(base_dir):
+    actual = get_toml_settings_for_environments(
+        base_dir=base_dir, environments=["staging"], env_sources=[{"ENVIRONMENT": "ignored"}]
+    )
+
+    assert "staging" == actual["staging"]["SENTRY_ENVIRONMENT"]
+
+
+def test_missing_variables(tmp_path, caplog):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+URL = "https://${HOST}"
+NAME = "${MISSING}"
+DEBUG = "${DEVONLY}"
+
+[tool.django.envs.dev]
+HOST = "localhost"
+DEVONLY = true
+
+[tool.django.envs.prod]
+HOST = "example.com"
+""")
+
+    actual = get_toml_settings_for_environments(base_dir=tmp_path)
+
+    assert "https://localhost" == actual["dev"]["URL"]
+    assert "https://example.com" == actual["prod"]["URL"]
+    assert [
+        "Missing variable substitution ${DEVONLY}",
+        "Missing variable substitution ${MISSING}",
+    ] == sorted(record.getMessage() for record in caplog.records if record.levelname == "WARNING")
+
+    caplog.clear()
+    get_toml_settings_for_environments(base_dir=tmp_path, environments=["dev"])
+
+    assert ["Missing variable substitution ${MISSING}"] == [
+        record.getMessage() for record in caplog.records if record.levelname == "WARNING"
+    ]
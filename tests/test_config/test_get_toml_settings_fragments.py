@@ -0,0 +1,116 @@
+import os
+
+import pytest
+
+from dj_toml_settings.config import get_settings_paths, get_toml_settings
+from dj_toml_settings.toml_parser import Parser
+
+
+@pytest.fixture(autouse=True)
+def cache_clear():
+    get_toml_settings.cache_clear()
+    yield
+    get_toml_settings.cache_clear()
+
+
+@pytest.fixture
+def conf_d(tmp_path):
+    directory = tmp_path / "conf.d"
+    directory.mkdir()
+
+    (directory / "20-logging.toml").write_text('[tool.django]\nLOG_LEVEL = "INFO"\nDEBUG = false\n')
+    (directory / "10-base.toml").write_text('[tool.django]\nDEBUG = true\nHOST = "localhost"\n')
+    (directory / "30-security.toml").write_text('[tool.django]\nALLOWED_HOSTS = ["${HOST}"]\n')
+    (directory / "README.md").write_text("Not a fragment")
+    (directory / "nested.toml").mkdir()
+
+    return tmp_path
+
+
+def test_get_settings_paths(conf_d):
+    expected = [
+        conf_d / "pyproject.toml",
+        conf_d / "conf.d" / "10-base.toml",
+        conf_d / "conf.d" / "20-logging.toml",
+        conf_d / "conf.d" / "30-security.toml",
+    ]
+
+    actual = get_settings_paths(conf_d, ["pyproject.toml", "conf.d"])
+
+    assert expected == actual
+
+
+def test_get_settings_paths_glob(conf_d):
+    expected = [conf_d / "conf.d" / "20-logging.toml", conf_d / "conf.d" / "30-security.toml"]
+
+    actual = get_settings_paths(conf_d, ["conf.d/[23]*.toml"])
+
+    assert expected == actual
+
+
+def test_directory(conf_d):
+    expected = {"DEBUG": False, "HOST": "localhost", "LOG_LEVEL": "INFO", "ALLOWED_HOSTS": ["localhost"]}
+
+    actual = get_toml_settings(base_dir=conf_d, toml_settings_files=["conf.d"])
+
+    assert expected == actual
+
+
+def test_directory_with_workers(conf_d):
+    expected = get_toml_settings(base_dir=conf_d, toml_settings_files=["conf.d"])
+
+    actual = get_toml_settings(base_dir=conf_d, toml_settings_files=["conf.d"], workers=4)
+
+    assert expected == actual
+
+
+def test_glob_after_file(conf_d):
+    (conf_d / "pyproject.toml").write_text('[tool.django]\nHOST = "example.com"\nNAME = "blog"\n')
+
+    actual = get_toml_settings(base_dir=conf_d, toml_settings_files=["pyproject.toml", "conf.d/*.toml"])
+
+    assert "localhost" == actual["HOST"]
+    assert "blog" == actual["NAME"]
+
+
+def test_memoize_only_decodes_changed_fragments(conf_d, monkeypatch):
+    get_toml_settings(base_dir=conf_d, toml_settings_files=["conf.d"], memoize=True)
+
+    decoded = []
+    original_decode = Parser.decode
+
+    def decode(self, content):
+        decoded.append(self.path.name)
+
+        return original_decode(self, content)
+
+    monkeypatch.setattr(Parser, "decode", decode)
+
+    (conf_d / "conf.d" / "40-cache.toml").write_text("[tool.django]\nCACHE_TIMEOUT = 60\n")
+
+    actual = get_toml_settings(base_dir=conf_d, toml_settings_files=["conf.d"], memoize=True)
+
+    assert ["40-cache.toml"] == decoded
+    assert 60 == actual["CACHE_TIMEOUT"]
+
+    path = conf_d / "conf.d" / "20-logging.toml"
+    mtime = path.stat().st_mtime_ns + 1_000_000_000
+    path.write_text('[tool.django]\nLOG_LEVEL = "DEBUG"\n')
+    os.utime(path, ns=(mtime, mtime))
+
+    actual = get_toml_settings(base_dir=conf_d, toml_settings_files=["conf.d"], memoize=True)
+
+    assert ["40-cache.toml", "20-logging.toml"] == decoded
+    assert "DEBUG" == actual["LOG_LEVEL"]
+    assert actual["DEBUG"] is True
+
+
+def test_memoize_copies_fragments(conf_d):
+    actual = get_toml_settings(base_dir=conf_d, toml_settings_files=["conf.d"], memoize=True)
+    actual["ALLOWED_HOSTS"].append("example.com")
+
+    (conf_d / "conf.d" / "40-cache.toml").write_text("[tool.django]\nCACHE_TIMEOUT = 60\n")
+
+    actual = get_toml_settings(base_dir=conf_d, toml_settings_files=["conf.d"], memoize=True)
+
+    assert ["localhost"] == actual["ALLOWED_HOSTS"]
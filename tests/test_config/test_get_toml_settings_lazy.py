@@ -0,0 +1,166 @@
+import pytest
+
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.lazy import LazySettings, LazyValue
+from dj_toml_settings.operators import register_operator, registry
+
+
+@pytest.fixture(autouse=True)
+def restore_registry():
+    operators = dict(registry.operators)
+
+    yield
+
+    registry.operators = operators
+    registry.update()
+
+
+@pytest.fixture
+def calls():
+    calls = []
+
+    def parse_expensive(parser, key, value):
+        calls.append(key)
+
+        return value["$expensive"].upper()
+
+    register_operator("expensive", parse_expensive)
+
+    return calls
+
+
+def test_operator(tmp_path, calls):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+SECRET_KEY = { "$expensive" = "secret" }
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, lazy=["$expensive"])
+
+    assert isinstance(actual, LazySettings)
+    assert [] == calls
+    assert actual["DEBUG"] is True
+
+    assert "SECRET" == actual["SECRET_KEY"]
+    assert "SECRET" == actual["SECRET_KEY"]
+    assert ["SECRET_KEY"] == calls
+
+
+def test_key(tmp_path, calls):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+SECRET_KEY = { "$expensive" = "secret" }
+OTHER = { "$expensive" = "other" }
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, lazy=["SECRET_KEY"])
+
+    assert ["OTHER"] == calls
+    assert {"SECRET_KEY": "SECRET", "OTHER": "OTHER"} == actual
+
+
+def test_data_is_not_updated(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+STATIC_ROOT = "${BASE_DIR}/static"
+""")
+
+    data = {"BASE_DIR": "/app"}
+
+    actual = get_toml_settings(base_dir=tmp_path, data=data, lazy=["STATIC_ROOT"])
+
+    assert {"BASE_DIR": "/app"} == data
+    assert actual is not data
+    assert "/app" == actual["BASE_DIR"]
+    assert actual["DEBUG"] is True
+    assert isinstance(dict(actual)["STATIC_ROOT"], LazyValue)
+    assert "/app/static" == actual["STATIC_ROOT"]
+    assert {"BASE_DIR": "/app", "DEBUG": True, "STATIC_ROOT": "/app/static"} == actual.resolve()
+
+
+def test_dependency_is_eager(tmp_path, calls):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+SECRET_KEY = { "$expensive" = "secret" }
+COPY = "${SECRET_KEY}"
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, lazy=["SECRET_KEY"])
+
+    assert ["SECRET_KEY"] == calls
+    assert {"SECRET_KEY": "SECRET", "COPY": "SECRET"} == actual
+
+
+def test_lazy_dependency(tmp_path, calls):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+SECRET_KEY = { "$expensive" = "secret" }
+COPY = "${SECRET_KEY}"
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, lazy=["SECRET_KEY", "COPY"])
+
+    assert [] == calls
+    assert "SECRET" == actual["COPY"]
+    assert ["SECRET_KEY"] == calls
+    assert "SECRET" == actual["SECRET_KEY"]
+    assert ["SECRET_KEY"] == calls
+
+
+def test_insert(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+ALLOWED_HOSTS = ["127.0.0.1"]
+
+[tool.django.apps.blob]
+ALLOWED_HOSTS = { "$insert" = "example.com" }
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, lazy=["$insert"])
+
+    assert ["127.0.0.1", "example.com"] == actual["ALLOWED_HOSTS"]
+
+
+def test_not_cached(tmp_path, calls):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+SECRET_KEY = { "$expensive" = "secret" }
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache", memoize=True, lazy=["SECRET_KEY"])
+
+    assert "SECRET" == actual["SECRET_KEY"]
+    assert not list((tmp_path / "cache").glob("*.settings"))
+
+    get_toml_settings.cache_clear()
+
+
+def test_cached_settings_are_lazy(tmp_path, calls):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+SECRET_KEY = { "$expensive" = "secret" }
+""")
+
+    try:
+        # Cache the resolved settings without `lazy`
+        get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache", memoize=True)
+        calls.clear()
+
+        actual = get_toml_settings(base_dir=tmp_path, memoize=True, lazy=["SECRET_KEY"])
+
+        assert isinstance(actual, LazySettings)
+        assert [] == calls
+        assert "SECRET" == actual["SECRET_KEY"]
+
+        get_toml_settings.cache_clear()
+        calls.clear()
+
+        actual = get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache", lazy=["SECRET_KEY"])
+
+        assert isinstance(actual, LazySettings)
+        assert [] == calls
+        assert "SECRET" == actual["SECRET_KEY"]
+    finally:
+        get_toml_settings.cache_clear()
@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.toml_parser import Parser
+
+FILES = ["base.toml", "apps.toml", "local.toml"]
+
+
+@pytest.fixture
+def settings_files(tmp_path):
+    (tmp_path / "base.toml").write_text("""
+[tool.django]
+DEBUG = false
+HOST = "example.com"
+ALLOWED_HOSTS = ["${HOST}"]
+""")
+    (tmp_path / "apps.toml").write_text("""
+[tool.django]
+URL = "https://${HOST}/${NAME}"
+
+[tool.django.apps.blog]
+NAME = "blog"
+""")
+    (tmp_path / "local.toml").write_text("""
+[tool.django]
+DEBUG = true
+HOST = "localhost"
+ALLOWED_HOSTS = { "$insert" = "127.0.0.1" }
+""")
+
+    return tmp_path
+
+
+def test_workers(settings_files):
+    expected = get_toml_settings(base_dir=settings_files, toml_settings_files=FILES)
+
+    actual = get_toml_settings(base_dir=settings_files, toml_settings_files=FILES, workers=4)
+
+    assert expected == actual
+    assert list(expected) == list(actual)
+    assert {
+        "DEBUG": True,
+        "HOST": "localhost",
+        "ALLOWED_HOSTS": ["localhost", "127.0.0.1"],
+        "URL": "https://localhost/blog",
+        "NAME": "blog",
+    } == actual
+
+
+def test_workers_decode_in_threads(settings_files, monkeypatch):
+    threads = set()
+    original_get_data = Parser.get_data
+
+    def get_data(self, **kwargs):
+        threads.add(threading.current_thread().name)
+
+        return original_get_data(self, **kwargs)
+
+    monkeypatch.setattr(Parser, "get_data", get_data)
+
+    get_toml_settings(base_dir=settings_files, toml_settings_files=FILES, workers=2)
+
+    assert all(name.startswith("dj-toml-settings") for name in threads)
+
+
+def test_workers_missing_file(settings_files):
+    files = ["base.toml", "missing.toml", "local.toml"]
+
+    expected = get_toml_settings(base_dir=settings_files, toml_settings_files=files)
+
+    actual = get_toml_settings(base_dir=settings_files, toml_settings_files=files, workers=4)
+
+    assert expected == actual
+
+
+def test_workers_invalid_toml(settings_files, caplog):
+    (settings_files / "apps.toml").write_text("[tool.django\nNAME = ")
+
+    actual = get_toml_settings(base_dir=settings_files, toml_settings_files=FILES, workers=4)
+
+    assert "HOST" in actual
+    assert "Cannot parse TOML at:" in caplog.text
@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+from types import MappingProxyType
+
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.dedupe import Deduplicator, dedupe
+from dj_toml_settings.freeze import freeze
+
+
+def _copy(value: str) -> str:
+    """Create an equal string that is not the same object."""
+
+    return "".join(list(value))
+
+
+def test_dedupe():
+    host = "example.com"
+    long_value = "x" * 100
+    settings = {
+        "ALLOWED_HOSTS": [host, _copy(host)],
+        "CSRF_TRUSTED_ORIGINS": ["https://" + host],
+        "URLS": {"a": _copy("https://" + host), "b": ("https://" + host,)},
+        "LONG": [long_value, _copy(long_value)],
+        "STATIC_ROOT": Path("/srv/app/static"),
+        "MEDIA_ROOT": Path("/srv/app/static"),
+    }
+
+    bytes_saved = dedupe(settings)
+
+    assert bytes_saved > 0
+    assert settings["ALLOWED_HOSTS"][0] is settings["ALLOWED_HOSTS"][1]
+    assert settings["CSRF_TRUSTED_ORIGINS"][0] is settings["URLS"]["a"]
+    assert settings["URLS"]["a"] is settings["URLS"]["b"][0]
+    assert settings["LONG"][0] is settings["LONG"][1]
+    assert settings["STATIC_ROOT"] is settings["MEDIA_ROOT"]
+
+
+def test_dedupe_in_place():
+    hosts = ["localhost"]
+    settings = {"ALLOWED_HOSTS": hosts}
+
+    dedupe(settings)
+
+    assert settings["ALLOWED_HOSTS"] is hosts
+    assert {"ALLOWED_HOSTS": ["localhost"]} == settings
+
+
+def test_keys_interned():
+    key = _copy("SOME_SETTING_NAME")
+    settings = {key: 1}
+
+    dedupe(settings)
+
+    assert next(iter(settings)) is sys.intern("SOME_SETTING_NAME")
+
+
+def test_equal_values_of_different_types():
+    settings = {"A": (1, 0), "B": (True, False), "C": [1, True], "D": [0.0, -0.0]}
+
+    dedupe(settings)
+
+    assert (True, False) == settings["B"]
+    assert settings["B"][0] is True
+    assert settings["A"] is not settings["B"]
+    assert settings["C"][1] is True
+    assert str(settings["D"][1]) == "-0.0"
+
+
+def test_tuples():
+    settings = {"A": ("a", ("b", "c")), "B": ("a", ("b", "c"))}
+
+    dedupe(settings)
+
+    assert settings["A"] is settings["B"]
+
+
+def test_frozen():
+    settings = {"LOGGING": freeze({"handlers": {"console": {"class": "logging.StreamHandler"}}})}
+    other = {"LOGGING": freeze({"handlers": {"file": {"class": _copy("logging.StreamHandler")}}})}
+
+    deduplicator = Deduplicator()
+    deduplicator.dedupe(settings)
+    deduplicator.dedupe(other)
+
+    assert isinstance(settings["LOGGING"], MappingProxyType)
+    assert settings["LOGGING"]["handlers"]["console"]["class"] is other["LOGGING"]["handlers"]["file"]["class"]
+
+
+def test_across_settings(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+ALLOWED_HOSTS = ["tenant.example.com"]
+BASE_DIR = { "$path" = "." }
+""")
+
+    deduplicator = Deduplicator()
+    first = get_toml_settings(base_dir=tmp_path)
+    second = get_toml_settings(base_dir=tmp_path)
+
+    deduplicator.dedupe(first)
+    bytes_saved = dedupe(second, deduplicator)
+
+    assert bytes_saved > 0
+    assert first["BASE_DIR"] is second["BASE_DIR"]
+    assert first["ALLOWED_HOSTS"][0] is second["ALLOWED_HOSTS"][0]
+
+
+def test_cycle():
+    settings: dict = {"A": []}
+    settings["A"].append(settings["A"])
+
+    dedupe(settings)
+
+    assert settings["A"][0] is settings["A"]
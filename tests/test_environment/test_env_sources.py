@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from dj_toml_settings import environment
+from dj_toml_settings.environment import Snapshot, get_snapshot, parse_env, read_env_file
+
+
+@pytest.fixture(autouse=True)
+def env_files_clear():
+    environment.env_files.clear()
+    yield
+    environment.env_files.clear()
+
+
+def test_parse_env():
+    expected = {
+        "DEBUG": "true",
+        "SECRET_KEY": "secret",
+        "NAME": "my blog",
+        "LITERAL": "a\\nb # not a comment",
+        "ESCAPED": 'line\nnext "quoted"',
+        "QUOTED_COMMENT": "abc",
+        "SINGLE_QUOTED_COMMENT": "a # b",
+        "URL": "https://example.com/#anchor",
+        "EMPTY": "",
+    }
+
+    actual = parse_env(r"""
+# A comment
+DEBUG=true
+export SECRET_KEY = secret  # inline comment
+NAME="my blog"
+LITERAL='a\nb # not a comment'
+ESCAPED="line\nnext \"quoted\""
+QUOTED_COMMENT="abc" # comment
+SINGLE_QUOTED_COMMENT='a # b'  # comment
+URL=https://example.com/#anchor
+EMPTY=
+not a variable
+""")
+
+    assert expected == actual
+
+
+def test_read_env_file_cache(tmp_path, monkeypatch):
+    path = tmp_path / ".env"
+    path.write_text("DEBUG=true\n")
+
+    assert {"DEBUG": "true"} == read_env_file(path)
+
+    monkeypatch.setattr(environment, "parse_env", lambda _: pytest.fail("parse_env should not be called"))
+
+    assert {"DEBUG": "true"} == read_env_file(path)
+
+    monkeypatch.undo()
+    mtime = path.stat().st_mtime_ns + 1_000_000_000
+    path.write_text("DEBUG=false\n")
+    os.utime(path, ns=(mtime, mtime))
+
+    assert {"DEBUG": "false"} == read_env_file(path)
+
+
+def test_read_env_file_missing(tmp_path):
+    assert {} == read_env_file(tmp_path / ".env")
+
+
+def test_get_snapshot(tmp_path):
+    (tmp_path / ".env").write_text("DEBUG=true\nNAME=env-file\n")
+
+    actual = get_snapshot([{"NAME": "first", "HOST": "localhost"}, tmp_path / ".env", {"DEBUG": "false"}])
+
+    assert {"NAME": "env-file", "HOST": "localhost", "DEBUG": "false"} == dict(actual)
+
+
+def test_snapshot():
+    environ = {"DEBUG": "true"}
+    snapshot = Snapshot(environ)
+
+    environ["DEBUG"] = "false"
+
+    assert "true" == snapshot["DEBUG"]
+    assert hash(Snapshot({"DEBUG": "true"})) == hash(snapshot)
+    assert Snapshot({"DEBUG": "true"}) == snapshot
+    assert {snapshot: 1}[Snapshot({"DEBUG": "true"})] == 1
+
+    with pytest.raises(TypeError):
+        snapshot["DEBUG"] = "false"  # type: ignore[index]
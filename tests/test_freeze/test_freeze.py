@@ -0,0 +1,193 @@
+import gc
+import subprocess
+import sys
+import textwrap
+from types import MappingProxyType
+
+import pytest
+
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.freeze import freeze, freeze_gc
+from dj_toml_settings.lazy import LazySettings, LazyValue
+
+
+def test_freeze():
+    expected = MappingProxyType(
+        {
+            "default": MappingProxyType({"NAME": "db", "OPTIONS": ("a", "b")}),
+            "hosts": frozenset(["localhost"]),
+            "nested": ((1, 2), MappingProxyType({})),
+        }
+    )
+
+    actual = freeze({"default": {"NAME": "db", "OPTIONS": ["a", "b"]}, "hosts": {"localhost"}, "nested": [[1, 2], {}]})
+
+    assert expected == actual
+    assert isinstance(actual, MappingProxyType)
+    assert isinstance(actual["default"], MappingProxyType)
+
+    with pytest.raises(TypeError):
+        actual["default"]["NAME"] = "other"  # type: ignore[index]
+
+
+def test_freeze_scalars():
+    assert 1 == freeze(1)
+    assert "a" == freeze("a")
+    assert freeze(None) is None
+
+
+def test_freeze_lazy_value():
+    value = LazyValue(lambda: {"hosts": ["localhost"]})
+
+    actual = freeze(value)
+
+    assert isinstance(actual, LazyValue)
+    assert not value.resolved
+    assert MappingProxyType({"hosts": ("localhost",)}) == actual.resolve()
+
+
+def test_freeze_resolved_lazy_value():
+    value = LazyValue(lambda: ["localhost"])
+    value.resolve()
+
+    assert ("localhost",) == freeze(value)
+
+
+def test_get_toml_settings(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+ALLOWED_HOSTS = ["localhost"]
+DATABASES = { default = { NAME = "db" } }
+DEBUG = true
+""")
+
+    data = {"INSTALLED_APPS": ["blog"]}
+
+    actual = get_toml_settings(base_dir=tmp_path, data=data, frozen=True)
+
+    assert isinstance(actual, dict)
+    assert ("localhost",) == actual["ALLOWED_HOSTS"]
+    assert actual["DEBUG"] is True
+
+    # Django modifies `DATABASES` in place
+    assert {"default": {"NAME": "db"}} == actual["DATABASES"]
+    assert isinstance(actual["DATABASES"]["default"], dict)
+
+    # Existing settings are not frozen
+    assert ["blog"] == actual["INSTALLED_APPS"]
+
+
+def test_get_toml_settings_keys(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+ALLOWED_HOSTS = ["localhost"]
+DATABASES = { default = { NAME = "db" } }
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, frozen=["DATABASES"])
+
+    assert ["localhost"] == actual["ALLOWED_HOSTS"]
+    assert isinstance(actual["DATABASES"], MappingProxyType)
+
+
+def test_get_toml_settings_lazy(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+ALLOWED_HOSTS = ["localhost"]
+STORAGES = { default = { BACKEND = "storage" } }
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path, lazy=["ALLOWED_HOSTS", "STORAGES"], frozen=True)
+
+    assert isinstance(actual, LazySettings)
+    assert ("localhost",) == actual["ALLOWED_HOSTS"]
+    assert isinstance(actual["STORAGES"], MappingProxyType)
+    assert isinstance(actual["STORAGES"]["default"], MappingProxyType)
+
+
+def test_django(tmp_path):
+    pytest.importorskip("django")
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+ALLOWED_HOSTS = ["localhost"]
+INSTALLED_APPS = ["django.contrib.contenttypes", "django.contrib.auth"]
+
+[tool.django.DATABASES.default]
+ENGINE = "django.db.backends.sqlite3"
+NAME = ":memory:"
+
+[tool.django.LOGGING]
+version = 1
+disable_existing_loggers = false
+
+[tool.django.LOGGING.handlers.console]
+class = "logging.StreamHandler"
+formatter = "simple"
+
+[tool.django.LOGGING.formatters.simple]
+format = "{levelname} {message}"
+style = "{"
+
+[tool.django.LOGGING.loggers.frozen]
+handlers = ["console"]
+level = "INFO"
+""")
+    (tmp_path / "frozen_settings.py").write_text(
+        textwrap.dedent("""
+        from pathlib import Path
+
+        from dj_toml_settings import get_toml_settings
+
+        SECRET_KEY = "frozen"
+
+        globals().update(get_toml_settings(base_dir=Path(__file__).resolve().parent, frozen=True))
+        """)
+    )
+
+    # `django.setup()` configures `LOGGING` and can only run once per process
+    script = textwrap.dedent("""
+        import os
+
+        os.environ["DJANGO_SETTINGS_MODULE"] = "frozen_settings"
+
+        import django
+        django.setup()
+
+        from django.conf import settings
+        from django.db import connections
+
+        assert settings.ALLOWED_HOSTS == ("localhost",)
+        connections["default"].ensure_connection()
+        print(connections["default"].settings_dict["ATOMIC_REQUESTS"])
+    """)
+
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script], cwd=tmp_path, capture_output=True, text=True, check=False
+    )
+
+    assert 0 == result.returncode, result.stderr
+    assert "False" == result.stdout.strip()
+
+
+def test_get_toml_settings_memoized(tmp_path):
+    (tmp_path / "pyproject.toml").write_text('[tool.django]\nALLOWED_HOSTS = ["localhost"]\n')
+
+    get_toml_settings.cache_clear()
+
+    try:
+        get_toml_settings(base_dir=tmp_path, memoize=True)
+
+        assert ("localhost",) == get_toml_settings(base_dir=tmp_path, memoize=True, frozen=True)["ALLOWED_HOSTS"]
+        assert ["localhost"] == get_toml_settings(base_dir=tmp_path, memoize=True)["ALLOWED_HOSTS"]
+    finally:
+        get_toml_settings.cache_clear()
+
+
+def test_freeze_gc():
+    freeze_gc()
+
+    try:
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
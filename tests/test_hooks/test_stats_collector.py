@@ -0,0 +1,94 @@
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.hooks import Hooks, StatsCollector
+from dj_toml_settings.toml_parser import Parser
+
+
+def test(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "production")
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+DEBUG = true
+STATIC_ROOT = { "$path" = "static" }
+TIMEOUT = { "$value" = "10", "$type" = "int" }
+
+[tool.django.apps.blog]
+BLOG_TITLE = "${NAME} blog"
+
+[tool.django.envs.production]
+DEBUG = false
+""")
+
+    collector = StatsCollector()
+
+    Parser(path, data={"NAME": "Example"}, hooks=[collector]).parse_file()
+
+    stats = collector.stats
+
+    assert [path] == list(stats.files)
+    assert 1 == stats.files[path].count
+    assert {"tool.django", "tool.django.apps.blog", "tool.django.envs.production"} == set(stats.sections)
+    assert {"$path": 1, "$value": 1, "$type": 1} == {
+        operator: timing.count for operator, timing in stats.operators.items()
+    }
+
+    # `DEBUG` from `[tool.django]` gets overridden, so it is never resolved
+    assert [
+        ("tool.django", "STATIC_ROOT"),
+        ("tool.django", "TIMEOUT"),
+        ("tool.django.apps.blog", "BLOG_TITLE"),
+        ("tool.django.envs.production", "DEBUG"),
+    ] == sorted((section, key) for _, section, key in stats.keys)
+
+    assert 2 == len(stats.get_slowest_keys(2))
+    assert stats.get_slowest_keys(1)[0][0] == max(duration for duration, _, _ in stats.keys)
+
+
+def test_report(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+STATIC_ROOT = { "$path" = "static" }
+""")
+
+    collector = StatsCollector()
+
+    get_toml_settings(base_dir=tmp_path, hooks=[collector])
+
+    report = collector.stats.report()
+
+    assert "Files:\n" in report
+    assert "  tool.django: " in report
+    assert "  $path: 1 in " in report
+    assert "  tool.django.STATIC_ROOT: " in report
+
+
+def test_custom_hook(tmp_path):
+    events = []
+
+    class KeyHook(Hooks):
+        def key_resolved(self, parser, section, key, duration):  # noqa: ARG002
+            events.append((section, key))
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+DEBUG = true
+""")
+
+    get_toml_settings(base_dir=tmp_path, hooks=[KeyHook()])
+
+    assert [("tool.django", "DEBUG")] == events
+
+
+def test_no_hooks(tmp_path, monkeypatch):
+    def fail(*args):
+        raise AssertionError("Events should not be emitted without hooks")
+
+    monkeypatch.setattr(Parser, "emit", fail)
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+STATIC_ROOT = { "$path" = "static" }
+""")
+
+    assert "STATIC_ROOT" in get_toml_settings(base_dir=tmp_path)
@@ -0,0 +1,62 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative time (in microseconds) that `import dj_toml_settings` is allowed to take
+IMPORT_TIME_BUDGET = 100_000
+
+LAZY_MODULES = [
+    "asyncio",
+    "concurrent.futures",
+    "dateutil",
+    "decimal",
+    "typeguard",
+    "dj_toml_settings.cache",
+    "dj_toml_settings.operators",
+    "dj_toml_settings.plan",
+    "dj_toml_settings.value_parsers.dict_parsers",
+    "dj_toml_settings.value_parsers.str_parsers",
+]
+
+
+def _get_import_times() -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import dj_toml_settings"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    import_times = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, module_name = line.split("|")
+        import_times[module_name.strip()] = int(cumulative)
+
+    return import_times
+
+
+def test_lazy_modules():
+    result = subprocess.run(
+        [sys.executable, "-c", "import json, sys, dj_toml_settings; print(json.dumps(list(sys.modules)))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = json.loads(result.stdout)
+
+    for module_name in LAZY_MODULES:
+        assert module_name not in modules
+
+
+# Wall-clock time depends on the load of the machine; `test_lazy_modules` catches the same regressions deterministically
+@pytest.mark.slow
+def test_import_time():
+    import_times = _get_import_times()
+
+    assert import_times["dj_toml_settings"] < IMPORT_TIME_BUDGET
@@ -0,0 +1,63 @@
+import threading
+import time
+
+from dj_toml_settings.lazy import LazySettings, LazyValue
+
+
+def test_resolve_once():
+    calls = []
+
+    def function():
+        calls.append(1)
+        return "value"
+
+    value = LazyValue(function)
+
+    assert not value.resolved
+    assert "value" == value.resolve()
+    assert "value" == value.resolve()
+    assert value.resolved
+    assert 1 == len(calls)
+
+
+def test_resolve_threads():
+    calls = []
+
+    def function():
+        calls.append(1)
+        time.sleep(0.01)
+
+        return "value"
+
+    value = LazyValue(function)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(value.resolve())) for _ in range(10)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert ["value"] * 10 == results
+    assert 1 == len(calls)
+
+
+def test_settings():
+    settings = LazySettings({"A": 1, "B": LazyValue(lambda: 2)})
+
+    assert 2 == settings["B"]
+    assert 2 == settings.get("B")
+    assert [1, 2] == list(settings.values())
+    assert [("A", 1), ("B", 2)] == list(settings.items())
+    assert {"A": 1, "B": 2} == settings
+    assert {"A": 1, "B": 2} == settings.resolve()
+    assert type(settings.resolve()) is dict
+
+
+def test_settings_copy():
+    settings = LazySettings({"A": LazyValue(lambda: 1)})
+
+    assert isinstance(settings.copy(), LazySettings)
+    assert 1 == settings.copy()["A"]
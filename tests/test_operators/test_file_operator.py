@@ -0,0 +1,155 @@
+import os
+
+import pytest
+
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.toml_parser import Parser
+from dj_toml_settings.value_parsers import dict_parsers
+from dj_toml_settings.value_parsers.dict_parsers import read_file
+
+
+@pytest.fixture(autouse=True)
+def cache_clear():
+    get_toml_settings.cache_clear()
+    dict_parsers.file_contents.clear()
+    yield
+    get_toml_settings.cache_clear()
+
+
+def _write(path, content):
+    """Write `content` and make sure the modified time changes, even on file systems with a coarse resolution."""
+
+    mtime = path.stat().st_mtime_ns + 1_000_000_000 if path.exists() else None
+    path.write_text(content)
+
+    if mtime:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test(tmp_path):
+    (tmp_path / "secrets").mkdir()
+    (tmp_path / "secrets" / "secret_key").write_text("very-secret\n\n")
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+SECRET_KEY = { "$file" = "secrets/secret_key" }
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert {"SECRET_KEY": "very-secret"} == actual
+
+
+def test_absolute_path(tmp_path):
+    (tmp_path / "password").write_text("hunter2")
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text(f"""
+[tool.django]
+PASSWORD = {{ "$file" = "{(tmp_path / "password").as_posix()}" }}
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert {"PASSWORD": "hunter2"} == actual
+
+
+def test_default(tmp_path, caplog):
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+SECRET_KEY = { "$file" = "missing", "$default" = "insecure" }
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert {"SECRET_KEY": "insecure"} == actual
+    assert "Cannot find file" not in caplog.text
+
+
+def test_missing(tmp_path, caplog):
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+SECRET_KEY = { "$file" = "missing" }
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert {"SECRET_KEY": None} == actual
+    assert "Cannot find file at:" in caplog.text
+
+
+def test_type(tmp_path):
+    (tmp_path / "port").write_text("5432\n")
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+PORT = { "$file" = "port", "$type" = "int" }
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert {"PORT": 5432} == actual
+
+
+def test_max_size(tmp_path):
+    (tmp_path / "large").write_text("a" * 11)
+
+    with pytest.raises(ValueError, match="File is larger than 10 bytes"):
+        read_file(tmp_path / "large", max_size=10)
+
+    assert "a" * 11 == read_file(tmp_path / "large", max_size=11)
+
+
+def test_read_file_cache(tmp_path, monkeypatch):
+    secret = tmp_path / "secret"
+    _write(secret, "one\n")
+
+    assert "one" == read_file(secret)
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("open should not be called")
+
+    monkeypatch.setattr(dict_parsers, "open", fail_open, raising=False)
+
+    assert "one" == read_file(secret)
+
+    monkeypatch.undo()
+    _write(secret, "two\n")
+
+    assert "two" == read_file(secret)
+
+
+def test_memoize_invalidated(tmp_path):
+    secret = tmp_path / "secret"
+    _write(secret, "one")
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+SECRET_KEY = { "$file" = "secret" }
+""")
+
+    assert {"SECRET_KEY": "one"} == get_toml_settings(base_dir=tmp_path, memoize=True)
+
+    _write(secret, "two")
+
+    assert {"SECRET_KEY": "two"} == get_toml_settings(base_dir=tmp_path, memoize=True)
+
+
+def test_cache_invalidated(tmp_path):
+    secret = tmp_path / "secret"
+    _write(secret, "one")
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+SECRET_KEY = { "$file" = "secret" }
+""")
+
+    assert {"SECRET_KEY": "one"} == get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
+
+    _write(secret, "two")
+
+    assert {"SECRET_KEY": "two"} == get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")
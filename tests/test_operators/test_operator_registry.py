@@ -0,0 +1,51 @@
+from dj_toml_settings.operators import OperatorRegistry
+
+
+def _first(parser, key, value):
+    return "first"
+
+
+def _second(parser, key, value):
+    return "second"
+
+
+def _cast(parser, key, value, resolved_value):
+    return f"cast-{resolved_value}"
+
+
+def test_get_operators_no_operators():
+    registry = OperatorRegistry()
+    registry.register("first", _first)
+
+    assert registry.get_operators({"default": {"ENGINE": "sqlite"}}) == []
+
+
+def test_get_operators_order():
+    registry = OperatorRegistry()
+    registry.register("first", _first)
+    registry.register("second", _second)
+    registry.register("cast", _cast, cast=True)
+
+    actual = registry.get_operators({"$cast": True, "$second": 1, "$first": 1})
+
+    assert ["$first", "$cast"] == [operator.key for operator in actual]
+
+
+def test_resolve():
+    registry = OperatorRegistry()
+    registry.register("first", _first)
+    registry.register("cast", _cast, cast=True)
+
+    assert registry.resolve(None, "KEY", {"$first": 1}) == "first"
+    assert registry.resolve(None, "KEY", {"$first": 1, "$cast": True}) == "cast-first"
+    assert registry.resolve(None, "KEY", {"$cast": True}) == "cast-{'$cast': True}"
+    assert registry.resolve(None, "KEY", {"first": 1}) == {"first": 1}
+
+
+def test_unregister():
+    registry = OperatorRegistry()
+    registry.register("first", _first)
+    registry.unregister("$first")
+
+    assert registry.keys == frozenset()
+    assert registry.resolve(None, "KEY", {"$first": 1}) == {"$first": 1}
@@ -0,0 +1,159 @@
+import pytest
+
+import dj_toml_settings
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.operators import register_operator, registry, unregister_operator
+from dj_toml_settings.toml_parser import Parser
+
+
+@pytest.fixture(autouse=True)
+def restore_registry():
+    operators = dict(registry.operators)
+
+    yield
+
+    registry.operators = operators
+    registry.update()
+
+
+def test(tmp_path):
+    expected = {"SECRET_KEY": "SECRET"}
+
+    def parse_upper(parser, key, value):
+        return value["$upper"].upper()
+
+    register_operator("upper", parse_upper)
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+SECRET_KEY = { "$upper" = "secret" }
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert expected == actual
+
+
+def test_decorator(tmp_path):
+    expected = {"SECRET_KEY": "SECRET"}
+
+    @register_operator("$upper")
+    def parse_upper(parser, key, value):
+        return value["$upper"].upper()
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+SECRET_KEY = { "$upper" = "secret" }
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert expected == actual
+
+
+def test_cast(tmp_path, monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "secret")
+
+    expected = {"SECRET_KEY": "SECRET", "PORT": 8000}
+
+    @register_operator("upper", cast=True)
+    def parse_upper(parser, key, value, resolved_value):
+        return resolved_value.upper() if value["$upper"] else resolved_value
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+SECRET_KEY = { "$env" = "SECRET_KEY", "$upper" = true }
+PORT = { "$value" = "8000", "$type" = "int" }
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert expected == actual
+
+
+def test_override(tmp_path):
+    expected = {"SECRET_KEY": "not-from-env"}
+
+    register_operator("env", lambda *_: "not-from-env")
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+SECRET_KEY = { "$env" = "SECRET_KEY" }
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert expected == actual
+
+
+def test_unregister(tmp_path):
+    expected = {"SOMETHING": {"$value": 1}}
+
+    unregister_operator("value")
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+SOMETHING = { "$value" = 1 }
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert expected == actual
+
+
+def test_not_cached(tmp_path):
+    calls = []
+
+    @register_operator("vault")
+    def parse_vault(parser, key, value):
+        calls.append(key)
+
+        return f"{value['$vault']}-{len(calls)}"
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+SECRET_KEY = { "$vault" = "secret" }
+""")
+
+    try:
+        assert "secret-1" == get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")["SECRET_KEY"]
+        assert "secret-2" == get_toml_settings(base_dir=tmp_path, cache_dir=tmp_path / "cache")["SECRET_KEY"]
+        assert "secret-3" == get_toml_settings(base_dir=tmp_path, memoize=True)["SECRET_KEY"]
+        assert "secret-4" == get_toml_settings(base_dir=tmp_path, memoize=True)["SECRET_KEY"]
+    finally:
+        get_toml_settings.cache_clear()
+
+
+def test_cacheable(tmp_path):
+    calls = []
+
+    @register_operator("upper", cacheable=True)
+    def parse_upper(parser, key, value):
+        calls.append(key)
+
+        return value["$upper"].upper()
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+SECRET_KEY = { "$upper" = "secret" }
+""")
+
+    try:
+        assert "SECRET" == get_toml_settings(base_dir=tmp_path, memoize=True)["SECRET_KEY"]
+        assert "SECRET" == get_toml_settings(base_dir=tmp_path, memoize=True)["SECRET_KEY"]
+        assert ["SECRET_KEY"] == calls
+    finally:
+        get_toml_settings.cache_clear()
+
+
+def test_package_exports():
+    assert dj_toml_settings.register_operator is register_operator
+    assert dj_toml_settings.unregister_operator is unregister_operator
+
+    with pytest.raises(AttributeError):
+        dj_toml_settings.missing  # noqa: B018
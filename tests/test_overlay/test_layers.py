@@ -0,0 +1,77 @@
+import pytest
+
+from dj_toml_settings.overlay import Layers
+
+
+def test_precedence():
+    layers = Layers({"A": "base", "B": "base", "C": "base"})
+
+    first = layers.add()
+    second = layers.add()
+
+    first["A"] = "first"
+    first["B"] = "first"
+    second["B"] = "second"
+
+    assert "first" == first["A"]
+    assert "second" == first["B"]
+    assert "base" == second["C"]
+    assert {"A": "first", "B": "second", "C": "base"} == dict(first)
+
+
+def test_base_not_modified():
+    base = {"A": "base"}
+    layers = Layers(base)
+
+    layers.add()["A"] = "changed"
+
+    assert {"A": "base"} == base
+
+
+def test_changes():
+    layers = Layers({"A": "base", "B": "base"})
+
+    layers.add()["A"] = "first"
+    second = layers.add()
+    second["A"] = "second"
+    second["C"] = "second"
+
+    assert {"A": "second", "C": "second"} == layers.changes()
+
+
+def test_missing():
+    overlay = Layers({}).add()
+
+    assert "A" not in overlay
+    assert overlay.get("A") is None
+    assert "default" == overlay.get("A", "default")
+
+    with pytest.raises(KeyError):
+        overlay["A"]
+
+
+def test_none():
+    overlay = Layers({"A": None}).add()
+
+    assert "A" in overlay
+    assert overlay["A"] is None
+
+
+def test_len_and_iter():
+    layers = Layers({"A": 1, "B": 2})
+    layers.add()["B"] = 3
+    overlay = layers.add()
+    overlay["C"] = 4
+
+    assert ["A", "B", "C"] == list(overlay)
+    assert 3 == len(overlay)
+
+
+def test_delete():
+    layers = Layers({"A": "base"})
+    overlay = layers.add()
+    overlay["A"] = "changed"
+
+    del overlay["A"]
+
+    assert "base" == overlay["A"]
@@ -0,0 +1,148 @@
+import logging
+
+import pytest
+
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.exceptions import VariableCycleError
+from dj_toml_settings.toml_parser import Parser
+
+
+def test_final_value(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "production")
+
+    expected = {"HOST": "example.com", "URL": "https://example.com"}
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+HOST = "localhost"
+URL = "https://${HOST}"
+
+[tool.django.envs.production]
+HOST = "example.com"
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert expected == actual
+
+
+def test_self_reference(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "production")
+
+    expected = {
+        "ALLOWED_HOSTS": ["127.0.0.1", "example.com", "www.example.com"],
+        "HOSTS": ["127.0.0.1", "example.com", "www.example.com"],
+    }
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+HOSTS = "${ALLOWED_HOSTS}"
+ALLOWED_HOSTS = ["127.0.0.1"]
+
+[tool.django.apps.blob]
+ALLOWED_HOSTS = { "$insert" = "example.com" }
+
+[tool.django.envs.production]
+ALLOWED_HOSTS = { "$insert" = "www.example.com" }
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert expected == actual
+
+
+def test_self_reference_data(tmp_path):
+    expected = {"ALLOWED_HOSTS": ["127.0.0.1", "example.com"]}
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+ALLOWED_HOSTS = { "$insert" = "example.com" }
+""")
+
+    actual = Parser(path, data={"ALLOWED_HOSTS": ["127.0.0.1"]}).parse_file()
+
+    assert expected == actual
+
+
+def test_overridden_not_resolved(tmp_path, monkeypatch):
+    expected = {"SOMETHING": 1}
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+SOMETHING = { "$insert" = 1 }
+
+[tool.django.apps.blob]
+SOMETHING = 1
+""")
+
+    # `$insert` on a `str` would raise an `InvalidActionError` if it was resolved
+    actual = Parser(path, data={"SOMETHING": "hello"}).parse_file()
+
+    assert expected == actual
+
+
+def test_cycle(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+A = "${B}"
+B = "${C}"
+C = "${A}"
+""")
+
+    with pytest.raises(VariableCycleError) as e:
+        Parser(path).parse_file()
+
+    assert "Variable cycle: tool.django.A -> tool.django.B -> tool.django.C -> tool.django.A" in e.exconly()
+
+
+def test_undefined_reported_first(tmp_path, caplog):
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+A = "${MISSING}"
+B = ["${MISSING}", "${OTHER}"]
+""")
+
+    with caplog.at_level(logging.WARNING):
+        actual = Parser(path).parse_file()
+
+    assert {"A": "${MISSING}", "B": ["${MISSING}", "${OTHER}"]} == actual
+    assert ["Missing variable substitution ${MISSING}", "Missing variable substitution ${OTHER}"] == [
+        record.msg for record in caplog.records
+    ]
+
+
+def test_across_files(tmp_path):
+    expected = {"STATIC_ROOT": "/app/static", "ROOT": "/app", "ALLOWED_HOSTS": ["a", "b"]}
+
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.django]
+STATIC_ROOT = "${ROOT}/static"
+ALLOWED_HOSTS = ["a"]
+""")
+
+    (tmp_path / "django.toml").write_text("""
+[tool.django]
+ROOT = "/app"
+ALLOWED_HOSTS = { "$insert" = "b" }
+""")
+
+    actual = get_toml_settings(base_dir=tmp_path)
+
+    assert expected == actual
+
+
+def test_long_chain(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(
+        "[tool.django]\n" + "\n".join(f'K{i} = "${{K{i + 1}}}"' for i in range(5_000)) + '\nK5000 = "end"\n'
+    )
+
+    actual = Parser(path).parse_file()
+
+    assert actual["K0"] == "end"
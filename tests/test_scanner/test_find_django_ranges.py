@@ -0,0 +1,142 @@
+import sys
+
+import pytest
+
+from dj_toml_settings.scanner import find_django_ranges
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+
+def _decode(content: bytes) -> dict:
+    ranges = find_django_ranges(content)
+
+    assert ranges, "Expected the [tool.django] section to be found"
+
+    return tomllib.loads(b"".join(content[start:end] for start, end in ranges).decode())
+
+
+def _assert_same_as_full_decode(content: bytes):
+    expected = tomllib.loads(content.decode())["tool"]["django"]
+
+    actual = _decode(content)["tool"]["django"]
+
+    assert expected == actual
+
+
+def test():
+    content = b"""
+[project]
+name = "example"
+dependencies = ["django>=5"]
+
+[tool.django]
+DEBUG = true
+
+[tool.ruff]
+line-length = 120
+"""
+
+    assert [(content.index(b"[tool.django]"), content.index(b"[tool.ruff]"))] == find_django_ranges(content)
+    _assert_same_as_full_decode(content)
+
+
+def test_sub_tables():
+    _assert_same_as_full_decode(b"""
+[tool.django]
+DEBUG = true
+
+[tool.ruff]
+line-length = 120
+
+[tool.django.apps.blog]
+BLOG_TITLE = "Example"
+
+[tool.pytest.ini_options]
+addopts = "-q"
+
+[ tool . django . envs . production ]
+DEBUG = false
+
+[tool.django.DATABASES.default]
+ENGINE = "django.db.backends.sqlite3"
+""")
+
+
+def test_no_django():
+    assert [] == find_django_ranges(b"[tool.ruff]\nline-length = 120\n")
+
+
+def test_no_django_section():
+    assert [] == find_django_ranges(b'[project]\ndependencies = ["django"]\n')
+
+
+def test_multiline_strings():
+    _assert_same_as_full_decode(b'''
+[tool.something]
+description = """
+[tool.django]
+FAKE = true
+"""
+literal = \'\'\'
+[tool.django.apps.fake]
+\'\'\'
+escaped = """\\"""
+[tool.django.envs.fake]
+"""
+quotes = """"quoted""""
+
+[tool.django]
+DEBUG = true
+''')
+
+
+def test_nested_arrays():
+    _assert_same_as_full_decode(b"""
+[tool.something]
+matrix = [
+  [1, 2],
+["tool.django"]
+]
+table = { a = [
+[3]] }
+
+[tool.django]
+DEBUG = true
+""")
+
+
+def test_strings_and_comments():
+    _assert_same_as_full_decode(b"""
+[tool.something]  # [tool.django]
+# [tool.django]
+a = "[tool.django]"
+b = '['
+c = "\\"["
+
+[tool.django]  # comment
+DEBUG = true
+""")
+
+
+def test_crlf():
+    _assert_same_as_full_decode(b"[tool.ruff]\r\nline-length = 120\r\n\r\n[tool.django]\r\nDEBUG = true\r\n")
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"tool.django.DEBUG = true\n",
+        b"[tool]\ndjango.DEBUG = true\n",
+        b"[tool]\ndjango = { DEBUG = true }\n",
+        b'[tool."django"]\nDEBUG = true\n',
+        b"[[tool.django.apps]]\nDEBUG = true\n",
+        b'[tool.something]\na = """\n\n[tool.django]\n',
+        b"[tool.django\nDEBUG = true\n",
+        b"[tool.django]\nA = [\n",
+    ],
+)
+def test_ambiguous(content):
+    assert find_django_ranges(content) is None
@@ -0,0 +1,26 @@
+import asyncio
+
+from dj_toml_settings.toml_parser import Parser
+
+
+def test(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    monkeypatch.setenv("SECRET_KEY", "secret")
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+DEBUG = true
+SECRET_KEY = { "$env" = "SECRET_KEY" }
+LOG_DIR = { "$path" = "logs" }
+
+[tool.django.envs.production]
+DEBUG = false
+""")
+
+    expected = Parser(path).parse_file()
+
+    actual = asyncio.run(Parser(path).aparse_file())
+
+    assert expected == actual
+    assert {"DEBUG": False, "SECRET_KEY": "secret", "LOG_DIR": tmp_path / "logs"} == actual
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+from dj_toml_settings.environment import Environment
+from dj_toml_settings.plan import ListNode, LiteralNode, TableNode, VariableNode, compile_value
+from dj_toml_settings.toml_parser import Parser
+
+TOML = """
+[tool.django]
+DEBUG = true
+ALLOWED_HOSTS = ["127.0.0.1"]
+SECRET_KEY = { "$env" = "SECRET_KEY", "$default" = "default-secret" }
+DATABASES = { default = { ENGINE = "django.db.backends.sqlite3", OPTIONS = { hosts = ["a"] } } }
+
+[tool.django.apps.blob]
+STATIC_URL = "/static/"
+
+[tool.django.envs.production]
+DEBUG = false
+ALLOWED_HOSTS = { "$insert" = "example.com" }
+
+[tool.django.envs.staging]
+ALLOWED_HOSTS = { "$insert" = "staging.example.com" }
+"""
+
+
+def test(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(TOML)
+
+    plan = Parser(path).compile()
+
+    actual = Parser(path, environment=Environment(environ={})).evaluate(plan)
+
+    assert {
+        "DEBUG": True,
+        "ALLOWED_HOSTS": ["127.0.0.1"],
+        "SECRET_KEY": "default-secret",
+        "DATABASES": {"default": {"ENGINE": "django.db.backends.sqlite3", "OPTIONS": {"hosts": ["a"]}}},
+        "STATIC_URL": "/static/",
+    } == actual
+
+
+def test_environments(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(TOML)
+
+    plan = Parser(path).compile()
+
+    production = Parser(path, environment=Environment(environ={"ENVIRONMENT": "production"})).evaluate(plan)
+    staging = Parser(path, environment=Environment(environ={"ENVIRONMENT": "staging", "SECRET_KEY": "s"})).evaluate(
+        plan
+    )
+
+    assert production["DEBUG"] is False
+    assert production["ALLOWED_HOSTS"] == ["127.0.0.1", "example.com"]
+    assert production["SECRET_KEY"] == "default-secret"
+
+    assert staging["DEBUG"] is True
+    assert staging["ALLOWED_HOSTS"] == ["127.0.0.1", "staging.example.com"]
+    assert staging["SECRET_KEY"] == "s"
+
+
+def test_same_as_parse_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "production")
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text(TOML)
+
+    expected = Parser(path).parse_file()
+    actual = Parser(path).evaluate(Parser(path).compile())
+
+    assert expected == actual
+
+
+def test_evaluations_do_not_share_values(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(TOML)
+
+    plan = Parser(path).compile()
+
+    first = Parser(path, environment=Environment(environ={})).evaluate(plan)
+    first["ALLOWED_HOSTS"].append("changed")
+    first["DATABASES"]["default"]["OPTIONS"]["hosts"].append("changed")
+
+    second = Parser(path, environment=Environment(environ={})).evaluate(plan)
+
+    assert second["ALLOWED_HOSTS"] == ["127.0.0.1"]
+    assert second["DATABASES"]["default"]["OPTIONS"]["hosts"] == ["a"]
+
+
+def test_settings_keys(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(TOML)
+
+    parser = Parser(path, data={"OTHER": 1}, environment=Environment(environ={"ENVIRONMENT": "production"}))
+    parser.evaluate(parser.compile())
+
+    assert {"DEBUG", "ALLOWED_HOSTS", "SECRET_KEY", "DATABASES", "STATIC_URL"} == parser.settings_keys
+
+
+def test_compile_value():
+    assert isinstance(compile_value(1), LiteralNode)
+    assert isinstance(compile_value("blob"), LiteralNode)
+    assert isinstance(compile_value("${BLOB}"), VariableNode)
+    assert isinstance(compile_value([1, "${BLOB}"]), ListNode)
+
+    actual = compile_value({"$value": "1", "$type": "int"})
+
+    assert isinstance(actual, TableNode)
+    assert ["$value", "$type"] == [operator.key for operator in actual.operators]
+    assert actual.evaluate(Parser(Path("pyproject.toml")), "SITE_ID") == 1
@@ -495,6 +495,45 @@ SOMETHING2 = "${SOMETHING}"
     assert expected == actual
 
 
+def test_variable_with_text(tmp_path):
+    expected = {
+        "HOST": "example.com",
+        "SLUG": "blog",
+        "NAME": "Example",
+        "TITLE": "Example blog",
+        "URL": "https://example.com/blog",
+    }
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+NAME = "Example"
+TITLE = "${NAME} blog"
+URL = "https://${HOST}/${SLUG}"
+""")
+
+    actual = Parser(path, data={"HOST": "example.com", "SLUG": "blog"}).parse_file()
+
+    assert expected == actual
+
+
+def test_variable_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOST", "example.com")
+    monkeypatch.delenv("PORT", raising=False)
+
+    expected = {"URL": "https://example.com:8000"}
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+URL = "https://${env:HOST}:${env:PORT:-8000}"
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert expected == actual
+
+
 def test_variable_callable(tmp_path):
     def some_function():
         pass
@@ -673,8 +712,8 @@ TEST = { "$none" = 1 }
     assert expected == actual
 
 
-def test_variable_invalid(tmp_path, caplog):
-    expected = {"SOMETHING": "${SOMETHING2}", "SOMETHING2": "hello"}
+def test_variable_forward_reference(tmp_path, caplog):
+    expected = {"SOMETHING": "hello", "SOMETHING2": "hello"}
 
     path = tmp_path / "pyproject.toml"
     path.write_text("""
@@ -689,12 +728,7 @@ SOMETHING2 = "hello"
         actual = Parser(path).parse_file()
 
         assert expected == actual
-
-        # Check that an error was logged
-        assert len(caplog.records) == 1
-        actual = caplog.records[0]
-
-        assert "Missing variable substitution ${SOMETHING2}" == str(actual.msg)
+        assert len(caplog.records) == 0
 
 
 def test_variable_missing(tmp_path, caplog):
@@ -767,6 +801,40 @@ def test_invalid_toml(tmp_path, caplog):
         assert expected in str(actual.msg)
 
 
+def test_invalid_toml_in_other_section(tmp_path):
+    expected = {"DEBUG": True}
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool.django]
+DEBUG = true
+
+[tool.something]
+this is not valid TOML
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert expected == actual
+
+
+def test_dotted_keys(tmp_path):
+    expected = {"SECRET_KEY": "secret", "BLOG_TITLE": "Example"}
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text("""
+[tool]
+django.SECRET_KEY = "secret"
+
+[tool.django.apps.blog]
+BLOG_TITLE = "Example"
+""")
+
+    actual = Parser(path).parse_file()
+
+    assert expected == actual
+
+
 def test_missing_file(caplog):
     expected = "Cannot find file at: missing-file"
 
@@ -0,0 +1,102 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from dj_toml_settings.config import get_toml_settings
+from dj_toml_settings.toml_parser import Parser
+
+TOML = """
+[tool.django]
+BASE_DIR = { "$path" = "." }
+STATIC_ROOT = { "$path" = "static" }
+MEDIA_ROOT = { "$path" = "static" }
+PARENT_DIR = { "$path" = "../other/.." }
+LOG_DIR = { "$value" = "logs", "$type" = "path" }
+CACHE_DIR = { "$value" = "logs", "$type" = "path" }
+"""
+
+
+@pytest.fixture
+def path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    path = tmp_path / "project" / "pyproject.toml"
+    path.parent.mkdir()
+    path.write_text(TOML)
+
+    return path
+
+
+def test_resolve_path(path):
+    expected = {
+        "BASE_DIR": path.parent.resolve(),
+        "STATIC_ROOT": (path.parent / "static").resolve(),
+        "MEDIA_ROOT": (path.parent / "static").resolve(),
+        "PARENT_DIR": path.parent.parent.resolve(),
+        "LOG_DIR": (path.parent.parent / "logs").resolve(),
+        "CACHE_DIR": (path.parent.parent / "logs").resolve(),
+    }
+
+    actual = Parser(path).parse_file()
+
+    assert expected == actual
+
+
+def test_cache(path, monkeypatch):
+    resolved = []
+    original_resolve = Path.resolve
+
+    def resolve(self, *args, **kwargs):
+        resolved.append(self)
+
+        return original_resolve(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "resolve", resolve)
+
+    actual = Parser(path).parse_file()
+
+    # `static` and `logs` are only resolved once each
+    assert 4 == len(resolved)
+    assert actual["STATIC_ROOT"] is actual["MEDIA_ROOT"]
+    assert actual["LOG_DIR"] is actual["CACHE_DIR"]
+
+
+def test_lexical_paths(path, monkeypatch):
+    expected = Parser(path).parse_file()
+
+    parser = Parser(path, lexical_paths=True)
+    plan = parser.compile()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the file system should not be accessed")
+
+    for name in ("stat", "lstat", "readlink"):
+        monkeypatch.setattr(os, name, fail)
+
+    actual = parser.evaluate(plan)
+
+    monkeypatch.undo()
+
+    assert expected == actual
+
+
+def test_lexical_paths_symlink(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    (tmp_path / "real").mkdir()
+    (tmp_path / "link").symlink_to(tmp_path / "real")
+    (tmp_path / "link" / "pyproject.toml").write_text('[tool.django]\nBASE_DIR = { "$path" = "." }\n')
+
+    resolved = get_toml_settings(base_dir=tmp_path / "link")
+    lexical = get_toml_settings(base_dir=tmp_path / "link", lexical_paths=True)
+
+    assert tmp_path.resolve() / "real" == resolved["BASE_DIR"]
+    assert tmp_path / "link" == lexical["BASE_DIR"]
+
+
+def test_type_path_invalid(path):
+    path.write_text('[tool.django]\nVALUE = { "$value" = 1, "$type" = "path" }\n')
+
+    with pytest.raises(ValueError, match="Failed to convert 1 to path"):
+        Parser(path).parse_file()
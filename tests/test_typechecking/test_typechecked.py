@@ -0,0 +1,64 @@
+import subprocess
+import sys
+
+import pytest
+from typeguard import TypeCheckError
+
+from dj_toml_settings import typechecking
+from dj_toml_settings.typechecking import check_types, typechecked
+
+
+def add_one(number: int) -> int:
+    return number + 1
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr(typechecking, "TYPECHECK", False)
+
+    actual = typechecked(add_one)
+
+    assert actual is add_one
+
+
+def test_enabled(monkeypatch):
+    monkeypatch.setattr(typechecking, "TYPECHECK", True)
+
+    actual = typechecked(add_one)
+
+    assert actual is not add_one
+    assert actual(1) == 2
+
+    with pytest.raises(TypeCheckError) as e:
+        actual("1")
+
+    assert 'argument "number" (str) is not an instance of int' in e.exconly()
+
+
+def test_check_types():
+    actual = check_types(add_one)
+
+    assert actual.__name__ == "add_one"
+
+    with pytest.raises(TypeCheckError):
+        actual("1")
+
+
+@pytest.mark.parametrize(
+    ("env_value", "expected"),
+    [
+        ("", "False"),
+        ("0", "False"),
+        ("1", "True"),
+        ("true", "True"),
+    ],
+)
+def test_env_variable(env_value, expected):
+    result = subprocess.run(
+        [sys.executable, "-c", "from dj_toml_settings.typechecking import TYPECHECK; print(TYPECHECK)"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"DJ_TOML_SETTINGS_TYPECHECK": env_value},
+    )
+
+    assert expected == result.stdout.strip()
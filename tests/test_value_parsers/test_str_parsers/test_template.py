@@ -0,0 +1,110 @@
+import logging
+from pathlib import Path
+
+from dj_toml_settings.environment import Environment
+from dj_toml_settings.value_parsers.str_parsers import Placeholder, compile_template
+
+
+def test_compile():
+    template = compile_template("${SCHEME}://${env:HOST:-localhost}/${PATH}")
+
+    assert ["${SCHEME}", "://", "${env:HOST:-localhost}", "/", "${PATH}"] == [
+        part.text if isinstance(part, Placeholder) else part for part in template.parts
+    ]
+    assert frozenset({"SCHEME", "PATH"}) == template.variables
+    assert frozenset({"HOST"}) == template.environment_variables
+
+
+def test_compile_cached():
+    assert compile_template("${A}/${B}") is compile_template("${A}/${B}")
+
+
+def test_multiple_variables():
+    actual = compile_template("${A}/${B}").render({"A": "a", "B": "b"})
+
+    assert "a/b" == actual
+
+
+def test_multiple_variables_with_text():
+    actual = compile_template("https://${HOST}:${PORT}/blog").render({"HOST": "example.com", "PORT": 8000})
+
+    assert "https://example.com:8000/blog" == actual
+
+
+def test_variable_with_text():
+    actual = compile_template("${NAME} blog").render({"NAME": "a"})
+
+    assert "a blog" == actual
+
+
+def test_same_variable_twice():
+    actual = compile_template("${A}-${A}").render({"A": "a"})
+
+    assert "a-a" == actual
+
+
+def test_falsy_variable():
+    actual = compile_template("count: ${COUNT}").render({"COUNT": 0})
+
+    assert "count: 0" == actual
+
+
+def test_only_variable_keeps_type():
+    value = [1, 2, 3]
+
+    actual = compile_template("${ARRAY}").render({"ARRAY": value})
+
+    assert value is actual
+
+
+def test_path():
+    actual = compile_template("${BASE_DIR}/${NAME}").render({"BASE_DIR": Path("/app"), "NAME": "static"})
+
+    assert Path("/app/static") == actual
+
+
+def test_missing_variable():
+    references = set()
+
+    actual = compile_template("${A}/${B}").render({"A": "a"}, references=references)
+
+    assert "a/${B}" == actual
+    assert {"A", "B"} == references
+
+
+def test_env():
+    environment = Environment({"HOST": "example.com"})
+
+    actual = compile_template("https://${env:HOST}").render({}, environment)
+
+    assert "https://example.com" == actual
+    assert {"HOST": "example.com"} == environment.consulted
+
+
+def test_env_default():
+    environment = Environment({})
+
+    actual = compile_template("https://${env:HOST:-localhost}").render({}, environment)
+
+    assert "https://localhost" == actual
+    assert {"HOST": None} == environment.consulted
+
+
+def test_env_empty_default():
+    actual = compile_template("a${env:SUFFIX:-}").render({}, Environment({}))
+
+    assert "a" == actual
+
+
+def test_env_missing(caplog):
+    with caplog.at_level(logging.WARNING):
+        actual = compile_template("${env:HOST}").render({}, Environment({}))
+
+    assert "${env:HOST}" == actual
+    assert ["Missing environment variable ${env:HOST}"] == [record.msg for record in caplog.records]
+
+
+def test_env_is_not_variable():
+    actual = compile_template("${env:HOST}").render({"HOST": "variable"}, Environment({"HOST": "environment"}))
+
+    assert "environment" == actual
@@ -0,0 +1,113 @@
+import os
+import time
+
+from dj_toml_settings.environment import RecordingEnvironment
+from dj_toml_settings.hooks import EnvironmentIndex
+from dj_toml_settings.resolver import Resolver
+from dj_toml_settings.toml_parser import Parser
+from dj_toml_settings.watcher import SettingsWatcher
+
+
+def _write(path, content):
+    mtime = path.stat().st_mtime_ns + 1_000_000_000 if path.exists() else time.time_ns()
+    path.write_text(content)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_environment_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "production")
+
+    path = tmp_path / "pyproject.toml"
+    path.write_text(
+        "[tool.django]\n"
+        'SECRET_KEY = { "$env" = "SECRET_KEY", "$default" = "secret" }\n'
+        'DATABASE_URL = "postgres://${env:DB_HOST:-localhost}/db"\n'
+        "DEBUG = true\n"
+    )
+
+    index = EnvironmentIndex()
+    parser = Parser(path, environment=RecordingEnvironment(), hooks=[index])
+    parser.evaluate(parser.compile())
+
+    assert {"SECRET_KEY": {"SECRET_KEY"}, "DB_HOST": {"DATABASE_URL"}} == index.keys
+
+
+def test_changed_environment_variable(tmp_path, monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "old")
+    monkeypatch.delenv("DB_HOST", raising=False)
+
+    _write(
+        tmp_path / "pyproject.toml",
+        "[tool.django]\n"
+        'SECRET_KEY = { "$env" = "SECRET_KEY" }\n'
+        'SIGNING_KEY = "${SECRET_KEY}-signing"\n'
+        'DATABASE_URL = "postgres://${env:DB_HOST:-localhost}/db"\n'
+        "DEBUG = true\n",
+    )
+
+    watcher = SettingsWatcher(tmp_path)
+
+    assert {"SECRET_KEY", "SIGNING_KEY"} == watcher.get_environment_keys("SECRET_KEY")
+    assert {"DATABASE_URL"} == watcher.get_environment_keys("DB_HOST")
+    assert set() == watcher.get_environment_keys("UNKNOWN")
+    assert watcher.check() is None
+
+    evaluated = []
+    original_evaluate = Resolver.evaluate
+
+    monkeypatch.setattr(
+        Resolver,
+        "evaluate",
+        lambda self, definition: evaluated.append(definition.key) or original_evaluate(self, definition),
+    )
+    monkeypatch.setenv("SECRET_KEY", "new")
+
+    diff = watcher.check()
+
+    assert {"SECRET_KEY": "new", "SIGNING_KEY": "new-signing"} == diff.changed
+    assert {"SECRET_KEY": "old", "SIGNING_KEY": "old-signing"} == diff.previous
+    assert "DATABASE_URL" not in evaluated
+    assert "DEBUG" not in evaluated
+
+    monkeypatch.setenv("DB_HOST", "db.example.com")
+
+    diff = watcher.check()
+
+    assert {"DATABASE_URL": "postgres://db.example.com/db"} == diff.changed
+    assert watcher.check() is None
+
+
+def test_changed_environment_name(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "development")
+
+    _write(
+        tmp_path / "pyproject.toml",
+        '[tool.django]\nDEBUG = true\nNAME = "blog"\n\n[tool.django.envs.production]\nDEBUG = false\n',
+    )
+
+    watcher = SettingsWatcher(tmp_path)
+
+    monkeypatch.setenv("ENVIRONMENT", "production")
+
+    diff = watcher.check()
+
+    assert {"DEBUG": False} == diff.changed
+    assert {"DEBUG": False, "NAME": "blog"} == watcher.settings
+
+
+def test_environment_variable_not_read_anymore(tmp_path, monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "old")
+
+    path = tmp_path / "pyproject.toml"
+    _write(path, '[tool.django]\nSECRET_KEY = { "$env" = "SECRET_KEY" }\n')
+
+    watcher = SettingsWatcher(tmp_path)
+
+    _write(path, '[tool.django]\nSECRET_KEY = "fixed"\n')
+    watcher.check()
+
+    assert set() == watcher.get_environment_keys("SECRET_KEY")
+
+    monkeypatch.setenv("SECRET_KEY", "new")
+
+    assert watcher.check() is None
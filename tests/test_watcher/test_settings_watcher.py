@@ -0,0 +1,249 @@
+import os
+import time
+
+import pytest
+
+from dj_toml_settings.exceptions import VariableCycleError
+from dj_toml_settings.operators import registry
+from dj_toml_settings.toml_parser import Parser
+from dj_toml_settings.watcher import SettingsWatcher
+
+
+def _write(path, content):
+    """Write `content` and make sure the modified time changes, even on file systems with a coarse resolution."""
+
+    mtime = path.stat().st_mtime_ns + 1_000_000_000 if path.exists() else time.time_ns()
+    path.write_text(content)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_initial(tmp_path):
+    _write(tmp_path / "pyproject.toml", '[tool.django]\nDEBUG = true\nNAME = "${PROJECT}"\n')
+
+    watcher = SettingsWatcher(tmp_path, data={"PROJECT": "example"})
+
+    assert {"DEBUG": True, "NAME": "example"} == watcher.settings
+
+
+def test_no_changes(tmp_path):
+    _write(tmp_path / "pyproject.toml", "[tool.django]\nDEBUG = true\n")
+
+    watcher = SettingsWatcher(tmp_path)
+
+    assert watcher.check() is None
+
+
+def test_changed(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    _write(path, '[tool.django]\nDEBUG = true\nHOST = "localhost"\nURL = "https://${HOST}"\nNAME = "blog"\n')
+
+    watcher = SettingsWatcher(tmp_path)
+    diffs = []
+    watcher.subscribe(diffs.append)
+
+    _write(path, '[tool.django]\nDEBUG = true\nHOST = "example.com"\nURL = "https://${HOST}"\nNAME = "blog"\n')
+    diff = watcher.check()
+
+    assert {"HOST": "example.com", "URL": "https://example.com"} == diff.changed
+    assert {"HOST": "localhost", "URL": "https://localhost"} == diff.previous
+    assert set() == diff.removed
+    assert [diff] == diffs
+    assert {"DEBUG": True, "HOST": "example.com", "URL": "https://example.com", "NAME": "blog"} == watcher.settings
+
+
+def test_only_changed_file_is_decoded(tmp_path, monkeypatch):
+    _write(tmp_path / "pyproject.toml", '[tool.django]\nHOST = "localhost"\n')
+    _write(tmp_path / "django.toml", '[tool.django]\nURL = "https://${HOST}"\n')
+
+    watcher = SettingsWatcher(tmp_path)
+
+    decoded = []
+    get_data = Parser.get_data
+
+    def _get_data(self, **kwargs):
+        decoded.append(self.path.name)
+
+        return get_data(self, **kwargs)
+
+    monkeypatch.setattr(Parser, "get_data", _get_data)
+
+    _write(tmp_path / "pyproject.toml", '[tool.django]\nHOST = "example.com"\n')
+    diff = watcher.check()
+
+    assert ["pyproject.toml"] == decoded
+    assert {"HOST": "example.com", "URL": "https://example.com"} == diff.changed
+
+
+def test_only_affected_keys_are_resolved(tmp_path, monkeypatch):
+    path = tmp_path / "pyproject.toml"
+    _write(path, '[tool.django]\nA = "a"\nB = { "$value" = "b" }\n')
+
+    watcher = SettingsWatcher(tmp_path)
+
+    resolved = []
+
+    def parse_value(parser, key, value):
+        resolved.append(key)
+
+        return value["$value"]
+
+    monkeypatch.setattr(registry.operators["$value"], "handler", parse_value)
+
+    _write(path, '[tool.django]\nA = "changed"\nB = { "$value" = "b" }\n')
+    diff = watcher.check()
+
+    assert {"A": "changed"} == diff.changed
+    assert [] == resolved
+
+
+def test_removed(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    _write(path, "[tool.django]\nDEBUG = true\nSECRET_KEY = 'secret'\nTIMEOUT = 10\n")
+
+    watcher = SettingsWatcher(tmp_path, data={"TIMEOUT": 5})
+
+    _write(path, "[tool.django]\nDEBUG = true\n")
+    diff = watcher.check()
+
+    assert {"SECRET_KEY"} == diff.removed
+    assert {"TIMEOUT": 5} == diff.changed
+    assert {"SECRET_KEY": "secret", "TIMEOUT": 10} == diff.previous
+    assert {"DEBUG": True} == watcher.settings
+
+
+def test_file_deleted(tmp_path):
+    _write(tmp_path / "pyproject.toml", "[tool.django]\nDEBUG = true\n")
+    _write(tmp_path / "django.toml", "[tool.django]\nDEBUG = false\n")
+
+    watcher = SettingsWatcher(tmp_path)
+
+    assert {"DEBUG": False} == watcher.settings
+
+    (tmp_path / "django.toml").unlink()
+
+    # The file could be briefly missing while an editor saves it
+    assert not watcher.check()
+    assert {"DEBUG": False} == watcher.settings
+
+    diff = watcher.check()
+
+    assert {"DEBUG": True} == diff.changed
+
+
+def test_file_briefly_missing(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    _write(path, "[tool.django]\nALLOWED_HOSTS = ['a']\nDEBUG = true\n")
+
+    watcher = SettingsWatcher(tmp_path)
+    diffs = []
+    watcher.subscribe(diffs.append)
+
+    path.unlink()
+
+    assert not watcher.check()
+
+    _write(path, "[tool.django]\nALLOWED_HOSTS = ['b']\nDEBUG = true\n")
+    diff = watcher.check()
+
+    assert {"ALLOWED_HOSTS": ["b"]} == diff.changed
+    assert set() == diff.removed
+    assert [diff] == diffs
+    assert {"ALLOWED_HOSTS": ["b"], "DEBUG": True} == watcher.settings
+
+
+def test_invalid_toml_keeps_settings(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    _write(path, "[tool.django]\nALLOWED_HOSTS = ['a']\nDEBUG = true\n")
+
+    watcher = SettingsWatcher(tmp_path)
+    diffs = []
+    watcher.subscribe(diffs.append)
+
+    _write(path, '[tool.django]\nALLOWED_HOSTS = ["a"\n')
+
+    assert not watcher.check()
+    assert not watcher.check()
+    assert [] == diffs
+    assert {"ALLOWED_HOSTS": ["a"], "DEBUG": True} == watcher.settings
+
+    _write(path, "[tool.django]\nALLOWED_HOSTS = ['b']\n")
+    diff = watcher.check()
+
+    assert {"ALLOWED_HOSTS": ["b"]} == diff.changed
+    assert {"DEBUG"} == diff.removed
+
+
+def test_unchanged_values(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    _write(path, "[tool.django]\nDEBUG = true\n")
+
+    watcher = SettingsWatcher(tmp_path)
+    diffs = []
+    watcher.subscribe(diffs.append)
+
+    _write(path, "# comment\n[tool.django]\nDEBUG = true\n")
+
+    assert not watcher.check()
+    assert [] == diffs
+
+
+def test_error_keeps_settings(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    _write(path, '[tool.django]\nA = "a"\n')
+
+    watcher = SettingsWatcher(tmp_path)
+
+    _write(path, '[tool.django]\nA = "${B}"\nB = "${A}"\n')
+
+    with pytest.raises(VariableCycleError):
+        watcher.check()
+
+    assert {"A": "a"} == watcher.settings
+
+    _write(path, '[tool.django]\nA = "fixed"\n')
+
+    assert {"A": "fixed"} == watcher.check().changed
+
+
+def test_start(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    _write(path, "[tool.django]\nDEBUG = true\n")
+
+    watcher = SettingsWatcher(tmp_path, interval=0.01)
+    diffs = []
+    watcher.subscribe(diffs.append)
+    watcher.start()
+
+    try:
+        _write(path, "[tool.django]\nDEBUG = false\n")
+
+        for _ in range(500):
+            if diffs:
+                break
+
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+
+    assert {"DEBUG": False} == diffs[0].changed
+
+
+def test_fragments(tmp_path):
+    directory = tmp_path / "conf.d"
+    directory.mkdir()
+    _write(directory / "10-base.toml", '[tool.django]\nHOST = "localhost"\nDEBUG = true\n')
+    _write(directory / "30-local.toml", "[tool.django]\nDEBUG = false\n")
+
+    watcher = SettingsWatcher(tmp_path, toml_settings_files=["conf.d"])
+
+    _write(directory / "20-urls.toml", '[tool.django]\nURL = "https://${HOST}"\nDEBUG = "unused"\n')
+    diff = watcher.check()
+
+    assert {"URL": "https://localhost"} == diff.changed
+    assert {"HOST": "localhost", "DEBUG": False, "URL": "https://localhost"} == watcher.settings
+
+    (directory / "30-local.toml").unlink()
+    diff = watcher.check()
+
+    assert {"DEBUG": "unused"} == diff.changed
+    assert watcher.check() is None